@@ -0,0 +1,43 @@
+"""
+End-to-end cost of binding Cloudlets to Vms: N single-Pe cloudlets are submitted
+at once to a datacenter of V Vms, so every bind pass walks a long waiting queue
+while most Vms are saturated.
+
+Usage: python benchmarks/benchmark_cloudlet_bind.py [num_cloudlets] [num_vms ...]
+"""
+import os
+import sys
+import time
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.brokers import Broker
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.hosts import Host
+from pycloudsim.logger import Logger
+from pycloudsim.resources import Pe
+from pycloudsim.simulation import Simulator
+from pycloudsim.vms import Vm
+
+
+def run_scenario(num_cloudlets: int, num_vms: int):
+    simulator = Simulator()
+    num_hosts = max(1, num_vms//8)
+    host_list = [Host([Pe(1000) for _ in range(64)], id, 1024*1024, 1024*1024, 1024*1024) for id in range(num_hosts)]
+    datacenter = Datacenter(host_list)
+    simulator.set_datacenter(datacenter)
+    broker = Broker(simulator, datacenter)
+    broker.submit_vm_list([Vm(id, 1.0, 8, 1024, 1024, 1024) for id in range(num_vms)])
+    broker.submit_cloudlet_list([Cloudlet(id, 1000*(1+id % 7), 1, 1.0) for id in range(num_cloudlets)])
+    start = time.perf_counter()
+    run_stats = simulator.run_util_pause_or_terminate()
+    return time.perf_counter()-start, run_stats
+
+
+if __name__ == "__main__":
+    num_cloudlets = int(sys.argv[1]) if len(sys.argv) > 1 else int(2e4)
+    num_vms_list = [int(arg) for arg in sys.argv[2:]] if len(sys.argv) > 2 else [16, 128, 1024]
+    Logger().setLevel(logging.CRITICAL)
+    for num_vms in num_vms_list:
+        elapsed, run_stats = run_scenario(num_cloudlets, num_vms)
+        print("%7d cloudlets %5d vms\t%8.2fs\tsimulated time %8.2f" % (num_cloudlets, num_vms, elapsed, run_stats.get_global_clock()))
@@ -0,0 +1,54 @@
+"""
+Fair-share Cloudlet scheduling with many tenants: every Broker submits the same backlog of
+Cloudlets at time 0, half of the Brokers have weight 2, the rest weight 1, and
+one Broker submits high priority Cloudlets. Every third Broker submits 2-Pe Cloudlets and the
+rest single-Pe Cloudlets, so queue heads of different Pe counts come and go during a pass.
+Prints wall time, the mean end time of every weight class (weight 2 tenants should finish
+their share of work about twice as fast while both classes are backlogged) and the mean
+end time of the high priority Cloudlets.
+
+Usage: python benchmarks/benchmark_cloudlet_fair_share.py [num_brokers] [num_cloudlets_per_broker]
+"""
+import os
+import sys
+import time
+import logging
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.brokers import Broker
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.hosts import Host
+from pycloudsim.logger import Logger
+from pycloudsim.resources import Pe
+from pycloudsim.scheduling import CloudletSchedulerFairShare
+from pycloudsim.simulation import Simulator
+from pycloudsim.vms import Vm
+
+if __name__ == "__main__":
+    num_brokers = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    num_cloudlets_per_broker = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    Logger().setLevel(logging.CRITICAL)
+    simulator = Simulator()
+    datacenter = Datacenter([Host([Pe(1000) for _ in range(64)], id, 1024*1024, 1024*1024, 1024*1024) for id in range(4)])
+    simulator.set_datacenter(datacenter)
+    datacenter.set_cloudlet_scheduler(CloudletSchedulerFairShare())
+    Broker(simulator, datacenter, -1).submit_vm_list([Vm(id, 1.0, 8, 1024, 1024, 100) for id in range(32)])
+    id = 0
+    for broker_id in range(num_brokers):
+        broker = Broker(simulator, datacenter, broker_id, 2.0 if broker_id % 2 == 0 else 1.0)
+        priority = 1 if broker_id == num_brokers-1 else 0
+        num_pes = 2 if broker_id % 3 == 0 else 1
+        broker.submit_cloudlet_list([Cloudlet(id+i, 1000, num_pes, 1.0, priority=priority) for i in range(num_cloudlets_per_broker)])
+        id += num_cloudlets_per_broker
+    start = time.perf_counter()
+    simulator.run()
+    elapsed = time.perf_counter()-start
+    cloudlet_list = list(datacenter.get_cloudlet_end_of_life_dict().values())
+    end_time_array = np.array([cloudlet.get_end_time() for cloudlet in cloudlet_list])
+    broker_id_array = np.array([cloudlet.get_broker_id() for cloudlet in cloudlet_list])
+    is_high_priority = broker_id_array == num_brokers-1
+    is_weight_2 = (broker_id_array % 2 == 0) & ~is_high_priority
+    is_weight_1 = (broker_id_array % 2 == 1) & ~is_high_priority
+    print("%d Brokers x %d Cloudlets\t%.2fs\tmakespan %.1f" % (num_brokers, num_cloudlets_per_broker, elapsed, end_time_array.max()))
+    print("mean end time: weight 2 %.1f\tweight 1 %.1f\thigh priority %.1f" % (end_time_array[is_weight_2].mean(), end_time_array[is_weight_1].mean(), end_time_array[is_high_priority].mean()))
@@ -0,0 +1,47 @@
+"""
+Cloudlet schedulers on a head-of-line blocking workload: 16 Vms of 8 Pes, 90% single-Pe
+and 10% eight-Pe cloudlets of mixed length, all submitted at time 0.
+Prints wall time, makespan and mean start time (the mean wait) of every scheduler.
+
+Usage: python benchmarks/benchmark_cloudlet_scheduler.py [num_cloudlets]
+"""
+import os
+import sys
+import time
+import random
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.brokers import Broker
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.hosts import Host
+from pycloudsim.logger import Logger
+from pycloudsim.resources import Pe
+from pycloudsim.scheduling import CloudletSchedulerFifo, CloudletSchedulerFirstFitSkip, CloudletSchedulerEasyBackfilling, CloudletSchedulerConservativeBackfilling
+from pycloudsim.simulation import Simulator
+from pycloudsim.vms import Vm
+
+
+def run_scenario(cloudlet_scheduler, num_cloudlets: int):
+    rng = random.Random(num_cloudlets)
+    simulator = Simulator()
+    datacenter = Datacenter([Host([Pe(1000) for _ in range(64)], id, 1024*1024, 1024*1024, 1024*1024) for id in range(4)])
+    simulator.set_datacenter(datacenter)
+    datacenter.set_cloudlet_scheduler(cloudlet_scheduler)
+    broker = Broker(simulator, datacenter)
+    broker.submit_vm_list([Vm(id, 1.0, 8, 1024, 1024, 100) for id in range(16)])
+    broker.submit_cloudlet_list([Cloudlet(id, rng.choice([1000, 5000, 20000]), 8 if rng.random() < 0.1 else 1, 1.0) for id in range(num_cloudlets)])
+    start = time.perf_counter()
+    run_stats = simulator.run()
+    elapsed = time.perf_counter()-start
+    cloudlet_list = list(datacenter.get_cloudlet_end_of_life_dict().values())
+    mean_start_time = sum(cloudlet.get_start_time() for cloudlet in cloudlet_list)/len(cloudlet_list)
+    return elapsed, run_stats.get_global_clock(), mean_start_time
+
+
+if __name__ == "__main__":
+    num_cloudlets = int(sys.argv[1]) if len(sys.argv) > 1 else int(2e4)
+    Logger().setLevel(logging.CRITICAL)
+    for cloudlet_scheduler in [CloudletSchedulerFifo(), CloudletSchedulerFirstFitSkip(), CloudletSchedulerEasyBackfilling(), CloudletSchedulerConservativeBackfilling()]:
+        elapsed, makespan, mean_start_time = run_scenario(cloudlet_scheduler, num_cloudlets)
+        print("%-42s\t%7.2fs\tmakespan %9.1f\tmean start %9.1f" % (type(cloudlet_scheduler).__name__, elapsed, makespan, mean_start_time))
@@ -0,0 +1,46 @@
+"""
+Cost of entity identity: creating Cloudlets and Vms and keying them the way a Datacenter
+accepting them does, and looking entities up in dicts keyed the way the Datacenter keys them.
+The same run on a tree keyed by uuid1 gives the before numbers.
+
+Usage: python benchmarks/benchmark_entity_keys.py [num_entities ...]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.entity import EntityRegistry
+from pycloudsim.vms import Vm
+
+NUM_LOOKUP_ROUNDS = 10
+
+
+def bind_key(entity, entity_registry):
+    # a tree keyed by uuid1 gives every entity its UUID on creation
+    if hasattr(entity, "bind_key"):
+        entity.bind_key(entity_registry)
+    return entity
+
+
+def get_entity_key(entity):
+    return entity.get_key() if hasattr(entity, "get_key") else entity.get_uuid()
+
+
+if __name__ == "__main__":
+    num_entities_list = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [100000, 1000000]
+    for num_entities in num_entities_list:
+        entity_registry = EntityRegistry()
+        start = time.perf_counter()
+        cloudlet_list = [bind_key(Cloudlet(id, 1000, 1, 1.0), entity_registry) for id in range(num_entities)]
+        vm_list = [bind_key(Vm(id, 1.0, 1, 1024, 1024, 10), entity_registry) for id in range(num_entities//10)]
+        create_elapsed = time.perf_counter()-start
+        cloudlet_dict = {get_entity_key(cloudlet): cloudlet for cloudlet in cloudlet_list}
+        key_list = [get_entity_key(cloudlet) for cloudlet in cloudlet_list]
+        start = time.perf_counter()
+        for _ in range(NUM_LOOKUP_ROUNDS):
+            for key in key_list:
+                cloudlet_dict[key]
+        lookup_elapsed = time.perf_counter()-start
+        num_created = len(cloudlet_list)+len(vm_list)
+        print("%8d entities\tcreate %9.0f entities/s\tlookup %10.0f lookups/s" % (num_created, num_created/create_elapsed, NUM_LOOKUP_ROUNDS*num_entities/lookup_elapsed))
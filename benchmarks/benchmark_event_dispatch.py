@@ -0,0 +1,65 @@
+"""
+Per-event dispatch cost of Simulator.process and Datacenter.process.
+1. Simulator.process with a growing number of listeners, either subscribed to
+   another event type (should stay flat) or to every event type.
+2. Datacenter.process through the handler table, compared with the former
+   if/elif chain, for every event type (position in the chain), handlers are no-ops.
+
+Usage: python benchmarks/benchmark_event_dispatch.py [num_events]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.entity import SimulationEntity
+from pycloudsim.events import Event
+from pycloudsim.listeners import EventListener
+from pycloudsim.simulation import Simulator
+
+DATACENTER_EVENT_TYPE_LIST = [
+    Event.TYPE.SIMULATION_TERMINATE, Event.TYPE.HOST_REMOVE, Event.TYPE.HOST_ADD, Event.TYPE.HOST_POWERON, Event.TYPE.HOST_POWEROFF,
+    Event.TYPE.VM_FAIL, Event.TYPE.VM_DESTORY, Event.TYPE.VM_BIND, Event.TYPE.VM_SHUTDOWN, Event.TYPE.VM_BOOTUP,
+    Event.TYPE.CLOUDLET_FAIL, Event.TYPE.CLOUDLET_FINISH, Event.TYPE.CLOUDLET_BIND, Event.TYPE.CLOUDLET_SUBMIT
+]
+
+
+def noop(event: Event) -> None:
+    pass
+
+
+def legacy_process(event: Event) -> None:
+    # the if/elif chain Datacenter.process used to walk
+    for event_type in DATACENTER_EVENT_TYPE_LIST:
+        if event.get_event_type() == event_type:
+            noop(event)
+            break
+
+
+def time_per_call(function, event: Event, num_events: int) -> float:
+    start = time.perf_counter()
+    for _ in range(num_events):
+        function(event)
+    return (time.perf_counter()-start)/num_events*1e9
+
+
+if __name__ == "__main__":
+    num_events = int(sys.argv[1]) if len(sys.argv) > 1 else int(2e5)
+    event = Event(target=SimulationEntity(), event_type=Event.TYPE.CLOUDLET_FINISH)
+    print("Simulator.process ns/event")
+    for num_listeners in [0, 1, 10, 100]:
+        line = "%4d listeners" % num_listeners
+        for name, event_type in [("other type", Event.TYPE.CLOUDLET_FAIL), ("every type", None)]:
+            simulator = Simulator()
+            for _ in range(num_listeners):
+                simulator.add_event_listener(EventListener(event_type))
+            line += "\t%s %8.0f" % (name, time_per_call(simulator.process, event, num_events))
+        print(line)
+
+    print("Datacenter.process ns/event")
+    datacenter = Datacenter([])
+    for event_type in DATACENTER_EVENT_TYPE_LIST:
+        datacenter.register_event_handler(event_type, noop)
+    for position, event_type in enumerate(DATACENTER_EVENT_TYPE_LIST):
+        event = Event(event_type=event_type)
+        print("%2d %-22s\tif/elif %6.0f\ttable %6.0f" % (position, event_type.name, time_per_call(legacy_process, event, num_events), time_per_call(datacenter.process, event, num_events)))
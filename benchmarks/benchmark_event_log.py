@@ -0,0 +1,73 @@
+"""
+Cost of logging: the same Cloudlet workload (16 Vms of 8 Pes, mixed-length single-Pe
+Cloudlets submitted at time 0) run with logging off, with the text Logger writing to
+/dev/null, with an EventLog appending binary records to a file and with an in-memory
+EventLog keeping the latest records. Prints events/sec of each run, and for the file
+the size of the log and the time to render it as text.
+
+Usage: python benchmarks/benchmark_event_log.py [num_cloudlets]
+"""
+import os
+import sys
+import time
+import random
+import logging
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.brokers import Broker
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.hosts import Host
+from pycloudsim.logger import Logger, EventLog, set_event_log, render_event_log
+from pycloudsim.resources import Pe
+from pycloudsim.simulation import Simulator
+from pycloudsim.vms import Vm
+
+NUM_REPEATS = 3
+
+
+def build_simulator(num_cloudlets: int) -> Simulator:
+    rng = random.Random(num_cloudlets)
+    simulator = Simulator()
+    datacenter = Datacenter([Host([Pe(1000) for _ in range(64)], id, 1024*1024, 1024*1024, 1024*1024) for id in range(4)])
+    simulator.set_datacenter(datacenter)
+    broker = Broker(simulator, datacenter)
+    broker.submit_vm_list([Vm(id, 1.0, 8, 1024, 1024, 100) for id in range(16)])
+    broker.submit_cloudlet_list([Cloudlet(id, rng.choice([1000, 5000, 20000]), 1, 1.0) for id in range(num_cloudlets)])
+    return simulator
+
+
+def best_events_per_second(num_cloudlets: int, mode: str, path: str) -> float:
+    best = 0.0
+    for _ in range(NUM_REPEATS):
+        simulator = build_simulator(num_cloudlets)
+        Logger().setLevel(logging.INFO if mode == "text" else logging.CRITICAL)
+        event_log = None
+        if mode == "file":
+            event_log = EventLog(path)
+        elif mode == "memory":
+            event_log = EventLog()
+        set_event_log(event_log)
+        stats = simulator.run()
+        if event_log is not None:
+            # the remaining records are written by the caller, count it
+            start = time.perf_counter()
+            event_log.close()
+            elapsed = stats.get_wall_time()+time.perf_counter()-start
+            best = max(best, stats.get_num_events_processed()/elapsed)
+        else:
+            best = max(best, stats.get_events_per_second())
+        set_event_log(None)
+    return best
+
+
+if __name__ == "__main__":
+    num_cloudlets = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    Logger().handlers[0].setStream(open(os.devnull, "w"))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "simulation.log")
+        for mode in ["off", "text", "file", "memory"]:
+            print("%-8s\t%10.0f events/s" % (mode, best_events_per_second(num_cloudlets, mode, path)))
+        start = time.perf_counter()
+        num_lines = sum(1 for _ in render_event_log(path))
+        print("file log\t%7.1f MB\t%8d records\trendered in %.2f s" % (os.path.getsize(path)/2**20, num_lines, time.perf_counter()-start))
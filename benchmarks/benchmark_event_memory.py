@@ -0,0 +1,73 @@
+"""
+Per-event memory and Event allocation counts before/after slotted, pooled events.
+"Before" is a replica of the former dict-backed Event carrying an extra_data dict
+with the simulator reference, "after" is the slotted Event with a payload slot.
+The scenario part runs N cloudlets through a datacenter with the EventPool
+disabled and enabled.
+
+Usage: python benchmarks/benchmark_event_memory.py [num_cloudlets]
+"""
+import os
+import sys
+import time
+import logging
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.brokers import Broker
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.events import Event
+from pycloudsim.hosts import Host
+from pycloudsim.logger import Logger
+from pycloudsim.resources import Pe
+from pycloudsim.simulation import Simulator
+from pycloudsim.vms import Vm
+
+
+class LegacyEvent:
+    def __init__(self, source=None, target=None, event_type=None, extra_data=None, start_time=0.0) -> None:
+        self.source = source
+        self.target = target
+        self.event_type = event_type
+        self.extra_data = extra_data
+        self.start_time = start_time
+
+
+def measure_event_bytes(factory, num_events: int = int(1e5)) -> float:
+    tracemalloc.start()
+    event_list = [factory(index) for index in range(num_events)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del event_list
+    return size/num_events
+
+
+def run_scenario(num_cloudlets: int, pool_size: int):
+    simulator = Simulator()
+    simulator.event_pool.max_size = pool_size
+    host_list = [Host([Pe(1000) for _ in range(64)], id, 1024*1024, 1024*1024, 1024*1024) for id in range(16)]
+    datacenter = Datacenter(host_list)
+    simulator.set_datacenter(datacenter)
+    broker = Broker(simulator, datacenter)
+    broker.submit_vm_list([Vm(id, 1.0, 8, 1024, 1024, 1024) for id in range(128)])
+    broker.submit_cloudlet_list([Cloudlet(id, 1000, 1, 1.0) for id in range(num_cloudlets)])
+    tracemalloc.start()
+    start = time.perf_counter()
+    simulator.run_util_pause_or_terminate()
+    elapsed = time.perf_counter()-start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    event_pool = simulator.event_pool
+    return event_pool.get_num_allocated(), event_pool.get_num_allocated()+event_pool.get_num_reused(), peak, elapsed
+
+
+if __name__ == "__main__":
+    num_cloudlets = int(sys.argv[1]) if len(sys.argv) > 1 else int(2e4)
+    Logger().setLevel(logging.CRITICAL)
+    simulator = Simulator()
+    legacy_bytes = measure_event_bytes(lambda index: LegacyEvent(None, simulator, Event.TYPE.CLOUDLET_FINISH, {"cloudlet": index, "simulator": simulator}, 1.0*index))
+    slotted_bytes = measure_event_bytes(lambda index: Event(None, simulator, Event.TYPE.CLOUDLET_FINISH, None, 1.0*index, index))
+    print("bytes/event\tbefore %.0f\tafter %.0f" % (legacy_bytes, slotted_bytes))
+    for name, pool_size in [("pool disabled", 0), ("pool enabled", 4096)]:
+        num_allocated, num_scheduled, peak, elapsed = run_scenario(num_cloudlets, pool_size)
+        print("%s\t%d events scheduled\t%d Event allocations\tpeak traced memory %.1f MB\t%.1fs" % (name, num_scheduled, num_allocated, peak/2**20, elapsed))
@@ -0,0 +1,48 @@
+"""
+Compare the legacy comparator-driven MinHeap with EventQueueHeap.
+Both queues are filled with N CLOUDLET_FINISH/CLOUDLET_BIND events
+and then drained, reporting events/sec for the push and pop phases.
+
+Usage: python benchmarks/benchmark_event_queue.py [num_events]
+"""
+import os
+import sys
+import time
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.events import Event
+from pycloudsim.queues import EventQueueHeap
+from pycloudsim.simulation import Simulator
+from pycloudsim.utils import MinHeap
+
+
+def build_event_list(num_events: int, seed: int = 0):
+    rng = random.Random(seed)
+    event_list = []
+    for _ in range(num_events):
+        event_type = Event.TYPE.CLOUDLET_FINISH if rng.random() < 0.5 else Event.TYPE.CLOUDLET_BIND
+        event_list.append(Event(event_type=event_type, start_time=round(rng.uniform(0, 1e4), 2)))
+    return event_list
+
+
+def run(event_queue, event_list):
+    start = time.perf_counter()
+    for event in event_list:
+        event_queue.push(event)
+    push_time = time.perf_counter()-start
+    start = time.perf_counter()
+    while not event_queue.is_empty():
+        event_queue.pop()
+    pop_time = time.perf_counter()-start
+    return push_time, pop_time
+
+
+if __name__ == "__main__":
+    num_events = int(sys.argv[1]) if len(sys.argv) > 1 else int(1e6)
+    event_list = build_event_list(num_events)
+    result = {}
+    for name, event_queue in [("MinHeap", MinHeap(Simulator.event_comparator)), ("EventQueueHeap", EventQueueHeap())]:
+        push_time, pop_time = run(event_queue, event_list)
+        result[name] = num_events/(push_time+pop_time)
+        print("%-16s push %8.3fs\tpop %8.3fs\t%12.0f events/sec" % (name, push_time, pop_time, result[name]))
+    print("speedup %.1fx" % (result["EventQueueHeap"]/result["MinHeap"]))
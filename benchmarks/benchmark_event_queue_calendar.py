@@ -0,0 +1,54 @@
+"""
+Classic "hold" benchmark of the pending event set: the queue is prefilled
+with N events, then each hold operation pops the earliest event and pushes
+a new one at ```clock + small delta```, which is how VM boot delays, rounded
+cloudlet execution times and zero-delay CLOUDLET_BIND events behave.
+MinHeap, EventQueueHeap and EventQueueCalendar are compared at every size.
+
+Usage: python benchmarks/benchmark_event_queue_calendar.py [max_exponent] [num_holds]
+    e.g. ```... 7``` runs 10^4 to 10^7 pending events (needs several GB of RAM)
+"""
+import os
+import sys
+import time
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.events import Event
+from pycloudsim.queues import EventQueueHeap, EventQueueCalendar
+from pycloudsim.simulation import Simulator
+from pycloudsim.utils import MinHeap
+
+EVENT_TYPE_LIST = [Event.TYPE.CLOUDLET_FINISH, Event.TYPE.CLOUDLET_BIND, Event.TYPE.VM_BOOTUP]
+
+
+def next_delay(rng: random.Random) -> float:
+    # zero-delay rescheduling, cloudlet exec times rounded to 0.01, boot delays
+    r = rng.random()
+    if r < 0.3:
+        return 0.0
+    elif r < 0.9:
+        return round(rng.expovariate(1.0), 2)
+    return 30.0
+
+
+def run_hold(event_queue, num_pending: int, num_holds: int, seed: int = 0) -> float:
+    rng = random.Random(seed)
+    for _ in range(num_pending):
+        event_queue.push(Event(event_type=rng.choice(EVENT_TYPE_LIST), start_time=round(rng.uniform(0, num_pending/100), 2)))
+    start = time.perf_counter()
+    for _ in range(num_holds):
+        event = event_queue.pop()
+        event_queue.push(Event(event_type=rng.choice(EVENT_TYPE_LIST), start_time=event.get_start_time()+next_delay(rng)))
+    return time.perf_counter()-start
+
+
+if __name__ == "__main__":
+    max_exponent = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    num_holds = int(sys.argv[2]) if len(sys.argv) > 2 else int(2e5)
+    for exponent in range(4, max_exponent+1):
+        num_pending = 10**exponent
+        line = "pending 10^%d" % exponent
+        for name, factory in [("MinHeap", lambda: MinHeap(Simulator.event_comparator)), ("EventQueueHeap", EventQueueHeap), ("EventQueueCalendar", EventQueueCalendar)]:
+            elapsed = run_hold(factory(), num_pending, num_holds)
+            line += "\t%s %.2f us/hold" % (name, elapsed/num_holds*1e6)
+        print(line)
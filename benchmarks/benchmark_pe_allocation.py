@@ -0,0 +1,47 @@
+"""
+Cost of Host.bind_vm/release_vm and VmRunning.bind_cloudlet/release_cloudlet as the number of Pes grows:
+one Vm taking all the Pes of a Host, then one single-Pe Cloudlet per Vm Pe.
+
+Usage: python benchmarks/benchmark_pe_allocation.py [num_pes ...]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.cloudlets import Cloudlet, CloudletRunning
+from pycloudsim.entity import EntityRegistry
+from pycloudsim.hosts import Host
+from pycloudsim.resources import Pe
+from pycloudsim.vms import Vm, VmRunning
+
+NUM_REPEATS = 20
+# stands in for the registry of the Simulator the entities would be attached to
+ENTITY_REGISTRY = EntityRegistry()
+
+if __name__ == "__main__":
+    num_pes_list = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [16, 64, 256, 1024]
+    for num_pes in num_pes_list:
+        host = Host([Pe(1000) for _ in range(num_pes)], 0, 1024*1024, 1024*1024, 1024*1024)
+        host.bind_key(ENTITY_REGISTRY)
+        cloudlet_list = [Cloudlet(id, 1000, 1, 0.5) for id in range(num_pes)]
+        for cloudlet in cloudlet_list:
+            cloudlet.bind_key(ENTITY_REGISTRY)
+        cloudlet_running_list = [CloudletRunning(cloudlet) for cloudlet in cloudlet_list]
+        vm_elapsed, cloudlet_elapsed = 0.0, 0.0
+        for _ in range(NUM_REPEATS):
+            vm = Vm(0, 1.0, num_pes, 1024, 1024, 100)
+            vm.bind_key(ENTITY_REGISTRY)
+            vm_running = VmRunning(vm)
+            start = time.perf_counter()
+            host.bind_vm(vm_running)
+            vm_elapsed += time.perf_counter()-start
+            start = time.perf_counter()
+            for cloudlet_running in cloudlet_running_list:
+                vm_running.bind_cloudlet(cloudlet_running)
+            for cloudlet_running in cloudlet_running_list:
+                vm_running.release_cloudlet(cloudlet_running)
+            cloudlet_elapsed += time.perf_counter()-start
+            start = time.perf_counter()
+            host.release_vm(vm_running)
+            vm_elapsed += time.perf_counter()-start
+        print("%5d pes\tvm bind+release %9.3f ms\t%d cloudlets bind+release %9.3f ms" % (num_pes, 1e3*vm_elapsed/NUM_REPEATS, num_pes, 1e3*cloudlet_elapsed/NUM_REPEATS))
@@ -0,0 +1,57 @@
+"""
+Cost of the profiler: the same Cloudlet workload (16 Vms of 8 Pes, mixed-length
+single-Pe Cloudlets submitted at time 0) run without a profiler, with a profiler
+enabled then disabled again before the run (must cost nothing), and profiled.
+Prints events/sec of each run and the top event types of the profiled one.
+
+Usage: python benchmarks/benchmark_profiler.py [num_cloudlets]
+"""
+import os
+import sys
+import random
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.brokers import Broker
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.hosts import Host
+from pycloudsim.logger import Logger
+from pycloudsim.resources import Pe
+from pycloudsim.simulation import Simulator
+from pycloudsim.vms import Vm
+
+NUM_REPEATS = 3
+
+
+def build_simulator(num_cloudlets: int) -> Simulator:
+    rng = random.Random(num_cloudlets)
+    simulator = Simulator()
+    datacenter = Datacenter([Host([Pe(1000) for _ in range(64)], id, 1024*1024, 1024*1024, 1024*1024) for id in range(4)])
+    simulator.set_datacenter(datacenter)
+    broker = Broker(simulator, datacenter)
+    broker.submit_vm_list([Vm(id, 1.0, 8, 1024, 1024, 100) for id in range(16)])
+    broker.submit_cloudlet_list([Cloudlet(id, rng.choice([1000, 5000, 20000]), 1, 1.0) for id in range(num_cloudlets)])
+    return simulator
+
+
+def best_events_per_second(num_cloudlets: int, mode: str):
+    best, profiler = 0.0, None
+    for _ in range(NUM_REPEATS):
+        simulator = build_simulator(num_cloudlets)
+        if mode != "off":
+            profiler = simulator.enable_profiler()
+            if mode == "disabled":
+                simulator.disable_profiler()
+        best = max(best, simulator.run().get_events_per_second())
+    return best, profiler
+
+
+if __name__ == "__main__":
+    Logger().setLevel(logging.CRITICAL)
+    num_cloudlets = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    for mode in ["off", "disabled", "profiled"]:
+        events_per_second, profiler = best_events_per_second(num_cloudlets, mode)
+        print("%-8s\t%10.0f events/s" % (mode, events_per_second))
+    report = profiler.get_report()
+    for event_type_name, event_type_report in sorted(report["event_types"].items(), key=lambda item: -item[1]["total_time"])[:4]:
+        print("  %-16s\tcount %7d\tmean %6.1f us\tp99 %6.1f us" % (event_type_name, event_type_report["count"], 1e6*event_type_report["mean_time"], 1e6*event_type_report["p99_time"]))
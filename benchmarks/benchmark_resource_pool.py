@@ -0,0 +1,44 @@
+"""
+Host.bind_vm/release_vm throughput and memory held per running Vm with many Vms:
+Vms are bound round-robin to the Hosts of a Datacenter, then all released.
+Memory is the growth of traced Python allocations while the Vms are bound, divided by the number of Vms.
+
+Usage: python benchmarks/benchmark_resource_pool.py [num_vms ...]
+"""
+import os
+import sys
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.entity import EntityRegistry
+from pycloudsim.hosts import Host
+from pycloudsim.resources import Pe
+from pycloudsim.vms import Vm, VmRunning
+
+NUM_PES_PER_HOST = 64
+
+if __name__ == "__main__":
+    num_vms_list = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [10000, 100000, 200000]
+    for num_vms in num_vms_list:
+        num_hosts = num_vms//NUM_PES_PER_HOST+1
+        host_list = [Host([Pe(1000) for _ in range(NUM_PES_PER_HOST)], id, 1024*1024, 1024*1024, 1024*1024) for id in range(num_hosts)]
+        entity_registry = EntityRegistry()
+        Datacenter(host_list).bind_key(entity_registry)
+        vm_list = [Vm(id, 1.0, 1, 1024, 1024, 10) for id in range(num_vms)]
+        for vm in vm_list:
+            vm.bind_key(entity_registry)
+        vm_running_list = [VmRunning(vm) for vm in vm_list]
+        tracemalloc.start()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        for position, vm_running in enumerate(vm_running_list):
+            host_list[position % num_hosts].bind_vm(vm_running)
+        bind_elapsed = time.perf_counter()-start
+        memory_after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for vm_running in vm_running_list:
+            vm_running.get_host().release_vm(vm_running)
+        release_elapsed = time.perf_counter()-start
+        print("%7d vms\tbind %8.0f vms/s\trelease %8.0f vms/s\t%6.0f bytes/vm" % (num_vms, num_vms/bind_elapsed, num_vms/release_elapsed, (memory_after-memory_before)/num_vms))
@@ -0,0 +1,101 @@
+"""
+Memory of a long run with the default in-memory result sink versus the streaming sinks.
+A Broker submits a wave of single-Pe Cloudlets to 16 Vms every 100 time units, so the
+number of Cloudlets alive at once stays bounded while the number finished keeps growing.
+Prints wall time, the memory traced by tracemalloc at the end of the run and its peak,
+and how many Cloudlets the sink holds or has written. Every file written is read back and
+checked to hold the same Cloudlets as the in-memory run, Parquet is skipped without pyarrow.
+
+Usage: python benchmarks/benchmark_result_sink.py [num_waves] [wave_size]
+"""
+import csv
+import json
+import os
+import sys
+import time
+import random
+import logging
+import tempfile
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.brokers import Broker
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.events import Event
+from pycloudsim.hosts import Host
+from pycloudsim.listeners import CircularClockListener
+from pycloudsim.logger import Logger
+from pycloudsim.resources import Pe
+from pycloudsim.results import ResultSinkCsv, ResultSinkJsonLines, ResultSinkParquet
+from pycloudsim.simulation import Simulator
+from pycloudsim.vms import Vm
+
+WAVE_INTERVAL = 100.0
+
+
+class WaveSubmitter(CircularClockListener):
+    def __init__(self, broker: Broker, num_waves: int, wave_size: int) -> None:
+        super().__init__(WAVE_INTERVAL)
+        self.broker = broker
+        self.num_waves = num_waves
+        self.wave_size = wave_size
+        self.num_waves_submitted = 0
+        self.rng = random.Random(num_waves)
+
+    def update(self, simulator: Simulator) -> None:
+        first_id = self.num_waves_submitted*self.wave_size
+        self.broker.submit_cloudlet_list([Cloudlet(id, self.rng.randint(1000, 5000), 1, 1.0) for id in range(first_id, first_id+self.wave_size)])
+        self.num_waves_submitted += 1
+        if self.num_waves_submitted < self.num_waves:
+            simulator.submit(Event(source=None, target=simulator, event_type=Event.TYPE.CIRCULAR_CLOCK_EVENT, extra_data=None, start_time=simulator.get_global_clock()+self.circular_interval))
+
+
+def read_cloudlet_id_list(name: str, result_sink) -> list:
+    if name == "csv":
+        with open(result_sink.get_path("cloudlet"), newline="") as csv_file:
+            return [int(row["id"]) for row in csv.DictReader(csv_file)]
+    if name == "jsonl":
+        with open(result_sink.get_path("cloudlet")) as json_lines_file:
+            return [json.loads(line)["id"] for line in json_lines_file]
+    import pyarrow.parquet
+    return pyarrow.parquet.read_table(result_sink.get_directory("cloudlet")).column("id").to_pylist()
+
+
+def run(num_waves: int, wave_size: int, result_sink=None):
+    tracemalloc.start()
+    simulator = Simulator()
+    datacenter = Datacenter([Host([Pe(1000) for _ in range(64)], id, 1024*1024, 1024*1024, 1024*1024) for id in range(4)])
+    simulator.set_datacenter(datacenter)
+    if result_sink is not None:
+        datacenter.set_result_sink(result_sink)
+    broker = Broker(simulator, datacenter)
+    broker.submit_vm_list([Vm(id, 1.0, 8, 1024, 1024, 100) for id in range(16)])
+    simulator.add_circular_clock_listener(WaveSubmitter(broker, num_waves, wave_size))
+    start = time.perf_counter()
+    simulator.run()
+    elapsed = time.perf_counter()-start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, current, peak, datacenter
+
+
+if __name__ == "__main__":
+    Logger().setLevel(logging.CRITICAL)
+    num_waves = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    wave_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    sink_factory_list = [("memory", None), ("csv", ResultSinkCsv), ("jsonl", ResultSinkJsonLines), ("parquet", ResultSinkParquet)]
+    with tempfile.TemporaryDirectory() as directory:
+        for name, sink_factory in sink_factory_list:
+            try:
+                result_sink = sink_factory(os.path.join(directory, name), chunk_size=4096) if sink_factory is not None else None
+            except ImportError as error:
+                print("%-8s\tskipped, %s" % (name, error))
+                continue
+            elapsed, current, peak, datacenter = run(num_waves, wave_size, result_sink)
+            if result_sink is None:
+                num_cloudlets = len(datacenter.get_cloudlet_end_of_life_dict())
+                cloudlet_id_list = sorted(cloudlet.get_id() for cloudlet in datacenter.get_cloudlet_end_of_life_dict().values())
+            else:
+                num_cloudlets = result_sink.get_num_cloudlets_written()
+                assert sorted(read_cloudlet_id_list(name, result_sink)) == cloudlet_id_list
+            print("%-8s\t%6.2f s\tend %7.1f MB\tpeak %7.1f MB\t%8d Cloudlets" % (name, elapsed, current/2**20, peak/2**20, num_cloudlets))
@@ -0,0 +1,47 @@
+"""
+Processor sharing on oversubscribed Vms: 4 Vms of 8 Pes with no limit on oversubscription,
+all Cloudlets submitted at time 0 run concurrently and finish one by one, every start and finish changes the speed of all the
+other Cloudlets on the Vm. Prints wall time and wall time per Cloudlet, which stays flat as the
+number of concurrent Cloudlets grows since only the next CLOUDLET_FINISH event of a Vm is moved,
+and the makespan compared with space-shared execution of the same workload.
+
+Usage: python benchmarks/benchmark_time_shared.py [num_cloudlets ...]
+"""
+import os
+import sys
+import time
+import random
+import logging
+from functools import partial
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.brokers import Broker
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.hosts import Host
+from pycloudsim.logger import Logger
+from pycloudsim.resources import Pe
+from pycloudsim.simulation import Simulator
+from pycloudsim.vms import Vm, CloudletExecutionSpaceShared, CloudletExecutionTimeShared
+
+
+def run_scenario(cloudlet_execution_factory, num_cloudlets: int):
+    rng = random.Random(num_cloudlets)
+    simulator = Simulator()
+    datacenter = Datacenter([Host([Pe(1000) for _ in range(32)], 0, 1024*1024, 1024*1024, 1024*1024)])
+    datacenter.set_cloudlet_execution_factory(cloudlet_execution_factory)
+    simulator.set_datacenter(datacenter)
+    broker = Broker(simulator, datacenter)
+    broker.submit_vm_list([Vm(id, 1.0, 8, 1024, 1024, 100) for id in range(4)])
+    broker.submit_cloudlet_list([Cloudlet(id, rng.randint(1000, 20000), 1, rng.choice([0.5, 1.0])) for id in range(num_cloudlets)])
+    start = time.perf_counter()
+    run_stats = simulator.run()
+    return time.perf_counter()-start, run_stats.get_global_clock()
+
+
+if __name__ == "__main__":
+    Logger().setLevel(logging.CRITICAL)
+    num_cloudlets_list = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [1000, 10000, 100000]
+    for num_cloudlets in num_cloudlets_list:
+        for name, cloudlet_execution_factory in [("space-shared", CloudletExecutionSpaceShared), ("time-shared", partial(CloudletExecutionTimeShared, num_cloudlets))]:
+            elapsed, makespan = run_scenario(cloudlet_execution_factory, num_cloudlets)
+            print("%7d cloudlets\t%-12s\t%8.2f s\t%6.1f us/cloudlet\tmakespan %10.2f" % (num_cloudlets, name, elapsed, 1e6*elapsed/num_cloudlets, makespan))
@@ -0,0 +1,101 @@
+"""
+Utilization monitoring by sampling on a clock versus the event-driven UtilizationRecorder.
+16 Vms of 8 Pes run mixed-length single-Pe Cloudlets submitted at time 0.
+The sampler is a CircularClockListener walking every running Vm at a fixed interval,
+the recorder appends a change point on every bind and release. Prints wall time, rows or
+samples kept, and the mean absolute error of the per-Vm time-weighted mean Pe utilization,
+against the exact value from the recorder.
+
+Usage: python benchmarks/benchmark_utilization_recorder.py [num_cloudlets]
+"""
+import os
+import sys
+import time
+import random
+import logging
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy as np
+from pycloudsim.brokers import Broker
+from pycloudsim.cloudlets import Cloudlet
+from pycloudsim.datacenters import Datacenter
+from pycloudsim.entity import EntityKind
+from pycloudsim.events import Event
+from pycloudsim.hosts import Host
+from pycloudsim.listeners import CircularClockListener
+from pycloudsim.logger import Logger
+from pycloudsim.monitoring import UtilizationRecorder
+from pycloudsim.resources import Pe
+from pycloudsim.simulation import Simulator
+from pycloudsim.vms import Vm
+
+NUM_REPEATS = 3
+
+
+class UtilizationSampler(CircularClockListener):
+    def __init__(self, cicular_interval: float, datacenter: Datacenter, num_cloudlets: int) -> None:
+        super().__init__(cicular_interval)
+        self.datacenter = datacenter
+        self.num_cloudlets = num_cloudlets
+        self.sample_sum_dict = {}
+        self.num_samples = 0
+
+    def update(self, simulator: Simulator) -> None:
+        for vm_running in self.datacenter.get_vm_running_dict().values():
+            utilization_rate = (vm_running.get_num_pes()-vm_running.get_num_pes_available())/vm_running.get_num_pes()
+            self.sample_sum_dict[vm_running.get_key()] = self.sample_sum_dict.get(vm_running.get_key(), 0.0)+utilization_rate
+        self.num_samples += 1
+        if len(self.datacenter.get_cloudlet_end_of_life_dict()) < self.num_cloudlets:
+            simulator.submit(Event(source=None, target=simulator, event_type=Event.TYPE.CIRCULAR_CLOCK_EVENT, extra_data=None, start_time=simulator.get_global_clock()+self.circular_interval))
+
+
+def build_simulator(num_cloudlets: int):
+    rng = random.Random(num_cloudlets)
+    simulator = Simulator()
+    datacenter = Datacenter([Host([Pe(1000) for _ in range(64)], id, 1024*1024, 1024*1024, 1024*1024) for id in range(4)])
+    simulator.set_datacenter(datacenter)
+    broker = Broker(simulator, datacenter)
+    broker.submit_vm_list([Vm(id, 1.0, 8, 1024, 1024, 100) for id in range(16)])
+    broker.submit_cloudlet_list([Cloudlet(id, rng.choice([1000, 5000, 20000]), 1, 1.0) for id in range(num_cloudlets)])
+    return simulator, datacenter
+
+
+def run_monitored(num_cloudlets: int, monitor: str, interval: float = 0.0):
+    """
+    Best wall time of a few runs, with the monitor of the last run
+    """
+    best_elapsed = float("inf")
+    for _ in range(NUM_REPEATS):
+        simulator, datacenter = build_simulator(num_cloudlets)
+        if monitor == "recorder":
+            monitor_object = UtilizationRecorder()
+            datacenter.set_utilization_recorder(monitor_object)
+        elif monitor == "sampler":
+            monitor_object = UtilizationSampler(interval, datacenter, num_cloudlets)
+            simulator.add_circular_clock_listener(monitor_object)
+        else:
+            monitor_object = None
+        start = time.perf_counter()
+        simulator.run()
+        best_elapsed = min(best_elapsed, time.perf_counter()-start)
+    return best_elapsed, datacenter, monitor_object
+
+
+if __name__ == "__main__":
+    Logger().setLevel(logging.CRITICAL)
+    num_cloudlets = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    elapsed, _, _ = run_monitored(num_cloudlets, "none")
+    print("%-22s\t%7.2f s" % ("no monitoring", elapsed))
+
+    elapsed, datacenter, utilization_recorder = run_monitored(num_cloudlets, "recorder")
+    # the last Cloudlet finishes before the Vms shut down
+    end_time = max(cloudlet.get_end_time() for cloudlet in datacenter.get_cloudlet_end_of_life_dict().values())
+    vm_key_array, exact_mean_array = utilization_recorder.get_time_weighted_mean(EntityKind.VM, "pes", 0.0, end_time)
+    print("%-22s\t%7.2f s\t%8d rows" % ("recorder", elapsed, utilization_recorder.get_num_rows()))
+
+    for interval in [100.0, 10.0, 1.0, 0.1]:
+        elapsed, datacenter, utilization_sampler = run_monitored(num_cloudlets, "sampler", interval)
+        # Vm keys differ between runs, Vms are matched in creation order
+        sample_mean_array = np.array([utilization_sampler.sample_sum_dict[key] for key in sorted(utilization_sampler.sample_sum_dict)])/utilization_sampler.num_samples
+        error = np.mean(np.abs(sample_mean_array-exact_mean_array))
+        print("%-22s\t%7.2f s\t%8d samples\tmean abs error %.4f" % ("sampler every %g" % interval, elapsed, utilization_sampler.num_samples*len(sample_mean_array), error))
@@ -0,0 +1,89 @@
+"""
+Bin-packing Vm placements (first-fit decreasing, best-fit decreasing, vector packing) compared
+with VmPlacementMaxFit: batches of heterogeneous Vms are placed one after another on the same
+Hosts, without releases, until the Hosts fill up. A batch is all-or-nothing, so a policy wasting
+capacity rejects batches earlier.
+Prints runtime, the share of accepted batches and Vms, the Pe utilization of the datacenter at the
+end and the mean packing density reported by the policy for the accepted batches.
+
+Usage: python benchmarks/benchmark_vm_bin_packing.py [num_hosts] [num_batches]
+"""
+import os
+import sys
+import time
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.entity import EntityRegistry
+from pycloudsim.hosts import Host
+from pycloudsim.placement import CapacityIndex, VmPlacementMaxFit, VmPlacementFirstFitDecreasing, VmPlacementBestFitDecreasing, VmPlacementVectorPacking, VmPlacementDecreasing
+from pycloudsim.resources import Pe
+from pycloudsim.vms import Vm, VmRunning
+
+# stands in for the registry of the Simulator the entities would be attached to
+ENTITY_REGISTRY = EntityRegistry()
+
+
+def build_host_list(num_hosts: int):
+    rng = random.Random(num_hosts)
+    host_list = [Host([Pe(1000) for _ in range(rng.choice([16, 32, 64]))], id, rng.choice([64, 128, 256])*1024, 1024*1024, 10*1024) for id in range(num_hosts)]
+    for host in host_list:
+        host.bind_key(ENTITY_REGISTRY)
+    return host_list
+
+
+def build_batch_list(num_batches: int):
+    rng = random.Random(num_batches)
+    batch_list = []
+    id = 0
+    for _ in range(num_batches):
+        batch = []
+        for _ in range(rng.randint(1, 16)):
+            num_pes = rng.choice([1, 2, 4, 8, 16])
+            # memory-heavy and cpu-heavy shapes, so resources do not grow together
+            size_ram = num_pes*rng.choice([1, 2, 8])*1024
+            vm = Vm(id, 1.0, num_pes, size_ram, 1024, 100)
+            vm.bind_key(ENTITY_REGISTRY)
+            batch.append(vm)
+            id += 1
+        batch_list.append(batch)
+    return batch_list
+
+
+def run_policy(vm_placement, num_hosts: int, batch_list):
+    host_list = build_host_list(num_hosts)
+    capacity_index = CapacityIndex(host_list)
+    for host in host_list:
+        host.set_capacity_index(capacity_index)
+    num_batches_accepted, num_vms_accepted, num_vms = 0, 0, 0
+    packing_density_list = []
+    start = time.perf_counter()
+    for batch in batch_list:
+        is_place_successful, _ = vm_placement.try_to_place(capacity_index, [VmRunning(vm) for vm in batch])
+        num_vms += len(batch)
+        if is_place_successful:
+            num_batches_accepted += 1
+            num_vms_accepted += len(batch)
+            if isinstance(vm_placement, VmPlacementDecreasing):
+                packing_density_list.append(vm_placement.get_packing_density())
+    elapsed = time.perf_counter()-start
+    num_pes = sum(host.get_num_pes() for host in host_list)
+    utilization = 1.0-sum(host.get_num_pes_available() for host in host_list)/num_pes
+    packing_density = sum(packing_density_list)/len(packing_density_list) if len(packing_density_list) > 0 else float("nan")
+    return elapsed, num_batches_accepted/len(batch_list), num_vms_accepted/num_vms, utilization, packing_density
+
+
+if __name__ == "__main__":
+    num_hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    num_batches = int(sys.argv[2]) if len(sys.argv) > 2 else int(0.7*num_hosts)
+    batch_list = build_batch_list(num_batches)
+    vm_placement_list = [
+        ("max-fit", VmPlacementMaxFit()),
+        ("first-fit decreasing", VmPlacementFirstFitDecreasing()),
+        ("best-fit decreasing", VmPlacementBestFitDecreasing()),
+        ("vector packing (sum)", VmPlacementVectorPacking(VmPlacementVectorPacking.Weighting.SUM)),
+        ("vector packing (max)", VmPlacementVectorPacking(VmPlacementVectorPacking.Weighting.MAX)),
+    ]
+    for name, vm_placement in vm_placement_list:
+        elapsed, batch_acceptance, vm_acceptance, utilization, packing_density = run_policy(vm_placement, num_hosts, batch_list)
+        print("%6d hosts %6d batches %-22s\t%7.3fs\taccepted batches %5.1f%%\tvms %5.1f%%\tpe utilization %5.1f%%\tpacking density %5.1f%%" % (
+            num_hosts, num_batches, name, elapsed, 100*batch_acceptance, 100*vm_acceptance, 100*utilization, 100*packing_density))
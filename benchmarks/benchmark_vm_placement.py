@@ -0,0 +1,91 @@
+"""
+VmPlacementMaxFit on a CapacityIndex compared with the former per-Vm re-scoring
+of every Host through a suitability heap. Hosts are heterogeneous in Pes and RAM,
+a batch of Vms is placed and then released again.
+
+Usage: python benchmarks/benchmark_vm_placement.py [num_vms] [num_hosts ...]
+"""
+import os
+import sys
+import time
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.entity import EntityRegistry
+from pycloudsim.hosts import Host
+from pycloudsim.placement import CapacityIndex, VmPlacementMaxFit
+from pycloudsim.placement.host_suitability import HostSuitability
+from pycloudsim.resources import Pe
+from pycloudsim.utils import MinHeap
+from pycloudsim.vms import Vm, VmRunning
+
+# stands in for the registry of the Simulator the entities would be attached to
+ENTITY_REGISTRY = EntityRegistry()
+
+
+def legacy_try_to_place(host_list, vm_to_run_list):
+    # the heap-based max-fit VmPlacementMaxFit used to run
+    def host_suitability_comparator(suitability_a, suitability_b):
+        if suitability_a.get_suitability() != suitability_b.get_suitability():
+            return suitability_a.get_suitability()
+        elif not suitability_a.get_suitability():
+            return False
+        elif suitability_a.get_host().get_num_pes_available() != suitability_b.get_host().get_num_pes_available():
+            return suitability_a.get_host().get_num_pes_available() > suitability_b.get_host().get_num_pes_available()
+        return suitability_a.get_host().get_id() < suitability_b.get_host().get_id()
+
+    vm_running_placed_list = []
+    host_suitability_heap = MinHeap(host_suitability_comparator)
+    for host in host_list:
+        host_suitability_heap.push(HostSuitability(host))
+    for vm_to_run in vm_to_run_list:
+        for host_suitability in host_suitability_heap:
+            host_suitability.update_suitability(vm_to_run)
+        host_suitability_heap.heapify()
+        suitability_head = host_suitability_heap.pop()
+        if not suitability_head.get_suitability():
+            return False, vm_running_placed_list
+        suitability_head.get_host().bind_vm(vm_to_run)
+        vm_running_placed_list.append(vm_to_run)
+        host_suitability_heap.push(suitability_head)
+    return True, vm_running_placed_list
+
+
+def build_host_list(num_hosts: int):
+    rng = random.Random(num_hosts)
+    host_list = [Host([Pe(1000) for _ in range(rng.choice([16, 32, 64]))], id, rng.choice([64, 128, 256])*1024, 1024*1024, 10*1024) for id in range(num_hosts)]
+    for host in host_list:
+        host.bind_key(ENTITY_REGISTRY)
+    capacity_index = CapacityIndex(host_list)
+    for host in host_list:
+        host.set_capacity_index(capacity_index)
+    return host_list, capacity_index
+
+
+def build_vm_list(num_vms: int):
+    rng = random.Random(num_vms)
+    vm_list = [Vm(id, 1.0, rng.choice([1, 2, 4, 8]), rng.choice([2, 4, 8, 16])*1024, 1024, 100) for id in range(num_vms)]
+    for vm in vm_list:
+        vm.bind_key(ENTITY_REGISTRY)
+    return [VmRunning(vm) for vm in vm_list]
+
+
+def time_placement(place, num_hosts: int, num_vms: int) -> float:
+    host_list, capacity_index = build_host_list(num_hosts)
+    vm_list = build_vm_list(num_vms)
+    start = time.perf_counter()
+    is_place_successful, vm_running_placed_list = place(host_list, capacity_index, vm_list)
+    elapsed = time.perf_counter()-start
+    for vm_running in vm_running_placed_list:
+        if vm_running.get_host() is not None:
+            vm_running.get_host().release_vm(vm_running)
+    return elapsed, is_place_successful
+
+
+if __name__ == "__main__":
+    num_vms = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    num_hosts_list = [int(arg) for arg in sys.argv[2:]] if len(sys.argv) > 2 else [100, 1000, 10000]
+    vm_placement = VmPlacementMaxFit()
+    for num_hosts in num_hosts_list:
+        legacy, is_place_successful = time_placement(lambda host_list, capacity_index, vm_list: legacy_try_to_place(host_list, vm_list), num_hosts, num_vms)
+        indexed, _ = time_placement(lambda host_list, capacity_index, vm_list: vm_placement.try_to_place(capacity_index, vm_list), num_hosts, num_vms)
+        print("%6d hosts %5d vms %-8s\theap %8.3fs\tindex %8.4fs\tspeedup %6.0fx" % (num_hosts, num_vms, "placed" if is_place_successful else "rejected", legacy, indexed, legacy/indexed))
@@ -0,0 +1,74 @@
+"""
+VmPlacementVectorized (max-fit, best-fit, dot-product on a CapacityMatrix) compared with
+VmPlacementMaxFit on a CapacityIndex, placing a batch of Vms on heterogeneous Hosts,
+plus the cost of rejecting an infeasible batch (one Vm larger than any Host).
+
+Usage: python benchmarks/benchmark_vm_placement_vectorized.py [num_vms] [num_hosts ...]
+"""
+import os
+import sys
+import time
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pycloudsim.entity import EntityRegistry
+from pycloudsim.hosts import Host
+from pycloudsim.placement import CapacityIndex, VmPlacementMaxFit, VmPlacementVectorized
+from pycloudsim.resources import Pe
+from pycloudsim.vms import Vm, VmRunning
+
+# stands in for the registry of the Simulator the entities would be attached to
+ENTITY_REGISTRY = EntityRegistry()
+
+
+def build_host_list(num_hosts: int):
+    rng = random.Random(num_hosts)
+    host_list = [Host([Pe(1000) for _ in range(rng.choice([8, 16, 32]))], id, rng.choice([64, 128, 256])*1024, 1024*1024, 10*1024) for id in range(num_hosts)]
+    for host in host_list:
+        host.bind_key(ENTITY_REGISTRY)
+    return host_list
+
+
+def build_vm_list(num_vms: int):
+    rng = random.Random(num_vms)
+    vm_list = [Vm(id, 1.0, rng.choice([1, 2, 4, 8]), rng.choice([2, 4, 8, 16])*1024, 1024, 100) for id in range(num_vms)]
+    for vm in vm_list:
+        vm.bind_key(ENTITY_REGISTRY)
+    return [VmRunning(vm) for vm in vm_list]
+
+
+def time_placement(vm_placement, host_list, vm_list):
+    capacity_index = CapacityIndex(host_list)
+    for host in host_list:
+        host.set_capacity_index(capacity_index)
+    if isinstance(vm_placement, VmPlacementVectorized):
+        # build the matrix outside of the timed region, a Datacenter keeps it across batches
+        capacity_index.get_capacity_matrix()
+    start = time.perf_counter()
+    is_place_successful, vm_running_placed_list = vm_placement.try_to_place(capacity_index, vm_list)
+    elapsed = time.perf_counter()-start
+    if is_place_successful:
+        for vm_running in vm_running_placed_list:
+            vm_running.get_host().release_vm(vm_running)
+    return elapsed, is_place_successful
+
+
+if __name__ == "__main__":
+    num_vms = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    num_hosts_list = [int(arg) for arg in sys.argv[2:]] if len(sys.argv) > 2 else [1000, 10000, 100000]
+    vm_placement_list = [
+        ("index max-fit", VmPlacementMaxFit()),
+        ("vectorized max-fit", VmPlacementVectorized(VmPlacementVectorized.Score.MAX_FIT)),
+        ("vectorized best-fit", VmPlacementVectorized(VmPlacementVectorized.Score.BEST_FIT)),
+        ("vectorized dot-product", VmPlacementVectorized(VmPlacementVectorized.Score.DOT_PRODUCT)),
+    ]
+    for num_hosts in num_hosts_list:
+        host_list = build_host_list(num_hosts)
+        vm_list = build_vm_list(num_vms)
+        infeasible_vm = Vm(num_vms, 1.0, 64, 1024, 1024, 100)
+        infeasible_vm.bind_key(ENTITY_REGISTRY)
+        infeasible_vm_list = vm_list+[VmRunning(infeasible_vm)]
+        for name, vm_placement in vm_placement_list:
+            elapsed, is_place_successful = time_placement(vm_placement, host_list, vm_list)
+            rejected, is_rejected_placed = time_placement(vm_placement, host_list, infeasible_vm_list)
+            assert is_place_successful and not is_rejected_placed
+            print("%6d hosts %5d vms %-24s\tplace %8.4fs\treject %8.4fs" % (num_hosts, num_vms, name, elapsed, rejected))
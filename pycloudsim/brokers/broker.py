@@ -8,16 +8,44 @@ from typing import List, TYPE_CHECKING
 
 
 class Broker:
-    def __init__(self, simulator: Simulator, datacenter: Datacenter) -> None:
+    def __init__(self, simulator: Simulator, datacenter: Datacenter, id: int = -1, weight: float = 1.0) -> None:
         """
         A Broker represents a intermediate proxy communicating customers and a datacener.
         It hides management details such as Vm and Cloudlet behavior
         such as creation, allocation, schedule, etc.
+
+        Parameters
+        ----------
+        simulator: Simulator
+        datacenter: Datacenter
+        id: int
+            The tenant id stamped on every submitted Cloudlet, Brokers sharing an id
+            (e.g. all the Brokers created without one) are the same tenant
+        weight: float
+            The share of the tenant under fair-share Cloudlet scheduling,
+            a tenant of weight 2 gets twice the Pe time of a tenant of weight 1
         """
         if datacenter is None:
             raise ValueError("Datacenter can not be None")
+        if weight <= 0:
+            raise ValueError("Broker weight must greater than 0")
         self.datacenter = datacenter
         self.simulator = simulator
+        self.id = id
+        self.weight = weight
+        datacenter.set_broker_weight(id, weight)
+
+    def get_id(self) -> int:
+        return self.id
+
+    def get_weight(self) -> float:
+        return self.weight
+
+    def set_weight(self, weight: float) -> None:
+        if weight <= 0:
+            raise ValueError("Broker weight must greater than 0")
+        self.weight = weight
+        self.datacenter.set_broker_weight(self.id, weight)
 
     def submit_vm_list(self, vm_list: List[Vm]):
         """
@@ -26,13 +54,14 @@ class Broker:
         """
         for vm in vm_list:
             vm.set_state(Vm.State.SUBMITTED)
-        self.simulator.submit(Event(source=None, target=self.datacenter, event_type=Event.TYPE.VM_BIND, extra_data={"vm_list": vm_list, "simulator": self.simulator}, start_time=self.simulator.get_global_clock()))
+        self.simulator.schedule(self.datacenter, Event.TYPE.VM_BIND, self.simulator.get_global_clock(), vm_list)
 
     def submit_cloudlet_list(self, cloudlet_list: List[Cloudlet]):
         """
         After submission, datacenter will put all the submitted Cloudlets into a waiting queue,
-        all the cloudlets will be served in FIFO way
+        the order Cloudlets are served in is decided by the Cloudlet scheduler of the datacenter, FIFO by default
         """
         for cloudlet in cloudlet_list:
+            cloudlet.set_broker_id(self.id)
             cloudlet.set_state(Cloudlet.State.SUBMITTED)
-        self.simulator.submit(Event(source=None, target=self.datacenter, event_type=Event.TYPE.CLOUDLET_SUBMIT, extra_data={"cloudlet_list": cloudlet_list, "simulator": self.simulator}, start_time=self.simulator.get_global_clock()))
+        self.simulator.schedule(self.datacenter, Event.TYPE.CLOUDLET_SUBMIT, self.simulator.get_global_clock(), cloudlet_list)
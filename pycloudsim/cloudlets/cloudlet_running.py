@@ -1,22 +1,30 @@
 from __future__ import annotations
 from uuid import UUID
 from .clouldlet import Cloudlet
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from ..vms import VmRunning
+    from ..entity import EntityRegistry
 
 
 class CloudletRunning(Cloudlet):
     def __init__(self, cloudlet: Cloudlet) -> None:
         self.cloudlet = cloudlet
         self.vm_running = None
+        self.finish_event_handle = None
 
     def get_cloudlet(self) -> Cloudlet:
         return self.cloudlet
 
+    def get_key(self) -> int:
+        return self.cloudlet.get_key()
+
     def get_uuid(self) -> UUID:
         return self.cloudlet.get_uuid()
 
+    def get_entity_registry(self) -> Optional[EntityRegistry]:
+        return self.cloudlet.get_entity_registry()
+
     def get_id(self) -> int:
         return self.cloudlet.get_id()
 
@@ -38,6 +46,12 @@ class CloudletRunning(Cloudlet):
     def get_required_bandwidth(self) -> float:
         return self.cloudlet.get_required_bandwidth()
 
+    def get_priority(self) -> int:
+        return self.cloudlet.get_priority()
+
+    def get_broker_id(self) -> int:
+        return self.cloudlet.get_broker_id()
+
     def get_state(self) -> Cloudlet.State:
         return self.cloudlet.get_state()
 
@@ -56,13 +70,22 @@ class CloudletRunning(Cloudlet):
     def set_end_time(self, end_time: float) -> None:
         self.cloudlet.set_end_time(end_time)
 
-    def get_vm_uuid(self) -> UUID:
+    def get_vm_key(self) -> Optional[int]:
+        return self.cloudlet.get_vm_key()
+
+    def get_vm_uuid(self) -> Optional[UUID]:
         return self.cloudlet.get_vm_uuid()
 
     def set_vm_running(self, vm_running: Optional[VmRunning]) -> None:
         self.vm_running = vm_running
         if vm_running is not None:
-            self.cloudlet.set_vm_uuid(vm_running.get_uuid())
+            self.cloudlet.set_vm_key(vm_running.get_key())
 
     def get_vm_running(self) -> Optional[VmRunning]:
         return self.vm_running
+
+    def get_finish_event_handle(self) -> Any:
+        return self.finish_event_handle
+
+    def set_finish_event_handle(self, handle: Any) -> None:
+        self.finish_event_handle = handle
@@ -1,13 +1,15 @@
 from __future__ import annotations
 from enum import Enum
-from uuid import uuid1
-from typing import TYPE_CHECKING
+from ..entity.entity_registry import EntityKind, RegisteredEntity
+from typing import Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from ..vms import Vm
     from uuid import UUID
 
 
-class Cloudlet:
+class Cloudlet(RegisteredEntity):
+    kind = EntityKind.CLOUDLET
+
     class State(Enum):
         """
         The Cloudlet is created but has not been submitted to the datacenter broker
@@ -44,7 +46,7 @@ class Cloudlet:
         """
         CANCELED = 6
 
-    def __init__(self, id: int = -1, length: int = 1, num_pes: int = 1, utilization_pe: float = 1.0, required_ram: float = 0.0, required_storage: float = 0.0, required_bandwidth=0.0) -> None:
+    def __init__(self, id: int = -1, length: int = 1, num_pes: int = 1, utilization_pe: float = 1.0, required_ram: float = 0.0, required_storage: float = 0.0, required_bandwidth=0.0, priority: int = 0) -> None:
         """
         A Cloudlet is the basic unit of an application/job/task to be executed by a Vm
         
@@ -69,8 +71,13 @@ class Cloudlet:
             the allocated storage will be released after Cloudlet leaves Vm
         required_bandwidth: float
             The required bandwidth (Mbps) when the Cloudlet runs on a Vm
+        priority: int
+            The priority class of the Cloudlet, schedulers supporting priorities
+            start Cloudlets of a higher priority first
         """
-        self.uuid = uuid1()
+        # keyed in the simulation once a Datacenter accepts it
+        self.key = None
+        self.entity_registry = None
         self.id = id
         if length <= 0:
             raise ValueError("Cloudlet must greater than 0")
@@ -90,16 +97,17 @@ class Cloudlet:
         if required_bandwidth < 0:
             raise ValueError("Cloudlet required bandwidth must no less than 0")
         self.required_bandwidth = required_bandwidth
+        self.priority = priority
         # By default the state is initailized as ```CREATED```
         self.state = Cloudlet.State.CREATED
 
         self.start_time = 0.0
         self.end_time = 0.0
 
-        self.vm_uuid = None
+        self.vm_key = None
 
-    def get_uuid(self) -> UUID:
-        return self.uuid
+        # set by the Broker submitting the Cloudlet
+        self.broker_id = -1
 
     def get_id(self) -> int:
         return self.id
@@ -122,6 +130,18 @@ class Cloudlet:
     def get_required_bandwidth(self) -> float:
         return self.required_bandwidth
 
+    def get_priority(self) -> int:
+        return self.priority
+
+    def set_priority(self, priority: int) -> None:
+        self.priority = priority
+
+    def get_broker_id(self) -> int:
+        return self.broker_id
+
+    def set_broker_id(self, broker_id: int) -> None:
+        self.broker_id = broker_id
+
     def get_state(self) -> State:
         return self.state
 
@@ -140,8 +160,11 @@ class Cloudlet:
     def set_end_time(self, end_time: float) -> None:
         self.end_time = end_time
 
-    def get_vm_uuid(self) -> UUID:
-        return self.vm_uuid
+    def get_vm_key(self) -> Optional[int]:
+        return self.vm_key
+
+    def set_vm_key(self, vm_key: Optional[int]) -> None:
+        self.vm_key = vm_key
 
-    def set_vm_uuid(self, uuid: UUID):
-        self.vm_uuid = uuid
+    def get_vm_uuid(self) -> Optional[UUID]:
+        return None if self.vm_key is None else self.entity_registry.derive_uuid(EntityKind.VM, self.vm_key)
@@ -1,20 +1,36 @@
 from __future__ import annotations
-from ..entity import SimulationEntity
+from ..entity import SimulationEntity, EntityRegistry
 from ..events import Event
-from ..logger import Logger
+from ..logger import LogMessage, is_log_enabled, log_message
 from ..placement import VmPlacementMaxFit
 from ..placement import CloudletPlacementMaxFit
-from ..vms import Vm, VmRunning
+from ..placement import CapacityIndex
+from ..placement.vm_suitability import VmSuitability
+from ..scheduling import CloudletSchedulerFifo
+from ..resources import ResourcePool
+from ..vms import Vm, VmRunning, CloudletExecutionSpaceShared
+from ..results.result_sink_memory import ResultSinkMemory
 from ..cloudlets import Cloudlet, CloudletRunning
 from collections import deque
-from uuid import uuid1, UUID
-from typing import List, TYPE_CHECKING, Dict, Deque
+from ..entity.entity_registry import EntityKind, RegisteredEntity
+from typing import Callable, List, Optional, TYPE_CHECKING, Dict, Deque, Tuple
 import copy
+import logging
+import warnings
+import numpy as np
 if TYPE_CHECKING:
     from ..hosts import Host
+    from ..simulation import Simulator
+    from ..placement import VmPlacement, CloudletPlacement
+    from ..scheduling import CloudletScheduler
+    from ..vms import CloudletExecution
+    from ..monitoring import UtilizationRecorder
+    from ..results import ResultSink
 
 
-class Datacenter(SimulationEntity):
+class Datacenter(SimulationEntity, RegisteredEntity):
+    kind = EntityKind.DATACENTER
+
     def __init__(self, host_list: List[Host]) -> None:
         """
         A Datacenter consisting of Hosts is a complicated simulation entity which takes the role
@@ -23,187 +39,427 @@ class Datacenter(SimulationEntity):
         instead of continuouslly dispatching them to lower level components such as Hosts and Vms,
         which makes the code tidy but may be a little hard to understand the code
         """
-        self.uuid = uuid1()
-        self.host_running_dict = self._build_host_running_dict(host_list)
+        # the Datacenter and its Hosts are keyed when a Simulator adopts the Datacenter,
+        # the Hosts are looked up by key from then on
+        self.key = None
+        self.entity_registry = None
+        self.host_list = list(host_list)
+        for host in self.host_list:
+            host.set_datacenter(self)
+        self.host_running_dict = {}
+        self.host_capacity_index = CapacityIndex()
+        self.pe_busy_array, self.pe_utilization_array, self.host_pe_offset_array = self._build_pe_table(host_list)
+        self.resource_pool = self._build_resource_pool(host_list)
         self.vm_placement_policy = VmPlacementMaxFit()
         self.vm_booting_dict = {}
         self.vm_running_dict = {}
+        # running Vms that are not scheduled to shutdown, the candidates of Cloudlet placement
+        self.vm_capacity_index = CapacityIndex()
         self.vm_end_of_life_dict = {}
+        # creates the execution model of every Vm bound from now on
+        self.cloudlet_execution_factory = CloudletExecutionSpaceShared
         self.cloudlet_placement_policy = CloudletPlacementMaxFit()
-        self.cloudlet_waiting_deque = deque([])
+        self.cloudlet_scheduler = CloudletSchedulerFifo()
+        self.broker_weight_dict = {}
         self.cloudlet_running_dict = {}
         self.cloudlet_end_of_life_dict = {}
+        self.utilization_recorder = None
+        # receives the finished Cloudlets and Vms, the default keeps them in the end of life dicts
+        self.result_sink = ResultSinkMemory()
+        self.simulator = None
+        self.event_handler_dict = self._build_event_handler_dict()
 
-    def _build_host_running_dict(self, host_list: List[Host]) -> Dict[UUID, Host]:
+    def _build_host_running_dict(self, host_list: List[Host]) -> Dict[int, Host]:
         host_running_dict = {}
         for host in host_list:
-            host.set_datacenter(self)
-            host_running_dict[host.get_uuid()] = host
+            host_running_dict[host.get_key()] = host
         return host_running_dict
 
+    def _build_host_capacity_index(self, host_list: List[Host]) -> CapacityIndex:
+        host_capacity_index = CapacityIndex(host_list)
+        for host in host_list:
+            host.set_capacity_index(host_capacity_index)
+        return host_capacity_index
+
+    def _build_pe_table(self, host_list: List[Host]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The Pe state of all Hosts in one contiguous pair of arrays, Host after Host,
+        the Pe allocators of the Hosts write through into their slice
+        """
+        host_pe_offset_array = np.zeros(len(host_list), dtype=np.int64)
+        offset = 0
+        for position, host in enumerate(host_list):
+            host_pe_offset_array[position] = offset
+            offset += host.get_num_pes()
+        pe_busy_array = np.zeros(offset, dtype=bool)
+        pe_utilization_array = np.zeros(offset, dtype=np.float64)
+        for host, offset in zip(host_list, host_pe_offset_array):
+            host.get_pe_allocator().attach(pe_busy_array, pe_utilization_array, int(offset))
+        return pe_busy_array, pe_utilization_array, host_pe_offset_array
+
+    def _build_resource_pool(self, host_list: List[Host]) -> ResourcePool:
+        """
+        One ResourcePool shared by all Hosts and the Vms placed on them,
+        Hosts take the first rows in the order they are given
+        """
+        resource_pool = ResourcePool(2*len(host_list))
+        for host in host_list:
+            host.attach_resource_pool(resource_pool)
+        return resource_pool
+
+    def bind_key(self, entity_registry: EntityRegistry) -> None:
+        """
+        Take the keys of the Datacenter and its Hosts from ```entity_registry``` and index the Hosts by key
+        """
+        super().bind_key(entity_registry)
+        for host in self.host_list:
+            host.bind_key(entity_registry)
+        self.host_running_dict = self._build_host_running_dict(self.host_list)
+        self.host_capacity_index = self._build_host_capacity_index(self.host_list)
+        if self.utilization_recorder is not None:
+            self.utilization_recorder.attach(self)
+
+    def _build_event_handler_dict(self) -> Dict[Event.TYPE, Callable[[Event], None]]:
+        """
+        Host events, VM_FAIL and CLOUDLET_FAIL are not implemented yet,
+        events without a handler are ignored
+        """
+        return {
+            Event.TYPE.SIMULATION_TERMINATE: self.process_simulation_terminate,
+            Event.TYPE.VM_DESTORY: self.process_vm_destroy,
+            Event.TYPE.VM_BIND: self.process_vm_bind,
+            Event.TYPE.VM_SHUTDOWN: self.process_vm_shutdown,
+            Event.TYPE.VM_BOOTUP: self.process_vm_bootup,
+            Event.TYPE.CLOUDLET_FINISH: self.process_cloudlet_finish,
+            Event.TYPE.CLOUDLET_BIND: self.processs_cloudlet_bind,
+            Event.TYPE.CLOUDLET_SUBMIT: self.process_cloudlet_submit,
+        }
+
+    def register_event_handler(self, event_type: Event.TYPE, handler: Optional[Callable[[Event], None]]) -> None:
+        """
+        Replace the handler of an event type, ```None``` removes it
+        """
+        if handler is None:
+            self.event_handler_dict.pop(event_type, None)
+        else:
+            self.event_handler_dict[event_type] = handler
+
     def process(self, event: Event):
-        if event.get_event_type() == Event.TYPE.SIMULATION_TERMINATE:
-            self.process_simulation_terminate(event)
-        elif event.get_event_type() == Event.TYPE.HOST_REMOVE:
-            pass
-        elif event.get_event_type() == Event.TYPE.HOST_ADD:
-            pass
-        elif event.get_event_type() == Event.TYPE.HOST_POWERON:
-            pass
-        elif event.get_event_type() == Event.TYPE.HOST_POWEROFF:
-            pass
-        elif event.get_event_type() == Event.TYPE.VM_FAIL:
-            pass
-        elif event.get_event_type() == Event.TYPE.VM_DESTORY:
-            self.process_vm_destroy(event)
-        elif event.get_event_type() == Event.TYPE.VM_BIND:
-            self.process_vm_bind(event)
-        elif event.get_event_type() == Event.TYPE.VM_SHUTDOWN:
-            self.process_vm_shutdown(event)
-        elif event.get_event_type() == Event.TYPE.VM_BOOTUP:
-            self.process_vm_bootup(event)
-        elif event.get_event_type() == Event.TYPE.CLOUDLET_FAIL:
-            pass
-        elif event.get_event_type() == Event.TYPE.CLOUDLET_FINISH:
-            self.process_cloudlet_finish(event)
-        elif event.get_event_type() == Event.TYPE.CLOUDLET_BIND:
-            self.processs_cloudlet_bind(event)
-        elif event.get_event_type() == Event.TYPE.CLOUDLET_SUBMIT:
-            self.process_cloudlet_submit(event)
+        handler = self.event_handler_dict.get(event.event_type)
+        if handler is not None:
+            handler(event)
 
     def process_vm_bind(self, event: Event):
         """
         Bind submitted Vm to Host, it will bind all or none of the Vms in the submitted Vm list.
         The bind strategy is max-fit
         """
-        extra_data = event.get_extra_data()
-        simulator = extra_data["simulator"]
-        vm_list = extra_data["vm_list"]
-        logger = Logger()
-        logger.info("%6.2f\tDatacenter\tTrying to bind vm to host" % simulator.get_global_clock())
+        simulator = self.simulator
+        vm_list = event.get_payload()
+        entity_registry = simulator.get_entity_registry()
+        for vm in vm_list:
+            vm.bind_key(entity_registry)
+        is_info_logged = is_log_enabled(logging.INFO)
+        if is_info_logged:
+            log_message(LogMessage.VM_BIND_TRYING, simulator.get_global_clock())
 
-        is_placement_succeeded, vm_running_placed_list = self.vm_placement_policy.try_to_place([host for host in self.host_running_dict.values()], [VmRunning(vm) for vm in vm_list])
+        vm_placement_policy = self.vm_placement_policy
+        # policies that have not opted in to the CapacityIndex are given a host list
+        host_source = self.host_capacity_index if vm_placement_policy.accepts_capacity_index else list(self.host_running_dict.values())
+        is_placement_succeeded, vm_running_placed_list = vm_placement_policy.try_to_place(host_source, [VmRunning(vm, self.cloudlet_execution_factory()) for vm in vm_list])
         if not is_placement_succeeded:
             for vm in vm_list:
                 vm.set_state(Vm.State.CANCELED)
-            logger.warning("%6.2f\tDatacenter\tFailed to bind vms to host since there is no suitable host to accommodate all the vms")
+            if is_log_enabled(logging.WARNING):
+                log_message(LogMessage.VM_BIND_FAILED, simulator.get_global_clock())
         else:
             for vm_running in vm_running_placed_list:
-                self.vm_booting_dict[vm_running.get_uuid()] = vm_running
+                self.vm_booting_dict[vm_running.get_key()] = vm_running
                 vm_running.set_state(Vm.State.BOUNDED)
-                simulator.submit(Event(source=None, target=self, event_type=Event.TYPE.VM_BOOTUP, extra_data={"vm": vm_running, "simulator": simulator}, start_time=simulator.get_global_clock()+vm_running.get_startup_delay()))
-                host = vm_running.get_host()
-                logger.info("%6.2f\tDatacenter\tBind Vm %d to Host %d" % (simulator.get_global_clock(), vm_running.get_id(), host.get_id()))
-            logger.info("%6.2f\tDatacenter\tSucceed to bind vm to host" % simulator.get_global_clock())
+                simulator.schedule(self, Event.TYPE.VM_BOOTUP, simulator.get_global_clock()+vm_running.get_startup_delay(), vm_running)
+                if is_info_logged:
+                    log_message(LogMessage.VM_BIND, simulator.get_global_clock(), vm_running.get_id(), vm_running.get_host().get_id())
+            if is_info_logged:
+                log_message(LogMessage.VM_BIND_SUCCEEDED, simulator.get_global_clock())
 
     def process_vm_bootup(self, event: Event) -> None:
-        extra_data = event.get_extra_data()
-        vm_to_run = extra_data["vm"]
-        simulator = extra_data["simulator"]
+        vm_to_run = event.get_payload()
+        simulator = self.simulator
         vm_to_run.set_state(Vm.State.RUNNING)
-        self.vm_booting_dict.pop(vm_to_run.get_uuid())
-        self.vm_running_dict[vm_to_run.get_uuid()] = vm_to_run
-        logger = Logger()
-        logger.info("%6.2f\tDatacenter\tVm %d booted up" % (simulator.get_global_clock(), vm_to_run.get_id()))
-        simulator.submit(Event(source=None, target=self, event_type=Event.TYPE.CLOUDLET_BIND, extra_data={"simulator": simulator}, start_time=simulator.get_global_clock()))
+        self.vm_booting_dict.pop(vm_to_run.get_key())
+        self.vm_running_dict[vm_to_run.get_key()] = vm_to_run
+        vm_to_run.set_capacity_index(self.vm_capacity_index)
+        if not vm_to_run.get_is_scheduled_to_shutdown():
+            self.vm_capacity_index.add(vm_to_run)
+        if is_log_enabled(logging.INFO):
+            log_message(LogMessage.VM_BOOTUP, simulator.get_global_clock(), vm_to_run.get_id())
+        simulator.schedule(self, Event.TYPE.CLOUDLET_BIND, simulator.get_global_clock())
 
     def process_cloudlet_submit(self, event: Event) -> None:
         """
-        Store all the submitted cloudlet in the waiting queue
+        Store all the submitted cloudlet in the waiting queue of the Cloudlet scheduler
         """
-        extra_data = event.get_extra_data()
-        cloudlet_list = extra_data["cloudlet_list"]
-        simulator = extra_data["simulator"]
-        logger = Logger()
+        cloudlet_list = event.get_payload()
+        simulator = self.simulator
+        entity_registry = simulator.get_entity_registry()
+        is_info_logged = is_log_enabled(logging.INFO)
         for cloudlet in cloudlet_list:
-            self.cloudlet_waiting_deque.append(cloudlet)
-            logger.info("%6.2f\tDatacenter\tCloudlet %d submitted" % (simulator.get_global_clock(), cloudlet.get_id()))
-        simulator.submit(Event(source=None, target=self, event_type=Event.TYPE.CLOUDLET_BIND, extra_data={"simulator": simulator}, start_time=simulator.get_global_clock()))
+            cloudlet.bind_key(entity_registry)
+            self.cloudlet_scheduler.submit(cloudlet)
+            if is_info_logged:
+                log_message(LogMessage.CLOUDLET_SUBMIT, simulator.get_global_clock(), cloudlet.get_id())
+        simulator.schedule(self, Event.TYPE.CLOUDLET_BIND, simulator.get_global_clock())
 
     def processs_cloudlet_bind(self, event: Event) -> None:
         """
-        Bind Cloudlets in the waiting queue as many as possibile util
-        the waiting queue is empty or there is no Vm resource left
+        Bind waiting Cloudlets to Vms, which Cloudlets are tried and in what order
+        is up to the Cloudlet scheduler, FIFO by default
+        """
+        self.cloudlet_scheduler.schedule(self)
+
+    def predict_exec_time(self, cloudlet: Cloudlet, vm_running: VmRunning) -> float:
+        return round(cloudlet.get_length()/(vm_running.get_mips()*cloudlet.get_utilization_pe()), 2)
+
+    def try_to_bind(self, cloudlet: Cloudlet, vm_running: Optional[VmRunning] = None) -> Optional[CloudletRunning]:
+        """
+        Start a waiting Cloudlet now, the callback of Cloudlet schedulers
+
+        Parameters
+        ----------
+        cloudlet: Cloudlet
+            The cloudlet to start, it must have been removed from or stay in
+            the waiting queue by the caller
+        vm_running: VmRunning
+            Bind to this Vm instead of the one chosen by the Cloudlet placement policy
+
+        Returns
+        -------
+        The CloudletRunning started, ```None``` if there is no suitable Vm
         """
-        extra_data = event.get_extra_data()
-        simulator = extra_data["simulator"]
-        logger = Logger()
-        while not len(self.cloudlet_waiting_deque) == 0:
-            cloudlet = self.cloudlet_waiting_deque.popleft()
-            is_placement_succeeded, cloudlet_running_placed_list = self.cloudlet_placement_policy.try_to_place([vm_running for vm_running in self.vm_running_dict.values() if not vm_running.get_is_scheduled_to_shutdown()], [CloudletRunning(cloudlet)])
+        # no Vm has enough free Pes, skip wrapping the cloudlet for the placement policy
+        if cloudlet.get_num_pes() > self.vm_capacity_index.get_max_num_pes_available():
+            return None
+        cloudlet_running = CloudletRunning(cloudlet)
+        if vm_running is None:
+            cloudlet_placement_policy = self.cloudlet_placement_policy
+            # the Vms in the index, i.e. the running ones not scheduled to shutdown
+            vm_source = self.vm_capacity_index if cloudlet_placement_policy.accepts_capacity_index else [vm_running for vm_running in self.vm_running_dict.values() if not vm_running.get_is_scheduled_to_shutdown()]
+            is_placement_succeeded, _ = cloudlet_placement_policy.try_to_place(vm_source, [cloudlet_running])
             if not is_placement_succeeded:
-                logger.warning("%6.2f\tDatacenter\tNo suitable Vm for Cloudlet %d, schedule will delay util there are available resources" % (simulator.get_global_clock(), cloudlet.get_id()))
-                self.cloudlet_waiting_deque.appendleft(cloudlet)
-                break
-            else:
-                for cloudlet_running in cloudlet_running_placed_list:
-                    cloudlet_running.set_state(Cloudlet.State.RUNNING)
-                    vm_running = cloudlet_running.get_vm_running()
-                    self.cloudlet_running_dict[cloudlet_running.get_uuid()] = cloudlet_running
-                    cloudlet_running.set_start_time(simulator.get_global_clock())
-                    mips = vm_running.get_mips()
-                    exec_time = round(cloudlet.get_length()/(mips*cloudlet.get_utilization_pe()), 2)
-                    simulator.submit(Event(source=None, target=self, event_type=Event.TYPE.CLOUDLET_FINISH, extra_data={"cloudlet": cloudlet_running, "simulator": simulator}, start_time=simulator.get_global_clock()+exec_time))
-                    logger.info("%6.2f\tDatacenter\tBind Cloudlet %d to Vm %d" % (simulator.get_global_clock(), cloudlet.get_id(), vm_running.get_id()))
+                return None
+        else:
+            vm_suitability = VmSuitability(vm_running)
+            vm_suitability.update_suitability(cloudlet_running)
+            if not self.vm_capacity_index.contains(vm_running) or not vm_suitability.get_suitability():
+                return None
+            vm_running.bind_cloudlet(cloudlet_running)
+        simulator = self.simulator
+        cloudlet_running.set_state(Cloudlet.State.RUNNING)
+        vm_running = cloudlet_running.get_vm_running()
+        self.cloudlet_running_dict[cloudlet_running.get_key()] = cloudlet_running
+        cloudlet_running.set_start_time(simulator.get_global_clock())
+        vm_running.get_cloudlet_execution().start(self, cloudlet_running)
+        if is_log_enabled(logging.INFO):
+            log_message(LogMessage.CLOUDLET_BIND, simulator.get_global_clock(), cloudlet.get_id(), vm_running.get_id())
+        return cloudlet_running
 
     def process_cloudlet_finish(self, event: Event) -> None:
-        extra_data = event.get_extra_data()
-        cloudlet_running = extra_data["cloudlet"]
-        simulator = extra_data["simulator"]
+        cloudlet_running = event.get_payload()
+        simulator = self.simulator
         cloudlet_running.set_end_time(simulator.get_global_clock())
-        self.cloudlet_running_dict.pop(cloudlet_running.get_uuid())
-        vm_running = self.vm_running_dict[cloudlet_running.get_vm_running().get_uuid()]
+        self.cloudlet_running_dict.pop(cloudlet_running.get_key())
+        vm_running = self.vm_running_dict[cloudlet_running.get_vm_running().get_key()]
+        vm_running.get_cloudlet_execution().stop(self, cloudlet_running)
         vm_running.release_cloudlet(cloudlet_running)
         cloudlet_running.set_state(Cloudlet.State.SUCCEEDED)
-        self.cloudlet_end_of_life_dict[cloudlet_running.get_uuid()] = cloudlet_running.get_cloudlet()
-        logger = Logger()
-        logger.info("%6.2f\tDatacenter\tCloudlet %d exection done at Vm %d" % (simulator.get_global_clock(), cloudlet_running.get_id(), vm_running.get_id()))
-        simulator.submit(Event(source=None, target=self, event_type=Event.TYPE.CLOUDLET_BIND, extra_data={"simulator": simulator}, start_time=simulator.get_global_clock()))
+        self.result_sink.write_cloudlet(self, cloudlet_running.get_cloudlet())
+        if is_log_enabled(logging.INFO):
+            log_message(LogMessage.CLOUDLET_FINISH, simulator.get_global_clock(), cloudlet_running.get_id(), vm_running.get_id())
+        simulator.schedule(self, Event.TYPE.CLOUDLET_BIND, simulator.get_global_clock())
         if vm_running.get_is_scheduled_to_shutdown() and len(vm_running.get_cloudlet_running_dict()) == 0:
-            simulator.submit(Event(source=None, target=self, event_type=Event.TYPE.VM_SHUTDOWN, extra_data={"vm": vm_running, "simulator": simulator}, start_time=simulator.get_global_clock()))
+            simulator.schedule(self, Event.TYPE.VM_SHUTDOWN, simulator.get_global_clock(), vm_running)
 
     def process_vm_shutdown(self, event: Event) -> None:
-        extra_data = event.get_extra_data()
-        vm_running = extra_data["vm"]
-        simulator = extra_data["simulator"]
-        logger = Logger()
-        logger.info("%6.2f\tDatacenter\tVm %d begins shutting down" % (simulator.get_global_clock(), vm_running.get_id()))
+        vm_running = event.get_payload()
+        simulator = self.simulator
+        if is_log_enabled(logging.INFO):
+            log_message(LogMessage.VM_SHUTDOWN, simulator.get_global_clock(), vm_running.get_id())
         vm_running.set_state(Vm.State.SHUTTINGDOWN)
-        cloudlet_running_dict = vm_running.get_cloudlet_running_dict()
-        for cloudlet_running in cloudlet_running_dict.values():
+        if self.vm_capacity_index.contains(vm_running):
+            self.vm_capacity_index.remove(vm_running)
+        vm_running.set_capacity_index(None)
+        # release_cloudlet() removes the cloudlet from the Vm, iterate over a snapshot
+        for cloudlet_running in list(vm_running.get_cloudlet_running_dict().values()):
+            # retract the pending CLOUDLET_FINISH event of the failed cloudlet
+            vm_running.get_cloudlet_execution().stop(self, cloudlet_running)
             cloudlet_running.set_end_time(simulator.get_global_clock())
             vm_running.release_cloudlet(cloudlet_running)
             cloudlet_running.set_state(Cloudlet.State.FAILED)
-            self.cloudlet_running_dict.pop(cloudlet_running.get_uuid())
-            self.cloudlet_end_of_life_dict[cloudlet_running.get_uuid()] = cloudlet_running.get_cloudlet()
-        simulator.submit(Event(source=None, target=self, event_type=Event.TYPE.VM_DESTORY, extra_data={"vm": vm_running, "simulator": simulator}, start_time=simulator.get_global_clock()+vm_running.get_shutdown_delay()))
+            self.cloudlet_running_dict.pop(cloudlet_running.get_key())
+            self.result_sink.write_cloudlet(self, cloudlet_running.get_cloudlet())
+        simulator.schedule(self, Event.TYPE.VM_DESTORY, simulator.get_global_clock()+vm_running.get_shutdown_delay(), vm_running)
 
     def process_simulation_terminate(self, event: Event) -> None:
-        extra_data = event.get_extra_data()
-        simulator = extra_data["simulator"]
+        simulator = self.simulator
         for vm_running in self.vm_running_dict.values():
-            simulator.submit(Event(source=None, target=self, event_type=Event.TYPE.VM_SHUTDOWN, extra_data={"vm": vm_running, "simulator": simulator}, start_time=simulator.get_global_clock()))
-        for cloudlet in self.cloudlet_waiting_deque:
+            simulator.schedule(self, Event.TYPE.VM_SHUTDOWN, simulator.get_global_clock(), vm_running)
+        for cloudlet in self.cloudlet_scheduler.drain():
             cloudlet.set_state(Cloudlet.State.CANCELED)
-            self.cloudlet_end_of_life_dict[cloudlet.get_uuid()] = cloudlet
+            self.result_sink.write_cloudlet(self, cloudlet)
 
     def process_vm_destroy(self, event: Event) -> None:
-        extra_data = event.get_extra_data()
-        vm_running = extra_data["vm"]
-        simulator = extra_data["simulator"]
+        vm_running = event.get_payload()
+        simulator = self.simulator
         host = vm_running.get_host()
         host.release_vm(vm_running)
         vm_running.set_state(Vm.State.DESTROYED)
-        self.vm_running_dict.pop(vm_running.get_uuid())
-        self.vm_end_of_life_dict[vm_running.get_uuid()] = vm_running.get_vm()
-        logger = Logger()
-        logger.info("%6.2f\tDatacenter\tVm %d destroyed on Host %d" % (simulator.get_global_clock(), vm_running.get_id(), host.get_id()))
+        self.vm_running_dict.pop(vm_running.get_key())
+        self.result_sink.write_vm(self, vm_running.get_vm())
+        if is_log_enabled(logging.INFO):
+            log_message(LogMessage.VM_DESTORY, simulator.get_global_clock(), vm_running.get_id(), host.get_id())
 
     def get_host_running_dict(self) -> Dict[Host]:
         return self.host_running_dict
 
+    def get_pe_busy_array(self) -> np.ndarray:
+        """
+        Busy flags of all host Pes, Hosts in the order they were given to the Datacenter
+        """
+        return self.pe_busy_array
+
+    def get_pe_utilization_array(self) -> np.ndarray:
+        """
+        Allocated utilization rates of all host Pes, Hosts in the order they were given to the Datacenter
+        """
+        return self.pe_utilization_array
+
+    def get_host_pe_offset_array(self) -> np.ndarray:
+        """
+        Position of the first Pe of every Host in the Pe arrays
+        """
+        return self.host_pe_offset_array
+
+    def get_host_utilization_array(self) -> np.ndarray:
+        """
+        Mean allocated utilization rate over the Pes of every Host
+        """
+        num_hosts = len(self.host_pe_offset_array)
+        num_pes_array = np.diff(np.append(self.host_pe_offset_array, len(self.pe_utilization_array)))
+        utilization_sum_array = np.bincount(np.repeat(np.arange(num_hosts), num_pes_array), weights=self.pe_utilization_array, minlength=num_hosts)
+        return np.where(num_pes_array > 0, utilization_sum_array/np.maximum(num_pes_array, 1), 0.0)
+
+    def get_resource_pool(self) -> ResourcePool:
+        return self.resource_pool
+
+    def get_host_capacity_index(self) -> CapacityIndex:
+        return self.host_capacity_index
+
     def get_vm_running_dict(self) -> Dict[VmRunning]:
         return self.vm_running_dict
 
+    def get_vm_capacity_index(self) -> CapacityIndex:
+        return self.vm_capacity_index
+
+    def get_cloudlet_waiting_list(self) -> List[Cloudlet]:
+        """
+        A snapshot of the waiting Cloudlets in submission order, the waiting queue belongs
+        to the Cloudlet scheduler, changing the list does not change the queue
+        """
+        return self.cloudlet_scheduler.get_waiting_list()
+
     def get_cloudlet_waiting_deque(self) -> Deque[Cloudlet]:
-        return self.cloudlet_waiting_deque
+        """
+        Deprecated, use ```get_cloudlet_waiting_list```. The deque is a copy, removing
+        or adding Cloudlets to it no longer changes the waiting queue
+        """
+        warnings.warn("Datacenter.get_cloudlet_waiting_deque returns a copy and is deprecated, use get_cloudlet_waiting_list", DeprecationWarning, stacklevel=2)
+        return deque(self.cloudlet_scheduler.get_waiting_list())
+
+    def get_cloudlet_scheduler(self) -> CloudletScheduler:
+        return self.cloudlet_scheduler
+
+    def set_cloudlet_scheduler(self, cloudlet_scheduler: CloudletScheduler) -> None:
+        """
+        Replace the Cloudlet scheduler, waiting Cloudlets are moved over in submission order
+        """
+        for cloudlet in self.cloudlet_scheduler.drain():
+            cloudlet_scheduler.submit(cloudlet)
+        self.cloudlet_scheduler = cloudlet_scheduler
+
+    def get_broker_weight(self, broker_id: int) -> float:
+        return self.broker_weight_dict.get(broker_id, 1.0)
+
+    def set_broker_weight(self, broker_id: int, weight: float) -> None:
+        self.broker_weight_dict[broker_id] = weight
+
+    def get_cloudlet_execution_factory(self) -> Callable[[], CloudletExecution]:
+        return self.cloudlet_execution_factory
+
+    def set_cloudlet_execution_factory(self, cloudlet_execution_factory: Callable[[], CloudletExecution]) -> None:
+        """
+        Choose how Cloudlets share the Pes of the Vms bound from now on,
+        e.g. ```CloudletExecutionTimeShared``` for processor sharing on oversubscribed Vms
+        """
+        self.cloudlet_execution_factory = cloudlet_execution_factory
+
+    def get_utilization_recorder(self) -> Optional[UtilizationRecorder]:
+        return self.utilization_recorder
+
+    def set_utilization_recorder(self, utilization_recorder: UtilizationRecorder) -> None:
+        """
+        Record the usage of every Host and Vm each time a Vm or Cloudlet is bound or released,
+        starting with the current usage. Before a Simulator adopts the Datacenter the recorder
+        is attached once the Hosts are keyed
+        """
+        self.utilization_recorder = utilization_recorder
+        if self.key is not None:
+            utilization_recorder.attach(self)
+
+    def get_result_sink(self) -> ResultSink:
+        return self.result_sink
+
+    def _check_result_sink_in_memory(self) -> None:
+        if not isinstance(self.result_sink, ResultSinkMemory):
+            raise ValueError("Datacenter writes results to a %s, finished Cloudlets and Vms are not kept in memory, read them from the sink" % type(self.result_sink).__name__)
+
+    def get_cloudlet_end_of_life_dict(self) -> Dict[int, Cloudlet]:
+        """
+        The finished Cloudlets keyed by entity key, only kept with the default ResultSinkMemory
+        """
+        self._check_result_sink_in_memory()
+        return self.cloudlet_end_of_life_dict
+
+    def get_vm_end_of_life_dict(self) -> Dict[int, Vm]:
+        """
+        The finished Vms keyed by entity key, only kept with the default ResultSinkMemory
+        """
+        self._check_result_sink_in_memory()
+        return self.vm_end_of_life_dict
+
+    def set_result_sink(self, result_sink: ResultSink) -> None:
+        """
+        Stream the Cloudlets and Vms finished from now on to a sink instead of keeping them
+        in ```cloudlet_end_of_life_dict``` and ```vm_end_of_life_dict```, e.g. ```ResultSinkCsv```,
+        so that memory does not grow with the length of the run
+        """
+        self.result_sink = result_sink
+
+    def get_vm_placement_policy(self) -> VmPlacement:
+        return self.vm_placement_policy
+
+    def set_vm_placement_policy(self, vm_placement_policy: VmPlacement) -> None:
+        self.vm_placement_policy = vm_placement_policy
+
+    def get_cloudlet_placement_policy(self) -> CloudletPlacement:
+        return self.cloudlet_placement_policy
+
+    def set_cloudlet_placement_policy(self, cloudlet_placement_policy: CloudletPlacement) -> None:
+        self.cloudlet_placement_policy = cloudlet_placement_policy
+
+    def get_simulator(self) -> Simulator:
+        return self.simulator
+
+    def set_simulator(self, simulator: Simulator) -> None:
+        self.simulator = simulator
+        if self.key is None:
+            self.bind_key(simulator.get_entity_registry())
@@ -1 +1,2 @@
-from .simulation_entity import SimulationEntity
\ No newline at end of file
+from .simulation_entity import SimulationEntity
+from .entity_registry import EntityKind, EntityRegistry, RegisteredEntity
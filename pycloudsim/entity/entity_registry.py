@@ -0,0 +1,90 @@
+"""
+Dense integer keys of simulation entities.
+
+An EntityRegistry hands out keys 0, 1, 2, ... separately for every kind, so dicts are keyed
+by small ints and per-entity state can live in arrays indexed by key.
+Every Simulator has a registry of its own, and an entity has no key (```key``` is None) until
+it is attached to a simulation: the Datacenter, its Hosts and their Pes and resources when the
+Simulator adopts the Datacenter, a Vm or Cloudlet when the Datacenter accepts it. So the keys
+of every simulation start at 0 whatever else runs in the process.
+UUIDs are not generated any more, ```EntityRegistry.derive_uuid``` builds one from the kind and
+key when an entity is exported, salted with the namespace of the registry so entities of
+different simulations never share a UUID
+"""
+from __future__ import annotations
+from enum import Enum
+from uuid import UUID, uuid4, uuid5
+from typing import List, Optional
+
+
+class EntityKind(Enum):
+    DATACENTER = 0
+    HOST = 1
+    VM = 2
+    CLOUDLET = 3
+    PE = 4
+    RAM = 5
+    STORAGE = 6
+    BANDWIDTH = 7
+
+
+class EntityRegistry:
+    def __init__(self, namespace: Optional[UUID] = None) -> None:
+        """
+        Hands out the next key of every entity kind
+
+        Parameters
+        ----------
+        namespace: UUID
+            Namespace of the derived UUIDs, a random one by default. Pass the same namespace
+            to reproduce the UUIDs of an earlier run
+        """
+        self.namespace = namespace if namespace is not None else uuid4()
+        self.next_key_list: List[int] = [0]*len(EntityKind)
+
+    def next_key(self, kind: EntityKind) -> int:
+        key = self.next_key_list[kind.value]
+        self.next_key_list[kind.value] = key+1
+        return key
+
+    def get_num_keys(self, kind: EntityKind) -> int:
+        """
+        Number of keys handed out for a kind, the size of an array indexed by key
+        """
+        return self.next_key_list[kind.value]
+
+    def get_namespace(self) -> UUID:
+        return self.namespace
+
+    def derive_uuid(self, kind: EntityKind, key: int) -> UUID:
+        """
+        The UUID of an entity for export, the same kind and key always give the same UUID
+        within a registry
+        """
+        return uuid5(self.namespace, "%s/%d" % (kind.name, key))
+
+
+class RegisteredEntity:
+    """
+    An entity keyed by the EntityRegistry of the simulation it is attached to
+    """
+    __slots__ = ()
+    kind: EntityKind = None
+
+    def bind_key(self, entity_registry: EntityRegistry) -> None:
+        """
+        Take the next key of the kind from ```entity_registry```
+        """
+        self.entity_registry = entity_registry
+        self.key = entity_registry.next_key(self.kind)
+
+    def get_key(self) -> Optional[int]:
+        return self.key
+
+    def get_entity_registry(self) -> Optional[EntityRegistry]:
+        return self.entity_registry
+
+    def get_uuid(self) -> UUID:
+        if self.key is None:
+            raise RuntimeError("%s is not attached to a simulation and has no key" % self.kind.name.capitalize())
+        return self.entity_registry.derive_uuid(self.kind, self.key)
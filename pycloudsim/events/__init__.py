@@ -1 +1,2 @@
-from .event import Event
\ No newline at end of file
+from .event import Event
+from .event_pool import EventPool
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Dict
+from typing import Any, Dict
 
 
 class Event:
@@ -127,10 +127,14 @@ class Event:
         """
         CLOUDLET_SUBMIT = 403
 
-    def __init__(self, source: object = None, target: object = None, event_type: TYPE = None, extra_data: Dict = None, start_time: float = 0.0) -> None:
+    __slots__ = ("source", "target", "event_type", "priority", "extra_data", "payload", "start_time", "is_pooled")
+
+    def __init__(self, source: object = None, target: object = None, event_type: TYPE = None, extra_data: Dict = None, start_time: float = 0.0, payload: Any = None) -> None:
         """
         A Event is a event must be processed during simulation by entities which is a subclass of SimulationEntity.
-        It is also a "commnunication protocol" between simulation entities
+        It is also a "commnunication protocol" between simulation entities.
+        Events are fixed-field records (```__slots__```), the simulator is never stored
+        in an event since every entity already knows it
         
         Parameters
         ----------
@@ -146,14 +150,21 @@ class Event:
             It is similar to Intent in Android programming
         start_time: float
             When the event will occur
+        payload: Any
+            The single object the built-in events carry instead of an ```extra_data``` dict:
+            the Vm list of VM_BIND, the VmRunning of VM_BOOTUP/VM_SHUTDOWN/VM_DESTORY,
+            the Cloudlet list of CLOUDLET_SUBMIT and the CloudletRunning of CLOUDLET_FINISH
         """
         if event_type is None:
             raise ValueError("Event type can not be None")
         self.source = source
         self.target = target
         self.event_type = event_type
+        self.priority = event_type.value
         self.extra_data = extra_data
+        self.payload = payload
         self.start_time = start_time
+        self.is_pooled = False
 
     def get_start_time(self):
         return self.start_time
@@ -168,7 +179,10 @@ class Event:
         return self.event_type
 
     def get_event_priority(self):
-        return self.event_type.value
+        return self.priority
 
     def get_extra_data(self):
         return self.extra_data
+
+    def get_payload(self):
+        return self.payload
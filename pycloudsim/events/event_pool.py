@@ -0,0 +1,52 @@
+from __future__ import annotations
+from .event import Event
+from typing import Any
+
+
+class EventPool:
+    def __init__(self, max_size: int = 4096) -> None:
+        """
+        A bounded free-list of Events. The simulator returns every pooled event
+        to the pool once it has been dispatched, and ```acquire()``` reuses them
+        instead of allocating new ones. Listeners must not keep references
+        to pooled events after ```EventListener.update()``` returns
+
+        Parameters
+        ----------
+        max_size: int
+            The maximum number of free events kept, 0 disables recycling
+        """
+        self.max_size = max_size
+        self.free_list = []
+        self.num_allocated = 0
+        self.num_reused = 0
+
+    def acquire(self, target: object, event_type: Event.TYPE, start_time: float, payload: Any = None) -> Event:
+        if self.free_list:
+            event = self.free_list.pop()
+            event.target = target
+            event.event_type = event_type
+            event.priority = event_type.value
+            event.payload = payload
+            event.start_time = start_time
+            self.num_reused += 1
+        else:
+            event = Event(target=target, event_type=event_type, start_time=start_time, payload=payload)
+            event.is_pooled = True
+            self.num_allocated += 1
+        return event
+
+    def release(self, event: Event) -> None:
+        if event.is_pooled and len(self.free_list) < self.max_size:
+            # drop references so recycled events do not keep entities alive
+            event.source = None
+            event.target = None
+            event.extra_data = None
+            event.payload = None
+            self.free_list.append(event)
+
+    def get_num_allocated(self) -> int:
+        return self.num_allocated
+
+    def get_num_reused(self) -> int:
+        return self.num_reused
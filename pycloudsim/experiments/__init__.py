@@ -0,0 +1,2 @@
+from .replication_runner import ReplicationRunner, ReplicationAggregator, summarize_simulator, mean_cloudlet_turnaround_time
+from .parameter_sweep import ParameterSweep, ResultStore, canonicalize_config, hash_config, expand_grid
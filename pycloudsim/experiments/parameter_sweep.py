@@ -0,0 +1,147 @@
+from __future__ import annotations
+from .replication_runner import ReplicationRunner, summarize_simulator
+import copy
+import hashlib
+import io
+import itertools
+import json
+import sqlite3
+import time
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..simulation import Simulator
+
+
+def _to_json_compatible(value: Any) -> Any:
+    if isinstance(value, np.integer):
+        return int(value)
+    elif isinstance(value, np.floating):
+        return float(value)
+    elif isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError("Can not canonicalize %s in a scenario config" % type(value).__name__)
+
+
+def canonicalize_config(config: Dict[str, Any]) -> str:
+    """
+    A canonical JSON text of a scenario config: sorted keys, no whitespace,
+    tuples as lists and NumPy scalars as Python numbers (e.g. ```np.iinfo(np.int32).max```)
+    """
+    return json.dumps(config, sort_keys=True, separators=(",", ":"), default=_to_json_compatible)
+
+
+def hash_config(config: Dict[str, Any], scenario_name: str = "") -> str:
+    return hashlib.sha256((scenario_name+"\n"+canonicalize_config(config)).encode("utf-8")).hexdigest()
+
+
+def expand_grid(base_config: Dict[str, Any], axis_dict: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    The cartesian product of the axes applied to a copy of the base config
+
+    Parameters
+    ----------
+    base_config: Dict
+        A nested config such as the ```config``` dict of test.py
+    axis_dict: Dict[str, List]
+        Values of each axis keyed by a dotted path, e.g. ```{"host.num": [2, 4], "vm.startup_delay": [10, 30]}```
+    """
+    config_list = []
+    path_list = list(axis_dict)
+    for value_tuple in itertools.product(*[axis_dict[path] for path in path_list]):
+        config = copy.deepcopy(base_config)
+        for path, value in zip(path_list, value_tuple):
+            key_list = path.split(".")
+            node = config
+            for key in key_list[:-1]:
+                node = node[key]
+            node[key_list[-1]] = value
+        config_list.append(config)
+    return config_list
+
+
+class ResultStore:
+    def __init__(self, path: str) -> None:
+        """
+        A SQLite file of sweep results keyed by scenario hash,
+        each result is a dict of NumPy arrays stored as a compressed ```.npz``` blob.
+        Every result is committed as soon as it is stored, so an interrupted sweep
+        loses at most the points that were still running
+
+        Parameters
+        ----------
+        path: str
+            Path of the SQLite database file
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS result (hash TEXT PRIMARY KEY, config TEXT NOT NULL, data BLOB NOT NULL, created REAL NOT NULL)")
+        self.connection.commit()
+
+    def contains(self, config_hash: str) -> bool:
+        return self.connection.execute("SELECT 1 FROM result WHERE hash = ?", (config_hash,)).fetchone() is not None
+
+    def get_hash_set(self) -> set:
+        return {row[0] for row in self.connection.execute("SELECT hash FROM result")}
+
+    def get(self, config_hash: str) -> Dict[str, np.ndarray]:
+        row = self.connection.execute("SELECT data FROM result WHERE hash = ?", (config_hash,)).fetchone()
+        if row is None:
+            raise KeyError(config_hash)
+        with np.load(io.BytesIO(row[0])) as npz_file:
+            return {key: npz_file[key] for key in npz_file.files}
+
+    def put(self, config_hash: str, config: Dict[str, Any], result: Dict[str, np.ndarray]) -> None:
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **result)
+        self.connection.execute("INSERT OR REPLACE INTO result (hash, config, data, created) VALUES (?, ?, ?, ?)", (config_hash, canonicalize_config(config), buffer.getvalue(), time.time()))
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class ParameterSweep:
+    def __init__(self, scenario_factory: Callable[[Dict[str, Any]], Simulator], result_store: ResultStore,
+                 result_extractor: Callable[[Simulator], Dict[str, np.ndarray]] = summarize_simulator, max_workers: Optional[int] = None,
+                 warm_import_list: Optional[List[str]] = None, is_quiet: bool = True, scenario_name: Optional[str] = None) -> None:
+        """
+        Run a scenario over a list of configs, skipping the points already in the result store
+
+        Parameters
+        ----------
+        scenario_factory: Callable
+            Build a ready-to-run Simulator from a config dict, see ReplicationRunner
+        result_store: ResultStore
+            Where finished points are cached
+        scenario_name: str
+            Salt of the scenario hash, default the qualified name of the factory,
+            change it when the scenario code changes in a way the config does not capture
+        """
+        self.result_store = result_store
+        self.scenario_name = scenario_name if scenario_name is not None else "%s.%s" % (scenario_factory.__module__, scenario_factory.__qualname__)
+        self.replication_runner = ReplicationRunner(scenario_factory, result_extractor, max_workers, warm_import_list, is_quiet)
+
+    def get_config_hash(self, config: Dict[str, Any]) -> str:
+        return hash_config(config, self.scenario_name)
+
+    def get_missing_config_list(self, config_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        stored_hash_set = self.result_store.get_hash_set()
+        missing_config_dict = {}
+        for config in config_list:
+            config_hash = self.get_config_hash(config)
+            if config_hash not in stored_hash_set:
+                missing_config_dict[config_hash] = config
+        return list(missing_config_dict.values())
+
+    def run(self, config_list: List[Dict[str, Any]]) -> List[Dict[str, np.ndarray]]:
+        """
+        Dispatch only the missing points to the workers, store each result as it arrives
+        and return the results of all points in the order of ```config_list```
+        """
+        missing_config_list = self.get_missing_config_list(config_list)
+        if len(missing_config_list) > 0:
+            def store_result(index: int, config: Dict[str, Any], result: Dict[str, np.ndarray]) -> None:
+                self.result_store.put(self.get_config_hash(config), config, result)
+            self.replication_runner.run(missing_config_list, on_result=store_result)
+        return [self.result_store.get(self.get_config_hash(config)) for config in config_list]
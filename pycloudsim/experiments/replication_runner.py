@@ -0,0 +1,141 @@
+from __future__ import annotations
+from ..cloudlets import Cloudlet
+from ..logger import Logger
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import importlib
+import logging
+import math
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..simulation import Simulator
+
+
+def summarize_simulator(simulator: Simulator) -> Dict[str, np.ndarray]:
+    """
+    Compact per-replication result arrays of the finished Cloudlets and Vms
+    instead of the entity objects themselves. Requires the default ResultSinkMemory,
+    a scenario streaming its results to another sink needs a result extractor of its own
+    """
+    datacenter = simulator.get_datacenter()
+    cloudlet_list = list(datacenter.get_cloudlet_end_of_life_dict().values())
+    vm_list = list(datacenter.get_vm_end_of_life_dict().values())
+    return {
+        "global_clock": np.array([simulator.get_global_clock()]),
+        "cloudlet_id": np.array([cloudlet.get_id() for cloudlet in cloudlet_list], dtype=np.int64),
+        "cloudlet_state": np.array([cloudlet.get_state().value for cloudlet in cloudlet_list], dtype=np.int8),
+        "cloudlet_start_time": np.array([cloudlet.get_start_time() for cloudlet in cloudlet_list], dtype=np.float64),
+        "cloudlet_end_time": np.array([cloudlet.get_end_time() for cloudlet in cloudlet_list], dtype=np.float64),
+        "vm_id": np.array([vm.get_id() for vm in vm_list], dtype=np.int64),
+        "vm_state": np.array([vm.get_state().value for vm in vm_list], dtype=np.int8),
+    }
+
+
+def mean_cloudlet_turnaround_time(result: Dict[str, np.ndarray]) -> float:
+    is_succeeded = result["cloudlet_state"] == Cloudlet.State.SUCCEEDED.value
+    if not is_succeeded.any():
+        return math.nan
+    return float(np.mean(result["cloudlet_end_time"][is_succeeded]-result["cloudlet_start_time"][is_succeeded]))
+
+
+def _init_worker(warm_import_list: List[str], is_quiet: bool) -> None:
+    # import once per worker process instead of once per replication
+    for module_name in warm_import_list:
+        importlib.import_module(module_name)
+    if is_quiet:
+        Logger().setLevel(logging.ERROR)
+
+
+def run_replication(scenario_factory: Callable[[Any], Simulator], parameter: Any, result_extractor: Callable[[Simulator], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    simulator = scenario_factory(parameter)
+    simulator.run_util_pause_or_terminate()
+    return result_extractor(simulator)
+
+
+class ReplicationAggregator:
+    def __init__(self) -> None:
+        """
+        Collect replication results as they arrive and summarize
+        a scalar metric across replications
+        """
+        self.result_dict = {}
+
+    def add(self, index: int, parameter: Any, result: Dict[str, np.ndarray]) -> None:
+        self.result_dict[index] = result
+
+    def get_num_results(self) -> int:
+        return len(self.result_dict)
+
+    def get_result_list(self) -> List[Dict[str, np.ndarray]]:
+        """
+        Results ordered by the index of their parameter
+        """
+        return [self.result_dict[index] for index in sorted(self.result_dict)]
+
+    def get_metric_array(self, metric: Callable[[Dict[str, np.ndarray]], float]) -> np.ndarray:
+        return np.array([metric(result) for result in self.get_result_list()], dtype=np.float64)
+
+    def get_confidence_interval(self, metric: Callable[[Dict[str, np.ndarray]], float], z: float = 1.96) -> tuple:
+        """
+        Mean of the metric and the half width of its normal-approximation confidence interval
+        """
+        metric_array = self.get_metric_array(metric)
+        metric_array = metric_array[~np.isnan(metric_array)]
+        if len(metric_array) < 2:
+            return float(np.mean(metric_array)) if len(metric_array) else math.nan, math.nan
+        return float(np.mean(metric_array)), float(z*np.std(metric_array, ddof=1)/math.sqrt(len(metric_array)))
+
+
+class ReplicationRunner:
+    def __init__(self, scenario_factory: Callable[[Any], Simulator], result_extractor: Callable[[Simulator], Dict[str, np.ndarray]] = summarize_simulator,
+                 max_workers: Optional[int] = None, warm_import_list: Optional[List[str]] = None, is_quiet: bool = True) -> None:
+        """
+        Run independent replications of a scenario in a process pool
+
+        Parameters
+        ----------
+        scenario_factory: Callable
+            Build a ready-to-run Simulator (hosts, Datacenter, Broker, listeners) from a seed or
+            parameter set, it must be a module-level function so that it can be pickled
+        result_extractor: Callable
+            Turn a finished Simulator into compact result arrays, only these are sent back
+        max_workers: int
+            Number of worker processes, default the number of CPUs, 1 runs in-process
+        warm_import_list: List[str]
+            Modules imported once by every worker when it starts, e.g. the scenario module
+        is_quiet: bool
+            Silence the INFO/WARNING log of the workers
+        """
+        self.scenario_factory = scenario_factory
+        self.result_extractor = result_extractor
+        self.max_workers = max_workers
+        self.warm_import_list = ["pycloudsim"]+(warm_import_list if warm_import_list is not None else [])
+        self.is_quiet = is_quiet
+
+    def run(self, parameter_list: List[Any], on_result: Optional[Callable[[int, Any, Dict[str, np.ndarray]], None]] = None) -> ReplicationAggregator:
+        """
+        Run one replication per seed/parameter set, ```on_result(index, parameter, result)```
+        is called in completion order as results arrive
+        """
+        aggregator = ReplicationAggregator()
+        if self.max_workers == 1:
+            # same set-up as a worker, the log level of the calling process is restored afterwards
+            level = Logger().level
+            _init_worker(self.warm_import_list, self.is_quiet)
+            try:
+                for index, parameter in enumerate(parameter_list):
+                    self._collect(aggregator, on_result, index, parameter, run_replication(self.scenario_factory, parameter, self.result_extractor))
+            finally:
+                Logger().setLevel(level)
+            return aggregator
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker, initargs=(self.warm_import_list, self.is_quiet)) as executor:
+            future_dict = {executor.submit(run_replication, self.scenario_factory, parameter, self.result_extractor): index for index, parameter in enumerate(parameter_list)}
+            for future in as_completed(future_dict):
+                index = future_dict[future]
+                self._collect(aggregator, on_result, index, parameter_list[index], future.result())
+        return aggregator
+
+    def _collect(self, aggregator: ReplicationAggregator, on_result: Optional[Callable], index: int, parameter: Any, result: Dict[str, np.ndarray]) -> None:
+        aggregator.add(index, parameter, result)
+        if on_result is not None:
+            on_result(index, parameter, result)
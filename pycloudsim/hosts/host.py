@@ -1,16 +1,21 @@
 from __future__ import annotations
-from uuid import UUID, uuid1
-from collections import defaultdict
-from ..resources import Pe, RAM, Storage, Bandwidth
-from typing import List, Dict
+from uuid import UUID
+from ..entity.entity_registry import EntityKind, EntityRegistry, RegisteredEntity
+from ..resources import Pe, PeAllocator, RAM, Storage, Bandwidth, ResourcePool, RAMView, StorageView, BandwidthView
+from typing import List, Dict, Optional
 from typing import TYPE_CHECKING
+import warnings
 from ..vms import VmRunning
 if TYPE_CHECKING:
     from ..datacenters import Datacenter
     from ..vms import Vm
+    from ..placement import CapacityIndex
+    from ..monitoring import UtilizationRecorder
 
 
-class Host:
+class Host(RegisteredEntity):
+    kind = EntityKind.HOST
+
     def __init__(self, pe_list: List[Pe], id: int = -1, size_ram: int = 32*1024, size_storage: int = 1024*1024, size_bandwidth: int = int(10*103)) -> None:
         """
         A Host is a physical machine composed of computing resources
@@ -31,30 +36,50 @@ class Host:
         size_bandwidth: int
             Bandwidth of host in MB, default 10 Gbps
         """
-        self.uuid = uuid1()
+        self.key = None
+        self.entity_registry = None
         self.id = id
         self.num_pes = len(pe_list)
         self.num_pes_available = self.num_pes
-        self.host_pe_dict = self._build_pe_dict(pe_list)
-        self.vm_pe_mapping = {}
-        self.vm_pe_dict = defaultdict(list)
-        self.ram = RAM(size_ram)
+        self.pe_list = list(pe_list)
+        # keyed by Pe key, filled once the Host is attached to a simulation
+        self.host_pe_dict = {}
+        # which Pes are busy and their utilization, Pes are referred to by their index in ```pe_list```
+        self.pe_allocator = PeAllocator(self.num_pes)
+        for pe_index, pe in enumerate(self.pe_list):
+            pe.attach(self.pe_allocator, pe_index)
+        self.vm_pe_index_dict = {}
+        # RAM, storage and bandwidth of the host and its Vms are rows of a ResourcePool,
+        # a small one of its own until the Host joins the pool of a Datacenter
+        self.resource_pool = ResourcePool(4)
+        row = self.resource_pool.allocate_row(size_ram, size_storage, size_bandwidth)
+        self.ram = RAMView(self.resource_pool, row)
         self.vm_ram_dict = {}
-        self.storage = Storage(size_storage)
+        self.storage = StorageView(self.resource_pool, row)
         self.vm_storage_dict = {}
-        self.bandwidth = Bandwidth(size_bandwidth)
+        self.bandwidth = BandwidthView(self.resource_pool, row)
         self.vm_bandwidth_dict = {}
         self.vm_running_dict = {}
         self.datacenter = None
+        self.capacity_index = None
+        self.utilization_recorder = None
 
-    def _build_pe_dict(self, pe_list: List[Pe]) -> Dict[UUID, Pe]:
+    def _build_pe_dict(self, pe_list: List[Pe]) -> Dict[int, Pe]:
         pe_dict = {}
         for pe in pe_list:
-            pe_dict[pe.get_uuid()] = pe
+            pe_dict[pe.get_key()] = pe
         return pe_dict
 
-    def get_uuid(self) -> UUID:
-        return self.uuid
+    def bind_key(self, entity_registry: EntityRegistry) -> None:
+        """
+        Take the keys of the Host, its Pes and its resources from ```entity_registry```
+        """
+        super().bind_key(entity_registry)
+        for pe in self.pe_list:
+            pe.bind_key(entity_registry)
+        self.host_pe_dict = self._build_pe_dict(self.pe_list)
+        for view in (self.ram, self.storage, self.bandwidth):
+            view.bind_key(entity_registry)
 
     def get_id(self) -> int:
         return self.id
@@ -65,97 +90,160 @@ class Host:
     def get_num_pes_available(self) -> int:
         return self.num_pes_available
 
-    def get_host_pe_dict(self) -> Dict[UUID, Pe]:
+    def get_host_pe_dict(self) -> Dict[int, Pe]:
         return self.host_pe_dict
 
+    def get_pe_list(self) -> List[Pe]:
+        return self.pe_list
+
+    def get_pe_allocator(self) -> PeAllocator:
+        return self.pe_allocator
+
+    def get_vm_pe_index_dict(self) -> Dict[int, List[int]]:
+        return self.vm_pe_index_dict
+
     def get_vm_pe_mapping(self) -> Dict[UUID, UUID]:
-        return self.vm_pe_mapping
+        """
+        Deprecated, the Pes of a Vm are the host Pe indices ```get_vm_pe_index_dict()```.
+        Returns the UUID of the host Pe backing every virtual Pe of the Vms on the Host
+        """
+        warnings.warn("Host.get_vm_pe_mapping is deprecated, use get_vm_pe_index_dict", DeprecationWarning, stacklevel=2)
+        vm_pe_mapping = {}
+        for vm_key, host_pe_index_list in self.vm_pe_index_dict.items():
+            vm_pe_uuid_list = self.vm_running_dict[vm_key].get_vm_pe_uuid_list()
+            for vm_pe_uuid, host_pe_index in zip(vm_pe_uuid_list, host_pe_index_list):
+                vm_pe_mapping[vm_pe_uuid] = self.pe_list[host_pe_index].get_uuid()
+        return vm_pe_mapping
 
     def get_vm_pe_dict(self) -> Dict[UUID, List[UUID]]:
-        return self.vm_pe_dict
+        """
+        Deprecated, the Pes of a Vm are the host Pe indices ```get_vm_pe_index_dict()```.
+        Returns the UUIDs of the virtual Pes of every Vm on the Host
+        """
+        warnings.warn("Host.get_vm_pe_dict is deprecated, use get_vm_pe_index_dict", DeprecationWarning, stacklevel=2)
+        return {vm_running.get_uuid(): vm_running.get_vm_pe_uuid_list() for vm_running in self.vm_running_dict.values()}
 
     def get_ram(self) -> RAM:
         return self.ram
 
-    def get_vm_ram_dict(self) -> Dict[UUID, RAM]:
+    def get_resource_pool(self) -> ResourcePool:
+        return self.resource_pool
+
+    def attach_resource_pool(self, resource_pool: ResourcePool) -> None:
+        """
+        Move the rows of the Host and its Vms to another ResourcePool, e.g. the one of the Datacenter
+        """
+        view_group_list = [(self.ram, self.storage, self.bandwidth)]
+        view_group_list += [(vm_running.get_ram(), vm_running.get_storage(), vm_running.get_bandwidth()) for vm_running in self.vm_running_dict.values()]
+        for view_group in view_group_list:
+            row = resource_pool.allocate_row(*[view.get_size_capacity() for view in view_group])
+            for view in view_group:
+                resource_pool.set_size_available(row, view.column, view.get_size_available())
+                view.move(resource_pool, row)
+        self.resource_pool = resource_pool
+
+    def get_vm_ram_dict(self) -> Dict[int, RAM]:
         return self.vm_ram_dict
 
     def get_storage(self) -> Storage:
         return self.storage
 
-    def get_vm_storage_dict(self) -> Dict[UUID, Storage]:
+    def get_vm_storage_dict(self) -> Dict[int, Storage]:
         return self.vm_storage_dict
 
     def get_bandwidth(self) -> Bandwidth:
         return self.bandwidth
 
-    def get_vm_bandwidth_dict(self) -> Dict[UUID, Bandwidth]:
+    def get_vm_bandwidth_dict(self) -> Dict[int, Bandwidth]:
         return self.vm_bandwidth_dict
 
-    def get_vm_running_dict(self) -> Dict[UUID, VmRunning]:
+    def get_vm_running_dict(self) -> Dict[int, VmRunning]:
         return self.vm_running_dict
 
     def bind_vm(self, vm_running: VmRunning) -> None:
-        for _ in range(vm_running.get_num_pes()):
-            for host_pe in self.host_pe_dict.values():
-                if host_pe.get_state() == Pe.State.FREE:
-                    host_pe.set_state(Pe.State.BUSY)
-                    # create virtual pe for vm
-                    vm_pe = Pe(vm_running.get_host_mips_factor() * host_pe.get_mips_capacity())
-                    # construct vm and host pe mapping
-                    self.vm_pe_mapping[vm_pe.get_uuid()] = host_pe.get_uuid()
-                    # assign virutal pe to vm
-                    self.vm_pe_dict[vm_running.get_uuid()].append(vm_pe.get_uuid())
-                    vm_running.add_vm_pe(vm_pe)
-                    break
+        if vm_running.get_key() is None:
+            raise RuntimeError("Vm must be attached to a simulation before it is bound to a Host")
+        host_pe_index_list = self.pe_allocator.allocate(vm_running.get_num_pes())
+        self.vm_pe_index_dict[vm_running.get_key()] = host_pe_index_list
+        # virtual Pes of the Vm are backed by the allocated host Pes in order
+        vm_running.set_host_pe_index_list(host_pe_index_list)
         self.num_pes_available -= vm_running.get_num_pes()
-        vm_pe=list(vm_running.get_vm_pe_dict().values())[0]
-        vm_running.set_mips(vm_pe.get_mips_capacity())
-
-        vm_ram = RAM(vm_running.get_size_ram())
-        self.ram.allocate(vm_ram.get_size_capacity())
-        self.vm_ram_dict[vm_ram.get_uuid()] = vm_ram
+        vm_running.set_mips(vm_running.get_host_mips_factor()*self.pe_list[host_pe_index_list[0]].get_mips_capacity())
+
+        self.ram.allocate(vm_running.get_size_ram())
+        self.storage.allocate(vm_running.get_size_storage())
+        self.bandwidth.allocate(vm_running.get_size_bandwidth())
+        vm_row = self.resource_pool.allocate_row(vm_running.get_size_ram(), vm_running.get_size_storage(), vm_running.get_size_bandwidth())
+        vm_ram = RAMView(self.resource_pool, vm_row)
+        self.vm_ram_dict[vm_running.get_key()] = vm_ram
         vm_running.set_ram(vm_ram)
-
-        vm_storage = Storage(vm_running.get_size_storage())
-        self.storage.allocate(vm_storage.get_size_capacity())
-        self.vm_storage_dict[vm_storage.get_uuid()] = vm_storage
+        vm_storage = StorageView(self.resource_pool, vm_row)
+        self.vm_storage_dict[vm_running.get_key()] = vm_storage
         vm_running.set_storage(vm_storage)
-
-        vm_bandwidth = Bandwidth(vm_running.get_size_bandwidth())
-        self.bandwidth.allocate(vm_bandwidth.get_size_capacity())
-        self.vm_bandwidth_dict[vm_bandwidth.get_uuid()] = vm_bandwidth
+        vm_bandwidth = BandwidthView(self.resource_pool, vm_row)
+        self.vm_bandwidth_dict[vm_running.get_key()] = vm_bandwidth
         vm_running.set_bandwidth(vm_bandwidth)
+        if self.entity_registry is not None:
+            for view in (vm_ram, vm_storage, vm_bandwidth):
+                view.bind_key(self.entity_registry)
 
-        self.vm_running_dict[vm_running.get_uuid()] = vm_running
+        self.vm_running_dict[vm_running.get_key()] = vm_running
         vm_running.set_host(self)
+        if self.capacity_index is not None:
+            self.capacity_index.update(self)
+        if self.utilization_recorder is not None:
+            vm_running.set_utilization_recorder(self.utilization_recorder)
+            self.utilization_recorder.record_host(self)
+            self.utilization_recorder.record_vm(vm_running)
 
     def release_vm(self, vm_running: VmRunning) -> None:
         vm_running.set_host(None)
         
-        self.vm_running_dict.pop(vm_running.get_uuid())
+        self.vm_running_dict.pop(vm_running.get_key())
 
-        self.vm_bandwidth_dict.pop(vm_running.get_bandwidth().get_uuid())
-        self.bandwidth.dealloate(vm_running.get_bandwidth().get_size_capacity())
+        self.vm_bandwidth_dict.pop(vm_running.get_key())
+        self.bandwidth.dealloate(vm_running.get_size_bandwidth())
         vm_running.set_bandwidth(None)
 
-        self.vm_storage_dict.pop(vm_running.get_storage().get_uuid())
-        self.storage.dealloate(vm_running.get_storage().get_size_capacity())
+        self.vm_storage_dict.pop(vm_running.get_key())
+        self.storage.dealloate(vm_running.get_size_storage())
         vm_running.set_storage(None)
 
-        self.vm_ram_dict.pop(vm_running.get_ram().get_uuid())
-        self.ram.dealloate(vm_running.get_ram().get_size_capacity())
+        self.vm_ram_dict.pop(vm_running.get_key())
+        self.ram.dealloate(vm_running.get_size_ram())
+        self.resource_pool.free_row(vm_running.get_ram().get_row())
         vm_running.set_ram(None)
 
-        vm_running.get_vm_pe_dict().clear()
+        vm_running.set_host_pe_index_list(None)
         self.num_pes_available += vm_running.get_num_pes()
-        vm_pe_uuid_list = self.vm_pe_dict.pop(vm_running.get_uuid())
-        for vm_pe_uuid in vm_pe_uuid_list:
-            self.host_pe_dict[self.vm_pe_mapping[vm_pe_uuid]].set_state(Pe.State.FREE)
-            self.vm_pe_mapping.pop(vm_pe_uuid)
+        self.pe_allocator.release(self.vm_pe_index_dict.pop(vm_running.get_key()))
+        if self.capacity_index is not None:
+            self.capacity_index.update(self)
+        if self.utilization_recorder is not None:
+            self.utilization_recorder.record_host(self)
+            self.utilization_recorder.record_vm_released(vm_running)
+            vm_running.set_utilization_recorder(None)
 
     def get_datacenter(self):
         return self.datacenter
 
     def set_datacenter(self, datacenter: Datacenter):
         self.datacenter = datacenter
+
+    def get_capacity_index(self) -> Optional[CapacityIndex]:
+        return self.capacity_index
+
+    def set_capacity_index(self, capacity_index: Optional[CapacityIndex]) -> None:
+        """
+        The index of the Datacenter notified whenever ```num_pes_available``` changes
+        """
+        self.capacity_index = capacity_index
+
+    def get_utilization_recorder(self) -> Optional[UtilizationRecorder]:
+        return self.utilization_recorder
+
+    def set_utilization_recorder(self, utilization_recorder: Optional[UtilizationRecorder]) -> None:
+        """
+        The recorder notified whenever a Vm is bound or released, Vms bound later inherit it
+        """
+        self.utilization_recorder = utilization_recorder
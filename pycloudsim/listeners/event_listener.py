@@ -1,11 +1,24 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 if TYPE_CHECKING:
     from ..events import Event
     from ..simulation import Simulator
+
+
 class EventListener:
-    def __init__(self,event_type:Event.TYPE) -> None:
-        self.event_type=event_type
-    
-    def update(event:Event,simulator:Simulator)->None:
+    def __init__(self, event_type: Optional[Event.TYPE] = None) -> None:
+        """
+        A EventListener is notified before the simulator dispatches an event
+
+        Parameters
+        ----------
+        event_type: Event.TYPE
+            The event type the listener subscribes to, ```None``` subscribes to every event
+        """
+        self.event_type = event_type
+
+    def update(self, event: Event, simulator: Simulator) -> None:
         pass
+
+    def get_event_type(self) -> Optional[Event.TYPE]:
+        return self.event_type
@@ -1 +1,3 @@
 from .logger import Logger
+from .log_message import LogMessage
+from .event_log import EventLog, read_event_log, render_event_log, get_event_log, set_event_log, is_log_enabled, log_message
\ No newline at end of file
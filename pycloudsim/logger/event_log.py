@@ -0,0 +1,206 @@
+"""
+Structured, binary logging of the simulation.
+
+The Datacenter logs through ```log_message``` instead of formatting text: a log entry is a
+LogMessage, the global clock and up to two integer arguments. Without an EventLog, entries
+go to the text Logger as before. With an EventLog set by ```set_event_log```, entries are
+packed as fixed-size binary records into a ring buffer, and nothing is formatted at all:
+    - with a path, a background thread appends the buffer to the file whenever it is half
+      full or every ```flush_interval``` seconds, a full buffer is flushed by the caller
+    - without a path, the buffer is a flight recorder keeping the latest entries
+Logs are read back as a NumPy structured array with ```read_event_log``` and turned into
+the text the Logger would have printed with ```render_event_log```
+"""
+from __future__ import annotations
+from .logger import Logger
+from .log_message import LogMessage, LOG_MESSAGE_TABLE, render_log_message
+import atexit
+import logging
+import struct
+import threading
+import numpy as np
+from typing import Iterator, Optional, Union
+
+EVENT_LOG_MAGIC = b"PYCSLOG1"
+# clock, arg0, arg1, message value, level, packed little-endian
+EVENT_LOG_RECORD = struct.Struct("<dqqHB")
+EVENT_LOG_RECORD_DTYPE = np.dtype([("clock", "<f8"), ("arg0", "<i8"), ("arg1", "<i8"), ("message", "<u2"), ("level", "u1")])
+
+_text_logger = Logger()
+_event_log = None
+
+
+class EventLog:
+    def __init__(self, path: Optional[str] = None, capacity: int = 1 << 16, level: int = logging.INFO, flush_interval: float = 0.5) -> None:
+        """
+        A ring buffer of binary log records, see the module docstring
+
+        Parameters
+        ----------
+        path: str
+            File the records are appended to, overwritten if it exists,
+            default keep the latest ```capacity``` records in memory
+        capacity: int
+            Number of records the ring buffer holds
+        level: int
+            Entries below this ```logging``` level are not recorded
+        flush_interval: float
+            Seconds the flush thread waits at most between two flushes
+        """
+        if capacity <= 1:
+            raise ValueError("Capacity must greater than 1")
+        if flush_interval <= 0:
+            raise ValueError("Flush interval must greater than 0")
+        self.path = path
+        self.capacity = capacity
+        self.level = level
+        self.flush_interval = flush_interval
+        self.buffer = bytearray(capacity*EVENT_LOG_RECORD.size)
+        # records packed so far and records written to the file so far, the pending
+        # records are ```[num_flushed, num_recorded)``` modulo the capacity
+        self.num_recorded = 0
+        self.num_flushed = 0
+        self.flush_threshold = capacity//2
+        self.flush_lock = threading.Lock()
+        self.flush_event = threading.Event()
+        self.is_closed = False
+        self.log_file = None
+        self.flush_thread = None
+        if path is not None:
+            self.log_file = open(path, "wb")
+            self.log_file.write(EVENT_LOG_MAGIC)
+            self.flush_thread = threading.Thread(target=self._run_flush_thread, name="EventLogFlush", daemon=True)
+            self.flush_thread.start()
+            atexit.register(self.close)
+
+    def get_level(self) -> int:
+        return self.level
+
+    def set_level(self, level: int) -> None:
+        self.level = level
+
+    def get_num_recorded(self) -> int:
+        return self.num_recorded
+
+    def is_enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def record(self, level: int, message_value: int, clock: float, arg0: int = 0, arg1: int = 0) -> None:
+        if level < self.level:
+            return
+        num_recorded = self.num_recorded
+        if self.log_file is not None and num_recorded-self.num_flushed >= self.capacity:
+            # the flush thread is behind, do not overwrite records not written yet
+            self.flush()
+        EVENT_LOG_RECORD.pack_into(self.buffer, (num_recorded % self.capacity)*EVENT_LOG_RECORD.size, clock, arg0, arg1, message_value, level)
+        self.num_recorded = num_recorded+1
+        if self.log_file is not None and num_recorded+1-self.num_flushed == self.flush_threshold:
+            self.flush_event.set()
+
+    def _run_flush_thread(self) -> None:
+        while not self.is_closed:
+            self.flush_event.wait(self.flush_interval)
+            self.flush_event.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the pending records to the file
+        """
+        if self.log_file is None:
+            return
+        with self.flush_lock:
+            if self.log_file.closed:
+                return
+            # the records up to the snapshot are complete, recording goes on meanwhile
+            num_recorded = self.num_recorded
+            if num_recorded == self.num_flushed:
+                return
+            buffer_view = memoryview(self.buffer)
+            record_size = EVENT_LOG_RECORD.size
+            begin = self.num_flushed % self.capacity
+            end = num_recorded % self.capacity
+            if begin < end:
+                self.log_file.write(buffer_view[begin*record_size:end*record_size])
+            else:
+                self.log_file.write(buffer_view[begin*record_size:])
+                self.log_file.write(buffer_view[:end*record_size])
+            buffer_view.release()
+            self.log_file.flush()
+            self.num_flushed = num_recorded
+
+    def close(self) -> None:
+        """
+        Stop the flush thread and write out the remaining records
+        """
+        if self.is_closed:
+            return
+        self.is_closed = True
+        if self.flush_thread is not None:
+            self.flush_event.set()
+            self.flush_thread.join()
+            self.flush()
+            with self.flush_lock:
+                self.log_file.close()
+            atexit.unregister(self.close)
+
+    def get_record_array(self) -> np.ndarray:
+        """
+        The records still in the ring buffer, oldest first
+        """
+        num_recorded = self.num_recorded
+        record_array = np.frombuffer(bytes(self.buffer), dtype=EVENT_LOG_RECORD_DTYPE)
+        if num_recorded <= self.capacity:
+            return record_array[:num_recorded].copy()
+        # wrapped around, the oldest record is the next one to be overwritten
+        return np.roll(record_array, -(num_recorded % self.capacity))
+
+    def render(self) -> Iterator[str]:
+        return render_event_log(self.get_record_array())
+
+
+def read_event_log(path: str) -> np.ndarray:
+    with open(path, "rb") as log_file:
+        if log_file.read(len(EVENT_LOG_MAGIC)) != EVENT_LOG_MAGIC:
+            raise ValueError("%s is not an event log" % path)
+    return np.fromfile(path, dtype=EVENT_LOG_RECORD_DTYPE, offset=len(EVENT_LOG_MAGIC))
+
+
+def render_event_log(event_log: Union[str, np.ndarray]) -> Iterator[str]:
+    """
+    The lines the text Logger prints for the records of an event log file or array
+    """
+    record_array = read_event_log(event_log) if isinstance(event_log, str) else event_log
+    for clock, arg0, arg1, message_value, level in record_array.tolist():
+        yield "%s\t%s" % (logging.getLevelName(level), render_log_message(message_value, clock, arg0, arg1))
+
+
+def get_event_log() -> Optional[EventLog]:
+    return _event_log
+
+
+def set_event_log(event_log: Optional[EventLog]) -> None:
+    """
+    Record the log of the simulation in an EventLog instead of printing it with the
+    text Logger, ```None``` to go back to the text Logger
+    """
+    global _event_log
+    _event_log = event_log
+
+
+def is_log_enabled(level: int) -> bool:
+    """
+    Whether entries of a level are logged, checked once per handler before log_message
+    so that nothing is computed for the log when it is off
+    """
+    if _event_log is not None:
+        return level >= _event_log.level
+    return _text_logger.isEnabledFor(level)
+
+
+def log_message(message: LogMessage, clock: float, arg0: int = 0, arg1: int = 0) -> None:
+    level, template, num_args = LOG_MESSAGE_TABLE[message.value]
+    if _event_log is not None:
+        _event_log.record(level, message.value, clock, arg0, arg1)
+    else:
+        _text_logger.log(level, template % (clock, arg0, arg1)[:num_args+1])
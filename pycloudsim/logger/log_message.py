@@ -0,0 +1,53 @@
+from enum import Enum
+import logging
+
+
+class LogMessage(Enum):
+    """
+    The messages of the simulation log. A log entry is the message, the global clock and
+    up to two integer arguments, the text is only built when the entry is rendered
+    """
+    VM_BIND_TRYING = 0
+    VM_BIND_FAILED = 1
+    VM_BIND = 2
+    VM_BIND_SUCCEEDED = 3
+    VM_BOOTUP = 4
+    CLOUDLET_SUBMIT = 5
+    CLOUDLET_BIND = 6
+    CLOUDLET_FINISH = 7
+    VM_SHUTDOWN = 8
+    VM_DESTORY = 9
+    CLOUDLET_NO_SUITABLE_VM = 10
+
+
+# message -> (level, template of the global clock and the arguments)
+LOG_MESSAGE_TEMPLATE_DICT = {
+    LogMessage.VM_BIND_TRYING: (logging.INFO, "%6.2f\tDatacenter\tTrying to bind vm to host"),
+    LogMessage.VM_BIND_FAILED: (logging.WARNING, "%6.2f\tDatacenter\tFailed to bind vms to host since there is no suitable host to accommodate all the vms"),
+    LogMessage.VM_BIND: (logging.INFO, "%6.2f\tDatacenter\tBind Vm %d to Host %d"),
+    LogMessage.VM_BIND_SUCCEEDED: (logging.INFO, "%6.2f\tDatacenter\tSucceed to bind vm to host"),
+    LogMessage.VM_BOOTUP: (logging.INFO, "%6.2f\tDatacenter\tVm %d booted up"),
+    LogMessage.CLOUDLET_SUBMIT: (logging.INFO, "%6.2f\tDatacenter\tCloudlet %d submitted"),
+    LogMessage.CLOUDLET_BIND: (logging.INFO, "%6.2f\tDatacenter\tBind Cloudlet %d to Vm %d"),
+    LogMessage.CLOUDLET_FINISH: (logging.INFO, "%6.2f\tDatacenter\tCloudlet %d exection done at Vm %d"),
+    LogMessage.VM_SHUTDOWN: (logging.INFO, "%6.2f\tDatacenter\tVm %d begins shutting down"),
+    LogMessage.VM_DESTORY: (logging.INFO, "%6.2f\tDatacenter\tVm %d destroyed on Host %d"),
+    LogMessage.CLOUDLET_NO_SUITABLE_VM: (logging.WARNING, "%6.2f\tDatacenter\tNo suitable Vm for Cloudlet %d, schedule will delay util there are available resources"),
+}
+
+# message value -> (level, template, number of arguments), indexed by the binary records
+LOG_MESSAGE_TABLE = [None]*len(LogMessage)
+for _message, (_level, _template) in LOG_MESSAGE_TEMPLATE_DICT.items():
+    LOG_MESSAGE_TABLE[_message.value] = (_level, _template, _template.count("%")-1)
+
+
+def get_log_message_level(message: LogMessage) -> int:
+    return LOG_MESSAGE_TEMPLATE_DICT[message][0]
+
+
+def render_log_message(message_value: int, clock: float, arg0: int = 0, arg1: int = 0) -> str:
+    """
+    The text of a log entry, as the text Logger prints it after the level name
+    """
+    _, template, num_args = LOG_MESSAGE_TABLE[message_value]
+    return template % (clock, arg0, arg1)[:num_args+1]
@@ -0,0 +1 @@
+from .utilization_recorder import UtilizationRecorder
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""
+Event-driven recording of Host and Vm utilization.
+
+Instead of sampling every entity on a clock, Hosts and running Vms notify the recorder
+whenever a Vm or a Cloudlet is bound to or released from them, and one change point
+    (time, entity kind, entity key, Pes used, RAM used, storage used, bandwidth used)
+is appended to NumPy column buffers. Usage is a step function between change points,
+so time-weighted means and resampled series are exact and computed with array operations
+once the simulation is over.
+With a spill directory, full buffers are written out as ```.npy``` chunks, one file per
+column, and read back memory-mapped, so a long run does not keep its history in memory
+"""
+from __future__ import annotations
+from ..entity import EntityKind
+import os
+import uuid
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..datacenters import Datacenter
+    from ..hosts import Host
+    from ..vms import VmRunning
+
+COLUMN_DTYPE_LIST = [
+    ("time", np.float64), ("kind", np.int8), ("key", np.int64),
+    ("pes", np.float64), ("ram", np.float64), ("storage", np.float64), ("bandwidth", np.float64)
+]
+USAGE_COLUMN_NAME_LIST = ["pes", "ram", "storage", "bandwidth"]
+
+
+class UtilizationRecorder:
+    def __init__(self, spill_dir: Optional[str] = None, chunk_size: int = 1 << 16) -> None:
+        """
+        Columnar store of utilization change points, see ```Datacenter.set_utilization_recorder```
+
+        Parameters
+        ----------
+        spill_dir: str
+            Directory the full buffers are written to, default keep everything in memory
+        chunk_size: int
+            Rows per spilled chunk, or the initial size of the in-memory buffers
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must greater than 0")
+        self.spill_dir = spill_dir
+        self.chunk_size = chunk_size
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+        self.column_dict = {name: np.empty(chunk_size, dtype=dtype) for name, dtype in COLUMN_DTYPE_LIST}
+        self.num_rows = 0
+        # per spilled chunk, the file of every column
+        self.spilled_chunk_list: List[Dict[str, str]] = []
+        self.num_rows_spilled = 0
+        # (kind, key) -> (id, Pes, RAM, storage, bandwidth capacity)
+        self.entity_dict: Dict[Tuple[int, int], Tuple[int, float, float, float, float]] = {}
+        self.datacenter = None
+
+    def attach(self, datacenter: Datacenter) -> None:
+        """
+        Record the current usage of every Host and running Vm of the Datacenter,
+        which then notify the recorder of every change
+        """
+        self.datacenter = datacenter
+        for host in datacenter.get_host_running_dict().values():
+            host.set_utilization_recorder(self)
+            self.record_host(host)
+            for vm_running in host.get_vm_running_dict().values():
+                vm_running.set_utilization_recorder(self)
+                self.record_vm(vm_running)
+
+    def _get_clock(self) -> float:
+        simulator = self.datacenter.get_simulator() if self.datacenter is not None else None
+        return simulator.get_global_clock() if simulator is not None else 0.0
+
+    def _append(self, kind: EntityKind, key: int, pes: float, ram: float, storage: float, bandwidth: float) -> None:
+        if self.num_rows == len(self.column_dict["time"]):
+            if self.spill_dir is not None:
+                self.spill()
+            else:
+                self._grow()
+        row = self.num_rows
+        column_dict = self.column_dict
+        column_dict["time"][row] = self._get_clock()
+        column_dict["kind"][row] = kind.value
+        column_dict["key"][row] = key
+        column_dict["pes"][row] = pes
+        column_dict["ram"][row] = ram
+        column_dict["storage"][row] = storage
+        column_dict["bandwidth"][row] = bandwidth
+        self.num_rows = row+1
+
+    def _grow(self) -> None:
+        for name, column in self.column_dict.items():
+            grown = np.empty(2*len(column), dtype=column.dtype)
+            grown[:self.num_rows] = column[:self.num_rows]
+            self.column_dict[name] = grown
+
+    def spill(self) -> None:
+        """
+        Write the buffered rows to the spill directory and empty the buffers
+        """
+        if self.spill_dir is None:
+            raise RuntimeError("Utilization recorder has no spill directory")
+        if self.num_rows == 0:
+            return
+        # unique names, a forked simulation keeps the chunks spilled so far and spills its own
+        chunk_name = uuid.uuid4().hex
+        chunk = {}
+        for name, column in self.column_dict.items():
+            path = os.path.join(self.spill_dir, "%s_%s.npy" % (chunk_name, name))
+            np.save(path, column[:self.num_rows])
+            chunk[name] = path
+        self.spilled_chunk_list.append(chunk)
+        self.num_rows_spilled += self.num_rows
+        self.num_rows = 0
+
+    def _register(self, kind: EntityKind, entity: Any) -> None:
+        ram, storage, bandwidth = entity.get_ram(), entity.get_storage(), entity.get_bandwidth()
+        self.entity_dict[(kind.value, entity.get_key())] = (entity.get_id(), entity.get_num_pes(), ram.get_size_capacity(), storage.get_size_capacity(), bandwidth.get_size_capacity())
+
+    def record_host(self, host: Host) -> None:
+        key = host.get_key()
+        if (EntityKind.HOST.value, key) not in self.entity_dict:
+            self._register(EntityKind.HOST, host)
+        ram = host.get_ram()
+        self._append(EntityKind.HOST, key, host.get_num_pes()-host.get_num_pes_available(), *ram.get_pool().get_size_used_row(ram.get_row()))
+
+    def record_vm(self, vm_running: VmRunning) -> None:
+        """
+        Pes used by a Vm are the Pes of its running Cloudlets, above the Pes of the Vm
+        when a time-shared Vm is oversubscribed
+        """
+        key = vm_running.get_key()
+        if (EntityKind.VM.value, key) not in self.entity_dict:
+            self._register(EntityKind.VM, vm_running)
+        ram = vm_running.get_ram()
+        num_pes_used = vm_running.get_cloudlet_execution().get_num_pe_slots()-vm_running.get_num_pes_available()
+        self._append(EntityKind.VM, key, num_pes_used, *ram.get_pool().get_size_used_row(ram.get_row()))
+
+    def record_vm_released(self, vm_running: VmRunning) -> None:
+        """
+        A Vm leaving its Host uses nothing from now on
+        """
+        self._append(EntityKind.VM, vm_running.get_key(), 0.0, 0.0, 0.0, 0.0)
+
+    def get_num_rows(self) -> int:
+        return self.num_rows_spilled+self.num_rows
+
+    def get_column(self, name: str) -> np.ndarray:
+        """
+        A column in recording order, spilled chunks are memory-mapped and concatenated with the buffer,
+        so the returned array holds the whole history in memory
+        """
+        part_list = [np.load(chunk[name], mmap_mode="r") for chunk in self.spilled_chunk_list]
+        part_list.append(self.column_dict[name][:self.num_rows])
+        return np.concatenate(part_list)
+
+    def get_column_dict(self, kind: Optional[EntityKind] = None) -> Dict[str, np.ndarray]:
+        """
+        All columns, only the rows of one entity kind if given.
+        Spilled chunks are filtered one at a time, only the selected rows are loaded in memory
+        """
+        part_list_dict: Dict[str, List[np.ndarray]] = {name: [] for name, _ in COLUMN_DTYPE_LIST}
+        chunk_list = [{name: np.load(path, mmap_mode="r") for name, path in chunk.items()} for chunk in self.spilled_chunk_list]
+        chunk_list.append({name: column[:self.num_rows] for name, column in self.column_dict.items()})
+        for chunk in chunk_list:
+            mask = chunk["kind"] == kind.value if kind is not None else slice(None)
+            for name, part_list in part_list_dict.items():
+                part_list.append(chunk[name][mask])
+        return {name: np.concatenate(part_list) for name, part_list in part_list_dict.items()}
+
+    def get_entity_id(self, kind: EntityKind, key: int) -> int:
+        return self.entity_dict[(kind.value, key)][0]
+
+    def get_capacity(self, kind: EntityKind, key: int, column_name: str) -> float:
+        return self.entity_dict[(kind.value, key)][1+USAGE_COLUMN_NAME_LIST.index(column_name)]
+
+    def _get_segments(self, kind: EntityKind, column_name: str, is_rate: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The step functions of all entities of a kind as segments sorted by entity then time:
+        (entity keys, segment entity positions, segment start times, segment values)
+        """
+        if column_name not in USAGE_COLUMN_NAME_LIST:
+            raise KeyError("Unknown utilization column %s" % column_name)
+        column_dict = self.get_column_dict(kind)
+        # stable, change points at the same time keep the recording order and the last one holds
+        order = np.lexsort((column_dict["time"], column_dict["key"]))
+        key_array = column_dict["key"][order]
+        time_array = column_dict["time"][order]
+        value_array = column_dict[column_name][order]
+        entity_key_array, position_array = np.unique(key_array, return_inverse=True)
+        if is_rate:
+            capacity_array = np.array([self.get_capacity(kind, int(key), column_name) for key in entity_key_array])
+            value_array = value_array/capacity_array[position_array]
+        return entity_key_array, position_array, time_array, value_array
+
+    def get_time_weighted_mean(self, kind: EntityKind, column_name: str, start_time: float, end_time: float, is_rate: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The time-weighted mean usage of every entity of a kind over ```[start_time, end_time)```,
+        before its first change point an entity counts as unused
+
+        Parameters
+        ----------
+        kind: EntityKind
+            ```EntityKind.HOST``` or ```EntityKind.VM```
+        column_name: str
+            One of ```pes```, ```ram```, ```storage```, ```bandwidth```
+        is_rate: bool
+            Usage relative to the capacity of the entity instead of absolute usage
+
+        Returns
+        -------
+        The entity keys and their mean usage
+        """
+        if end_time <= start_time:
+            raise ValueError("End time must greater than start time")
+        entity_key_array, position_array, time_array, value_array = self._get_segments(kind, column_name, is_rate)
+        # a segment lasts until the next change point of the same entity, the last one until end_time
+        segment_end_array = np.append(time_array[1:], end_time)
+        is_last_array = np.append(position_array[1:] != position_array[:-1], True) if len(position_array) > 0 else np.zeros(0, dtype=bool)
+        segment_end_array[is_last_array] = end_time
+        duration_array = np.clip(segment_end_array, start_time, end_time)-np.clip(time_array, start_time, end_time)
+        mean_array = np.bincount(position_array, weights=value_array*np.maximum(duration_array, 0.0), minlength=len(entity_key_array))/(end_time-start_time)
+        return entity_key_array, mean_array
+
+    def resample(self, kind: EntityKind, column_name: str, interval: float, start_time: float, end_time: float, is_rate: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Time-weighted mean usage of every entity of a kind in consecutive bins of ```interval```
+
+        Returns
+        -------
+        The entity keys, the bin start times and a matrix of the mean usage,
+        one row per entity and one column per bin
+        """
+        if interval <= 0:
+            raise ValueError("Interval must greater than 0")
+        entity_key_array, position_array, time_array, value_array = self._get_segments(kind, column_name, is_rate)
+        if end_time <= start_time:
+            raise ValueError("End time must greater than start time")
+        num_bins = int(np.ceil((end_time-start_time)/interval))
+        # the last bin is cut at end_time
+        bin_edge_array = np.minimum(start_time+interval*np.arange(num_bins+1), end_time)
+        num_entities, num_edges = len(entity_key_array), len(bin_edge_array)
+        if len(time_array) == 0:
+            return entity_key_array, bin_edge_array[:-1], np.zeros((0, num_bins))
+        # the integral of a step function is piecewise linear: at the start of every segment it is
+        # the area of the previous segments of the same entity, a global exclusive cumsum minus its value at the entity start
+        is_last_array = np.append(position_array[1:] != position_array[:-1], True)
+        duration_array = np.append(np.diff(time_array), 0.0)
+        duration_array[is_last_array] = 0.0
+        area_array = value_array*duration_array
+        integral_array = np.cumsum(area_array)-area_array
+        boundary_array = np.searchsorted(position_array, np.arange(num_entities+1))
+        integral_array -= integral_array[boundary_array[:-1]][position_array]
+        # the last segment of each entity starting at or before each bin edge, found with one searchsorted
+        # on an integer key (entity position, number of bin edges before the segment start)
+        key_array = position_array.astype(np.int64)*(num_edges+1)+np.searchsorted(bin_edge_array, time_array, side="left")
+        query_array = (np.arange(num_entities, dtype=np.int64)[:, None]*(num_edges+1)+np.arange(num_edges)).ravel()
+        segment_array = np.searchsorted(key_array, query_array, side="right")-1
+        # before its first change point an entity counts as unused
+        is_valid_array = segment_array >= np.repeat(boundary_array[:-1], num_edges)
+        segment_array = np.maximum(segment_array, 0)
+        edge_array = np.tile(bin_edge_array, num_entities)
+        integral_at_edge_array = np.where(is_valid_array, integral_array[segment_array]+value_array[segment_array]*(edge_array-time_array[segment_array]), 0.0)
+        integral_at_edge_array = integral_at_edge_array.reshape(num_entities, num_edges)
+        result = np.diff(integral_at_edge_array, axis=1)/np.diff(bin_edge_array)
+        return entity_key_array, bin_edge_array[:-1], result
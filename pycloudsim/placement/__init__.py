@@ -1,2 +1,12 @@
+from .vm_placement import VmPlacement
+from .cloudlet_placement import CloudletPlacement
 from .vm_placement_max_fit import VmPlacementMaxFit
-from .cloudlet_placement_max_fit import CloudletPlacementMaxFit
\ No newline at end of file
+from .vm_placement_vectorized import VmPlacementVectorized
+from .vm_placement_decreasing import VmPlacementDecreasing
+from .vm_placement_first_fit_decreasing import VmPlacementFirstFitDecreasing
+from .vm_placement_best_fit_decreasing import VmPlacementBestFitDecreasing
+from .vm_placement_vector_packing import VmPlacementVectorPacking
+from .cloudlet_placement_max_fit import CloudletPlacementMaxFit
+from .capacity_index import CapacityIndex
+from .capacity_matrix import CapacityMatrix
+from .capacity_tree import CapacityTree
\ No newline at end of file
@@ -0,0 +1,163 @@
+from __future__ import annotations
+from .capacity_matrix import CapacityMatrix
+from .capacity_tree import CapacityTree
+from ..utils import SortedList
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class CapacityIndex:
+    def __init__(self, entity_list: Optional[List[Any]] = None) -> None:
+        """
+        Entities (Hosts or VmRunnings) bucketed by ```num_pes_available```, kept up to date
+        by the entities themselves whenever their free capacity changes.
+        Inside a bucket entities are ordered by id then insertion order, so a query
+        visits the entity with the most available Pes and the smallest id first,
+        the order VmPlacementMaxFit used to get from its suitability heap.
+        Entities with less available Pes than required are never touched by a query.
+        Buckets are SortedLists, moving an entity between buckets stays O(log H) lookups
+        plus bounded shifts on homogeneous fleets where one bucket holds most Hosts
+
+        Parameters
+        ----------
+        entity_list: List
+            Initial entities, anything with ```get_key```, ```get_id``` and ```get_num_pes_available```
+        """
+        self.bucket_dict: Dict[int, SortedList] = {}
+        # non-empty bucket keys in ascending order
+        self.num_pes_key_list: List[int] = []
+        self.entity_dict: Dict[Tuple[int, int], Any] = {}
+        self.entry_dict: Dict[int, Tuple[int, Tuple[int, int]]] = {}
+        self.insertion_seq = 0
+        self.capacity_matrix = None
+        self.capacity_tree = None
+        if entity_list is not None:
+            for entity in entity_list:
+                self.add(entity)
+
+    def _insert(self, num_pes_available: int, sort_key: Tuple[int, int]) -> None:
+        bucket = self.bucket_dict.get(num_pes_available)
+        if bucket is None:
+            bucket = SortedList()
+            self.bucket_dict[num_pes_available] = bucket
+            insort(self.num_pes_key_list, num_pes_available)
+        bucket.add(sort_key)
+
+    def _delete(self, num_pes_available: int, sort_key: Tuple[int, int]) -> None:
+        bucket = self.bucket_dict[num_pes_available]
+        bucket.remove(sort_key)
+        if len(bucket) == 0:
+            self.bucket_dict.pop(num_pes_available)
+            del self.num_pes_key_list[bisect_left(self.num_pes_key_list, num_pes_available)]
+
+    def add(self, entity: Any) -> None:
+        if entity.get_key() in self.entry_dict:
+            raise KeyError("Entity %d is already indexed" % entity.get_id())
+        sort_key = (entity.get_id(), self.insertion_seq)
+        self.insertion_seq += 1
+        num_pes_available = entity.get_num_pes_available()
+        self.entity_dict[sort_key] = entity
+        self.entry_dict[entity.get_key()] = (num_pes_available, sort_key)
+        self._insert(num_pes_available, sort_key)
+        if self.capacity_matrix is not None:
+            self.capacity_matrix.add(entity)
+        if self.capacity_tree is not None:
+            self.capacity_tree.add(entity)
+
+    def remove(self, entity: Any) -> None:
+        num_pes_available, sort_key = self.entry_dict.pop(entity.get_key())
+        self.entity_dict.pop(sort_key)
+        self._delete(num_pes_available, sort_key)
+        if self.capacity_matrix is not None:
+            self.capacity_matrix.remove(entity)
+        if self.capacity_tree is not None:
+            self.capacity_tree.remove(entity)
+
+    def update(self, entity: Any) -> None:
+        """
+        Move the entity to the bucket of its current ```num_pes_available```,
+        entities that are not indexed are ignored
+        """
+        entry = self.entry_dict.get(entity.get_key())
+        if entry is None:
+            return
+        if self.capacity_matrix is not None:
+            self.capacity_matrix.update(entity)
+        if self.capacity_tree is not None:
+            self.capacity_tree.update(entity)
+        num_pes_available, sort_key = entry
+        num_pes_available_now = entity.get_num_pes_available()
+        # RAM, storage and bandwidth may have changed alone, the matrix and tree are refreshed anyway
+        if num_pes_available_now == num_pes_available:
+            return
+        self._delete(num_pes_available, sort_key)
+        self._insert(num_pes_available_now, sort_key)
+        self.entry_dict[entity.get_key()] = (num_pes_available_now, sort_key)
+
+    def contains(self, entity: Any) -> bool:
+        return entity.get_key() in self.entry_dict
+
+    def iter_candidates(self, num_pes_required: int) -> Iterator[Any]:
+        """
+        Entities with at least ```num_pes_required``` available Pes, the most available first.
+        Do not update the index while iterating
+        """
+        position = bisect_left(self.num_pes_key_list, num_pes_required)
+        for num_pes_available in reversed(self.num_pes_key_list[position:]):
+            for sort_key in self.bucket_dict[num_pes_available]:
+                yield self.entity_dict[sort_key]
+
+    def iter_candidates_ascending(self, num_pes_required: int) -> Iterator[Any]:
+        """
+        Entities with at least ```num_pes_required``` available Pes, the least available first.
+        Do not update the index while iterating
+        """
+        position = bisect_left(self.num_pes_key_list, num_pes_required)
+        for num_pes_available in self.num_pes_key_list[position:]:
+            for sort_key in self.bucket_dict[num_pes_available]:
+                yield self.entity_dict[sort_key]
+
+    def find_max_fit(self, num_pes_required: int, is_suitable: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """
+        The entity with the most available Pes (smallest id among ties)
+        that passes the filter, ```None``` if there is none
+        """
+        for entity in self.iter_candidates(num_pes_required):
+            if is_suitable is None or is_suitable(entity):
+                return entity
+        return None
+
+    def find_best_fit(self, num_pes_required: int, is_suitable: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """
+        The entity with the least available Pes still covering ```num_pes_required```
+        (smallest id among ties) that passes the filter, ```None``` if there is none
+        """
+        for entity in self.iter_candidates_ascending(num_pes_required):
+            if is_suitable is None or is_suitable(entity):
+                return entity
+        return None
+
+    def get_capacity_matrix(self, to_row: Optional[Callable[[Any], Tuple[tuple, tuple]]] = None) -> CapacityMatrix:
+        """
+        The CapacityMatrix kept in sync with this index, built on first use so that
+        simulations not using vectorized placement do not pay for the updates
+        """
+        if self.capacity_matrix is None:
+            entity_list = [self.entity_dict[sort_key] for sort_key in sorted(self.entity_dict)]
+            self.capacity_matrix = CapacityMatrix(entity_list) if to_row is None else CapacityMatrix(entity_list, to_row)
+        return self.capacity_matrix
+
+    def get_capacity_tree(self, to_row: Optional[Callable[[Any], Tuple[tuple, tuple]]] = None) -> CapacityTree:
+        """
+        The CapacityTree kept in sync with this index, entities in id order, built on first use
+        """
+        if self.capacity_tree is None:
+            entity_list = [self.entity_dict[sort_key] for sort_key in sorted(self.entity_dict)]
+            self.capacity_tree = CapacityTree(entity_list) if to_row is None else CapacityTree(entity_list, to_row)
+        return self.capacity_tree
+
+    def get_size(self) -> int:
+        return len(self.entry_dict)
+
+    def get_max_num_pes_available(self) -> int:
+        return self.num_pes_key_list[-1] if len(self.num_pes_key_list) > 0 else 0
@@ -0,0 +1,143 @@
+from __future__ import annotations
+import numpy as np
+from typing import Any, Callable, Dict, List, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..hosts import Host
+
+# columns of the capacity matrix
+PES, RAM, STORAGE, BANDWIDTH = range(4)
+NUM_CAPACITY_COLUMNS = 4
+
+
+def host_to_capacity_row(host: Host) -> Tuple[Tuple[float, float, float, float], Tuple[float, float, float, float]]:
+    """
+    Available and total (Pes, RAM, storage, bandwidth) of a Host
+    """
+    ram = host.get_ram()
+    storage = host.get_storage()
+    bandwidth = host.get_bandwidth()
+    return (
+        (host.get_num_pes_available(), ram.get_size_available(), storage.get_size_available(), bandwidth.get_size_available()),
+        (host.get_num_pes(), ram.get_size_capacity(), storage.get_size_capacity(), bandwidth.get_size_capacity())
+    )
+
+
+class CapacityMatrix:
+    def __init__(self, entity_list: List[Any], to_row: Callable[[Any], Tuple[tuple, tuple]] = host_to_capacity_row, initial_capacity: int = 64) -> None:
+        """
+        Available and total capacity of entities as N x 4 float arrays, one row per entity,
+        for vectorized feasibility checks and scoring over all Hosts at once.
+        Rows are kept in sync through ```update``` (a CapacityIndex forwards its updates
+        to its matrix), removed rows are filled with the last row.
+        The arrays are column-major so that comparing one column over all rows is contiguous
+
+        Parameters
+        ----------
+        entity_list: List
+            Initial entities, anything with ```get_key``` and ```get_id```
+        to_row: Callable
+            Map an entity to its (available, total) capacity tuples, default for Hosts
+        """
+        self.to_row = to_row
+        self.available_array = np.zeros((max(initial_capacity, len(entity_list)), NUM_CAPACITY_COLUMNS), order="F")
+        self.total_array = np.zeros_like(self.available_array)
+        # 1/total^2 per column for capacity-normalized scores, 0 where a column has no capacity
+        self.inverse_square_total_array = np.zeros_like(self.available_array)
+        self.id_array = np.zeros(len(self.available_array), dtype=np.int64)
+        self.entity_list = []
+        self.row_dict: Dict[int, int] = {}
+        for entity in entity_list:
+            self.add(entity)
+
+    def _grow(self) -> None:
+        size = 2*len(self.available_array)
+        for name in ["available_array", "total_array", "inverse_square_total_array"]:
+            array = np.zeros((size, NUM_CAPACITY_COLUMNS), order="F")
+            array[:len(self.entity_list)] = getattr(self, name)[:len(self.entity_list)]
+            setattr(self, name, array)
+        self.id_array = np.resize(self.id_array, size)
+
+    def add(self, entity: Any) -> None:
+        if entity.get_key() in self.row_dict:
+            raise KeyError("Entity %d is already in the capacity matrix" % entity.get_id())
+        row = len(self.entity_list)
+        if row == len(self.available_array):
+            self._grow()
+        self.entity_list.append(entity)
+        self.row_dict[entity.get_key()] = row
+        self.id_array[row] = entity.get_id()
+        self._set_row(row, entity)
+
+    def _set_row(self, row: int, entity: Any) -> None:
+        available, total = self.to_row(entity)
+        self.available_array[row] = available
+        if tuple(self.total_array[row]) != tuple(total):
+            self.total_array[row] = total
+            total_array = self.total_array[row]
+            self.inverse_square_total_array[row] = np.divide(1.0, total_array*total_array, out=np.zeros(NUM_CAPACITY_COLUMNS), where=total_array > 0)
+
+    def remove(self, entity: Any) -> None:
+        row = self.row_dict.pop(entity.get_key())
+        last_row = len(self.entity_list)-1
+        last_entity = self.entity_list.pop()
+        if row != last_row:
+            self.entity_list[row] = last_entity
+            self.row_dict[last_entity.get_key()] = row
+            self.available_array[row] = self.available_array[last_row]
+            self.total_array[row] = self.total_array[last_row]
+            self.inverse_square_total_array[row] = self.inverse_square_total_array[last_row]
+            self.id_array[row] = self.id_array[last_row]
+
+    def update(self, entity: Any) -> None:
+        row = self.row_dict.get(entity.get_key())
+        if row is not None:
+            self._set_row(row, entity)
+
+    def get_size(self) -> int:
+        return len(self.entity_list)
+
+    def get_entity(self, row: int) -> Any:
+        return self.entity_list[row]
+
+    def get_available_array(self) -> np.ndarray:
+        """
+        View of the available capacity of the live rows
+        """
+        return self.available_array[:len(self.entity_list)]
+
+    def get_total_array(self) -> np.ndarray:
+        return self.total_array[:len(self.entity_list)]
+
+    def get_inverse_square_total_array(self) -> np.ndarray:
+        return self.inverse_square_total_array[:len(self.entity_list)]
+
+    def get_id_array(self) -> np.ndarray:
+        return self.id_array[:len(self.entity_list)]
+
+    def get_feasibility_mask(self, demand: np.ndarray) -> np.ndarray:
+        """
+        Rows able to accommodate a demand vector (Pes, RAM, storage, bandwidth)
+        """
+        available_array = self.get_available_array()
+        mask = available_array[:, 0] >= demand[0]
+        for column in range(1, NUM_CAPACITY_COLUMNS):
+            mask &= available_array[:, column] >= demand[column]
+        return mask
+
+    def get_batch_feasibility(self, demand_array: np.ndarray, max_chunk_elements: int = 1 << 22) -> np.ndarray:
+        """
+        For each demand vector of a batch, whether any row can accommodate it on its own.
+        Vm batches use a handful of shapes, only distinct demands are compared,
+        in chunks to bound the V x H x 4 temporary
+        """
+        available_array = self.get_available_array()
+        if len(available_array) == 0:
+            return np.zeros(len(demand_array), dtype=bool)
+        unique_demand_array, inverse = np.unique(demand_array, axis=0, return_inverse=True)
+        is_feasible_array = np.zeros(len(unique_demand_array), dtype=bool)
+        chunk_size = max(1, max_chunk_elements//(len(available_array)*NUM_CAPACITY_COLUMNS))
+        for start in range(0, len(unique_demand_array), chunk_size):
+            chunk = unique_demand_array[start:start+chunk_size]
+            is_feasible_array[start:start+chunk_size] = (available_array[None, :, :] >= chunk[:, None, :]).all(axis=2).any(axis=1)
+        return is_feasible_array[inverse.reshape(-1)]
+
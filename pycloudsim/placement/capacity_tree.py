@@ -0,0 +1,231 @@
+from __future__ import annotations
+from .capacity_matrix import host_to_capacity_row, NUM_CAPACITY_COLUMNS
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+EMPTY_NODE = (-1.0,)*NUM_CAPACITY_COLUMNS
+# a node of a best-fit tree, (RAM, storage, bandwidth) without the Pes column
+EMPTY_RESOURCE_NODE = (-1.0,)*(NUM_CAPACITY_COLUMNS-1)
+
+
+class CapacityTree:
+    def __init__(self, entity_list: List[Any], to_row: Callable[[Any], Tuple[tuple, tuple]] = host_to_capacity_row, initial_capacity: int = 64) -> None:
+        """
+        A segment tree over entities in insertion order, every node holds the maximum available
+        (Pes, RAM, storage, bandwidth) of its subtree per column, so the first entity able to
+        accommodate a demand vector is found by descending from the root and skipping every
+        subtree that can not fit it. An update refreshes one leaf and its ancestors.
+        A subtree may pass the check with column maxima coming from different entities,
+        in that case the search backtracks. To keep a fragmented prefix from being searched
+        again and again, the position where a demand was last found (or the end, when it
+        was not) is remembered and searches for the same demand start there, which holds
+        as long as no entity gains capacity, any gain forgets all the positions.
+        Best-fit searches use a tree of the same shape per number of available Pes, holding
+        only the entities with that many available Pes, so the RAM, storage and bandwidth maxima
+        they prune on never mix entities of different Pes. These trees are built on the first
+        best-fit search and kept up to date from then on
+
+        Parameters
+        ----------
+        entity_list: List
+            Initial entities in first-fit order, anything with ```get_key```
+        to_row: Callable
+            Map an entity to its (available, total) capacity tuples, default for Hosts
+        """
+        self.to_row = to_row
+        self.size = 1
+        while self.size < max(initial_capacity, len(entity_list)):
+            self.size *= 2
+        # node 1 is the root, leaves start at ```size```, each node is the column-wise maximum of its subtree
+        self.node_list: List[Tuple[float, ...]] = [EMPTY_NODE]*(2*self.size)
+        # largest total capacity per column ever added, for normalizing demands
+        self.max_total = [0.0]*NUM_CAPACITY_COLUMNS
+        self.entity_list = []
+        self.position_dict: Dict[int, int] = {}
+        # demand vector -> the first position that may fit it
+        self.first_fit_hint_dict: Dict[Tuple[float, ...], int] = {}
+        # available Pes -> nodes of the best-fit tree of the entities with that many available Pes
+        self.pes_node_list_dict: Optional[Dict[int, List[Tuple[float, ...]]]] = None
+        for entity in entity_list:
+            self._append(entity)
+        for node in range(self.size-1, 0, -1):
+            self._pull(node)
+
+    def _append(self, entity: Any) -> None:
+        position = len(self.entity_list)
+        self.entity_list.append(entity)
+        self.position_dict[entity.get_key()] = position
+        available, total = self.to_row(entity)
+        self.node_list[self.size+position] = tuple(available)
+        for column in range(NUM_CAPACITY_COLUMNS):
+            if total[column] > self.max_total[column]:
+                self.max_total[column] = total[column]
+
+    def _pull(self, node: int) -> None:
+        left, right = self.node_list[2*node], self.node_list[2*node+1]
+        self.node_list[node] = (
+            left[0] if left[0] > right[0] else right[0],
+            left[1] if left[1] > right[1] else right[1],
+            left[2] if left[2] > right[2] else right[2],
+            left[3] if left[3] > right[3] else right[3]
+        )
+
+    def _refresh(self, position: int) -> None:
+        node = (self.size+position)//2
+        while node > 0:
+            self._pull(node)
+            node //= 2
+
+    def _grow(self) -> None:
+        entity_list = self.entity_list
+        self.size *= 2
+        self.node_list = [EMPTY_NODE]*(2*self.size)
+        self.entity_list = []
+        self.position_dict.clear()
+        # rebuilt in the new size by the next best-fit search
+        self.pes_node_list_dict = None
+        for entity in entity_list:
+            if entity is None:
+                # keep the positions of the removed entities empty
+                self.entity_list.append(None)
+            else:
+                self._append(entity)
+        for node in range(self.size-1, 0, -1):
+            self._pull(node)
+
+    def add(self, entity: Any) -> None:
+        if entity.get_key() in self.position_dict:
+            raise KeyError("Entity %d is already in the capacity tree" % entity.get_id())
+        if len(self.entity_list) == self.size:
+            self._grow()
+        self._append(entity)
+        position = len(self.entity_list)-1
+        self._refresh(position)
+        if self.pes_node_list_dict is not None:
+            self._set_pes_leaf(position, self.node_list[self.size+position])
+
+    def remove(self, entity: Any) -> None:
+        position = self.position_dict.pop(entity.get_key())
+        if self.pes_node_list_dict is not None:
+            self._clear_pes_leaf(position, self.node_list[self.size+position])
+        self.entity_list[position] = None
+        self.node_list[self.size+position] = EMPTY_NODE
+        self._refresh(position)
+
+    def update(self, entity: Any) -> None:
+        position = self.position_dict.get(entity.get_key())
+        if position is None:
+            return
+        available, _ = self.to_row(entity)
+        available = tuple(available)
+        leaf = self.node_list[self.size+position]
+        if len(self.first_fit_hint_dict) > 0 and (available[0] > leaf[0] or available[1] > leaf[1] or available[2] > leaf[2] or available[3] > leaf[3]):
+            self.first_fit_hint_dict.clear()
+        if self.pes_node_list_dict is not None and available != leaf:
+            if available[0] != leaf[0]:
+                self._clear_pes_leaf(position, leaf)
+            self._set_pes_leaf(position, available)
+        self.node_list[self.size+position] = available
+        self._refresh(position)
+
+    def find_first_fit(self, demand: Sequence[float]) -> Any:
+        """
+        The first entity in insertion order whose available capacity covers the demand vector
+        (Pes, RAM, storage, bandwidth), ```None``` if there is none
+        """
+        demand = tuple(demand)
+        start = self.first_fit_hint_dict.get(demand, 0)
+        node_list = self.node_list
+        size = self.size
+        demand_pes, demand_ram, demand_storage, demand_bandwidth = demand
+        # (node, first leaf position of its subtree, subtree width)
+        stack = [(1, 0, size)]
+        while len(stack) > 0:
+            node, low, width = stack.pop()
+            if low+width <= start:
+                continue
+            max_available = node_list[node]
+            if max_available[0] < demand_pes or max_available[1] < demand_ram or max_available[2] < demand_storage or max_available[3] < demand_bandwidth:
+                continue
+            if node >= size:
+                self.first_fit_hint_dict[demand] = low
+                return self.entity_list[low]
+            width //= 2
+            # the left subtree is searched first
+            stack.append((2*node+1, low+width, width))
+            stack.append((2*node, low, width))
+        # entities added later are appended after every position searched so far
+        self.first_fit_hint_dict[demand] = len(self.entity_list)
+        return None
+
+    def _build_pes_node_list_dict(self) -> None:
+        self.pes_node_list_dict = {}
+        for position, entity in enumerate(self.entity_list):
+            if entity is not None:
+                available = self.node_list[self.size+position]
+                self._get_pes_node_list(int(available[0]))[self.size+position] = available[1:]
+        for pes_node_list in self.pes_node_list_dict.values():
+            for node in range(self.size-1, 0, -1):
+                self._pull_resource(pes_node_list, node)
+
+    def _get_pes_node_list(self, pes: int) -> List[Tuple[float, ...]]:
+        pes_node_list = self.pes_node_list_dict.get(pes)
+        if pes_node_list is None:
+            pes_node_list = [EMPTY_RESOURCE_NODE]*(2*self.size)
+            self.pes_node_list_dict[pes] = pes_node_list
+        return pes_node_list
+
+    def _pull_resource(self, pes_node_list: List[Tuple[float, ...]], node: int) -> None:
+        left, right = pes_node_list[2*node], pes_node_list[2*node+1]
+        pes_node_list[node] = (
+            left[0] if left[0] > right[0] else right[0],
+            left[1] if left[1] > right[1] else right[1],
+            left[2] if left[2] > right[2] else right[2]
+        )
+
+    def _set_pes_leaf(self, position: int, available: Tuple[float, ...]) -> None:
+        self._refresh_pes_leaf(self._get_pes_node_list(int(available[0])), position, available[1:])
+
+    def _clear_pes_leaf(self, position: int, available: Tuple[float, ...]) -> None:
+        self._refresh_pes_leaf(self.pes_node_list_dict[int(available[0])], position, EMPTY_RESOURCE_NODE)
+
+    def _refresh_pes_leaf(self, pes_node_list: List[Tuple[float, ...]], position: int, leaf: Tuple[float, ...]) -> None:
+        node = self.size+position
+        pes_node_list[node] = leaf
+        node //= 2
+        while node > 0:
+            self._pull_resource(pes_node_list, node)
+            node //= 2
+
+    def find_best_fit(self, demand: Sequence[float]) -> Any:
+        """
+        The entity with the least available Pes whose available capacity covers the demand vector
+        (Pes, RAM, storage, bandwidth), the first in insertion order among ties, ```None``` if there
+        is none. The best-fit trees are searched from the demanded Pes upwards, each by a descent
+        skipping every subtree whose RAM, storage or bandwidth can not fit the demand
+        """
+        if self.pes_node_list_dict is None:
+            self._build_pes_node_list_dict()
+        size = self.size
+        demand_pes, demand_ram, demand_storage, demand_bandwidth = demand
+        for pes in sorted(self.pes_node_list_dict):
+            if pes < demand_pes:
+                continue
+            pes_node_list = self.pes_node_list_dict[pes]
+            stack = [1]
+            while len(stack) > 0:
+                node = stack.pop()
+                max_available = pes_node_list[node]
+                if max_available[0] < demand_ram or max_available[1] < demand_storage or max_available[2] < demand_bandwidth:
+                    continue
+                if node >= size:
+                    return self.entity_list[node-size]
+                # the left subtree is searched first
+                stack.append(2*node+1)
+                stack.append(2*node)
+        return None
+
+    def get_max_total(self) -> List[float]:
+        return list(self.max_total)
+
+    def get_size(self) -> int:
+        return len(self.position_dict)
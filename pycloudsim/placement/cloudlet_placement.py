@@ -1,11 +1,18 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Union
 if TYPE_CHECKING:
     from typing import List, Tuple
     from ..vms import VmRunning
     from ..cloudlets import CloudletRunning
+    from .capacity_index import CapacityIndex
 
 
 class CloudletPlacement:
-    def try_to_place(self, source: List[VmRunning], target: List[CloudletRunning]) -> Tuple[bool, List[CloudletRunning]]:
+    """
+    ```try_to_place()``` is given the candidate Vms as a ```List[VmRunning]```, or as the
+    CapacityIndex of the Datacenter if the policy sets ```accepts_capacity_index```
+    """
+    accepts_capacity_index = False
+
+    def try_to_place(self, source: Union[CapacityIndex, List[VmRunning]], target: List[CloudletRunning]) -> Tuple[bool, List[CloudletRunning]]:
         pass
\ No newline at end of file
@@ -1,11 +1,18 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Optional, Dict
+from typing import TYPE_CHECKING, Optional, Dict, Union
 if TYPE_CHECKING:
     from typing import Dict,List,Tuple
     from ..hosts import Host
     from ..vms import VmRunning
+    from .capacity_index import CapacityIndex
 
 
 class VmPlacement:
-    def try_to_place(self, source: List[Host], target: List[VmRunning]) -> Tuple[bool,List[VmRunning]]:
+    """
+    ```try_to_place()``` is given the candidate Hosts as a ```List[Host]```, or as the
+    CapacityIndex of the Datacenter if the policy sets ```accepts_capacity_index```
+    """
+    accepts_capacity_index = False
+
+    def try_to_place(self, source: Union[CapacityIndex, List[Host]], target: List[VmRunning]) -> Tuple[bool,List[VmRunning]]:
         pass
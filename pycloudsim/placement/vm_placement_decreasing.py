@@ -0,0 +1,71 @@
+from __future__ import annotations
+from .vm_placement import VmPlacement
+from .capacity_index import CapacityIndex
+from typing import Any, Dict, List, Optional, TYPE_CHECKING, Tuple, Union
+if TYPE_CHECKING:
+    from ..hosts import Host
+    from ..vms import VmRunning
+
+
+def vm_to_demand(vm_running: VmRunning) -> Tuple[float, float, float, float]:
+    return (vm_running.get_num_pes(), vm_running.get_size_ram(), vm_running.get_size_storage(), vm_running.get_size_bandwidth())
+
+
+class VmPlacementDecreasing(VmPlacement):
+    accepts_capacity_index = True
+
+    def __init__(self) -> None:
+        """
+        Base of the bin-packing placements: the batch is sorted by decreasing size first,
+        so large Vms are placed while Hosts are still empty and small Vms fill the gaps,
+        then every Vm is placed on the Host chosen by ```find_host```.
+        Subclasses define the size of a Vm and the Host choice.
+        After a successful placement the packing density, the ratio of used Pes on the Hosts
+        the batch landed on, is available through ```get_packing_density```
+        """
+        super().__init__()
+        self.packing_density = 0.0
+
+    def get_sort_key(self, capacity_index: CapacityIndex, vm_running: VmRunning) -> Any:
+        """
+        Vms with a larger key are placed first
+        """
+        pass
+
+    def find_host(self, capacity_index: CapacityIndex, vm_running: VmRunning) -> Optional[Host]:
+        pass
+
+    def get_packing_density(self) -> float:
+        return self.packing_density
+
+    def try_to_place(self, source: Union[CapacityIndex, List[Host]], vm_to_run_list: List[VmRunning]) -> Tuple[bool, List[VmRunning]]:
+        capacity_index = source if isinstance(source, CapacityIndex) else CapacityIndex(source)
+        # stable, Vms of the same size keep the submission order
+        vm_to_run_sorted_list = sorted(vm_to_run_list, key=lambda vm_to_run: self.get_sort_key(capacity_index, vm_to_run), reverse=True)
+        vm_running_placed_list = []
+        is_place_successful = True
+        for vm_to_run in vm_to_run_sorted_list:
+            host = self.find_host(capacity_index, vm_to_run)
+            if host is None:
+                is_place_successful = False
+                break
+            host.bind_vm(vm_to_run)
+            # a Host updates the index it is attached to itself, only a temporary index needs it
+            if host.get_capacity_index() is not capacity_index:
+                capacity_index.update(host)
+            vm_running_placed_list.append(vm_to_run)
+
+        if not is_place_successful:
+            for vm_running in vm_running_placed_list:
+                host = vm_running.get_host()
+                host.release_vm(vm_running)
+                if host.get_capacity_index() is not capacity_index:
+                    capacity_index.update(host)
+            self.packing_density = 0.0
+        else:
+            host_dict: Dict[int, Host] = {vm_running.get_host().get_key(): vm_running.get_host() for vm_running in vm_running_placed_list}
+            num_pes = sum(host.get_num_pes() for host in host_dict.values())
+            num_pes_used = num_pes-sum(host.get_num_pes_available() for host in host_dict.values())
+            self.packing_density = num_pes_used/num_pes if num_pes > 0 else 0.0
+
+        return is_place_successful, vm_running_placed_list
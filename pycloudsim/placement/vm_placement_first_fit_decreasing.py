@@ -0,0 +1,23 @@
+from __future__ import annotations
+from .vm_placement_decreasing import VmPlacementDecreasing, vm_to_demand
+from .capacity_index import CapacityIndex
+from typing import Any, Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..hosts import Host
+    from ..vms import VmRunning
+
+
+class VmPlacementFirstFitDecreasing(VmPlacementDecreasing):
+    def __init__(self) -> None:
+        """
+        First-fit decreasing: Vms sorted by Pes then RAM, storage and bandwidth, largest first,
+        each placed on the first Host in id order that can accommodate it,
+        found in O(log H) on the CapacityTree of the Host index
+        """
+        super().__init__()
+
+    def get_sort_key(self, capacity_index: CapacityIndex, vm_running: VmRunning) -> Any:
+        return vm_to_demand(vm_running)
+
+    def find_host(self, capacity_index: CapacityIndex, vm_running: VmRunning) -> Optional[Host]:
+        return capacity_index.get_capacity_tree().find_first_fit(vm_to_demand(vm_running))
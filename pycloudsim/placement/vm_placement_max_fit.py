@@ -1,59 +1,50 @@
 from __future__ import annotations
 from .vm_placement import VmPlacement
-from ..utils import MinHeap
-from .host_suitability import HostSuitability
-from typing import List, TYPE_CHECKING,Tuple
+from .capacity_index import CapacityIndex
+from typing import List, TYPE_CHECKING, Tuple, Union
 if TYPE_CHECKING:
     from ..hosts import Host
     from ..vms import VmRunning
 
 
 class VmPlacementMaxFit(VmPlacement):
+    accepts_capacity_index = True
+
     def __init__(self) -> None:
         super().__init__()
-    def try_to_place(self, host_list: List[Host], vm_to_run_list: List[VmRunning]) -> Tuple[bool,List[VmRunning]]:
-        def host_suitability_comparator(suitability_a: HostSuitability, suitability_b: HostSuitability) -> bool:
-            # if host a is suitable for vm while b is not
-            if suitability_a.get_suitability() and not suitability_b.get_suitability():
-                return True
-            # if host a is not suitable for vm while b is
-            elif not suitability_a.get_suitability() and suitability_b.get_suitability():
-                return False
-            # if both of host a and host b are not suitable for vm, their order doesn't matter
-            elif not suitability_a.get_suitability() and not suitability_b.get_suitability():
-                return False
-            # if both of host a and host b are suitable for vm, the one with more available CPU cores goes first
-            else:
-                if suitability_a.get_host().get_num_pes_available() > suitability_b.get_host().get_num_pes_available():
-                    return True
-                elif suitability_a.get_host().get_num_pes_available() < suitability_b.get_host().get_num_pes_available():
-                    return False
-                # if both of host a and host b are suitable for vm with the same num of CPU cores, the one
-                # with smaller host id goes first
-                else:
-                    return suitability_a.get_host().get_id() < suitability_b.get_host().get_id()
 
+    def try_to_place(self, source: Union[CapacityIndex, List[Host]], vm_to_run_list: List[VmRunning]) -> Tuple[bool,List[VmRunning]]:
+        """
+        Place each Vm on the suitable Host with the most available Pes, the one with the smaller
+        host id goes first among ties. Hosts are looked up in a CapacityIndex, a plain host list
+        is indexed first
+        """
+        capacity_index = source if isinstance(source, CapacityIndex) else CapacityIndex(source)
         vm_running_placed_list=[]
         is_place_successful = True
-        host_suitability_heap = MinHeap(host_suitability_comparator)
-        for host in host_list:
-            host_suitability_heap.push(HostSuitability(host))
         for vm_to_run in vm_to_run_list:
-            for host_suitability in host_suitability_heap:
-                host_suitability.update_suitability(vm_to_run)
-            host_suitability_heap.heapify()
-            suitability_head = host_suitability_heap.pop()
-            if suitability_head.get_suitability() == False:
+            def is_host_suitable(host: Host) -> bool:
+                return (
+                    vm_to_run.get_size_ram() <= host.get_ram().get_size_available() and
+                    vm_to_run.get_size_storage() <= host.get_storage().get_size_available() and
+                    vm_to_run.get_size_bandwidth() <= host.get_bandwidth().get_size_available()
+                )
+            host = capacity_index.find_max_fit(vm_to_run.get_num_pes(), is_host_suitable)
+            if host is None:
                 is_place_successful = False
                 break
             else:
-                suitability_head.get_host().bind_vm(vm_to_run)
+                host.bind_vm(vm_to_run)
+                # a Host updates the index it is attached to itself, only a temporary index needs it
+                if host.get_capacity_index() is not capacity_index:
+                    capacity_index.update(host)
                 vm_running_placed_list.append(vm_to_run)
-                host_suitability_heap.push(suitability_head)
 
         if not is_place_successful:
             for vm_running in vm_running_placed_list:
                 host=vm_running.get_host()
                 host.release_vm(vm_running)
+                if host.get_capacity_index() is not capacity_index:
+                    capacity_index.update(host)
         
         return is_place_successful,vm_running_placed_list
@@ -0,0 +1,61 @@
+from __future__ import annotations
+from .vm_placement_decreasing import VmPlacementDecreasing, vm_to_demand
+from .capacity_index import CapacityIndex
+from enum import Enum
+from typing import Any, Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..hosts import Host
+    from ..vms import VmRunning
+
+
+class VmPlacementVectorPacking(VmPlacementDecreasing):
+    """
+    Multi-dimensional first-fit decreasing, Vms are ordered by a scalar size combining
+    their Pes, RAM, storage and bandwidth demands, each normalized by the largest Host
+    capacity of that resource, so no single resource dominates the order by its unit
+    """
+    class Weighting(Enum):
+        """
+        Sum of the normalized demands
+        """
+        SUM = 0
+
+        """
+        Product of the normalized demands, resources not demanded are left out
+        """
+        PRODUCT = 1
+
+        """
+        Largest normalized demand, i.e. the dominant resource
+        """
+        MAX = 2
+
+    def __init__(self, weighting: Weighting = Weighting.SUM) -> None:
+        """
+        Parameters
+        ----------
+        weighting: VmPlacementVectorPacking.Weighting
+            How normalized demands are combined into the size of a Vm, default sum
+        """
+        super().__init__()
+        self.weighting = weighting
+
+    def get_weighting(self) -> Weighting:
+        return self.weighting
+
+    def get_sort_key(self, capacity_index: CapacityIndex, vm_running: VmRunning) -> Any:
+        max_total = capacity_index.get_capacity_tree().get_max_total()
+        normalized_demand_list = [demand/total for demand, total in zip(vm_to_demand(vm_running), max_total) if total > 0]
+        if self.weighting == VmPlacementVectorPacking.Weighting.SUM:
+            return sum(normalized_demand_list)
+        elif self.weighting == VmPlacementVectorPacking.Weighting.PRODUCT:
+            size = 1.0
+            for normalized_demand in normalized_demand_list:
+                if normalized_demand > 0:
+                    size *= normalized_demand
+            return size
+        else:
+            return max(normalized_demand_list, default=0.0)
+
+    def find_host(self, capacity_index: CapacityIndex, vm_running: VmRunning) -> Optional[Host]:
+        return capacity_index.get_capacity_tree().find_first_fit(vm_to_demand(vm_running))
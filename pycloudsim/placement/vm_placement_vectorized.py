@@ -0,0 +1,182 @@
+from __future__ import annotations
+from .vm_placement import VmPlacement
+from .capacity_index import CapacityIndex
+from .capacity_matrix import CapacityMatrix, PES, NUM_CAPACITY_COLUMNS
+from enum import Enum
+import heapq
+import numpy as np
+from typing import Dict, List, TYPE_CHECKING, Tuple, Union
+if TYPE_CHECKING:
+    from ..hosts import Host
+    from ..vms import VmRunning
+
+
+class VmPlacementVectorized(VmPlacement):
+    """
+    The suitable Host with the highest score is chosen,
+    the one with the smaller host id goes first among ties
+    """
+    accepts_capacity_index = True
+
+    class Score(Enum):
+        """
+        Most available Pes, the same placement as VmPlacementMaxFit
+        """
+        MAX_FIT = 0
+
+        """
+        Least available Pes, i.e. the tightest Host
+        """
+        BEST_FIT = 1
+
+        """
+        Alignment of the Vm demand with the available capacity, both normalized by the Host capacity
+        """
+        DOT_PRODUCT = 2
+
+    def __init__(self, score: Score = Score.MAX_FIT) -> None:
+        """
+        Vm placement on a CapacityMatrix, feasibility and scores are computed over all
+        Hosts once per distinct Vm shape of a batch with NumPy, then only the rows of the
+        Hosts Vms were bound to are rescored, instead of one Python call per Host.
+        A batch that can not fit (total demand over total available capacity, or a Vm no
+        single Host can accommodate) is rejected before any Vm is bound
+
+        Parameters
+        ----------
+        score: VmPlacementVectorized.Score
+            How suitable Hosts are ranked, default max-fit
+        """
+        super().__init__()
+        self.score = score
+
+    def get_score(self) -> Score:
+        return self.score
+
+    def _compute_score_array(self, capacity_matrix: CapacityMatrix, demand: np.ndarray, rows: Union[np.ndarray, slice] = slice(None)) -> np.ndarray:
+        """
+        Scores of the given rows, -inf where the demand does not fit
+        """
+        available_array = capacity_matrix.get_available_array()[rows]
+        if self.score == VmPlacementVectorized.Score.MAX_FIT:
+            score_array = available_array[:, PES].copy()
+        elif self.score == VmPlacementVectorized.Score.BEST_FIT:
+            score_array = -available_array[:, PES]
+        else:
+            inverse_square_total_array = capacity_matrix.get_inverse_square_total_array()[rows]
+            score_array = np.zeros(len(available_array))
+            for column in range(NUM_CAPACITY_COLUMNS):
+                if demand[column] != 0:
+                    score_array += available_array[:, column]*inverse_square_total_array[:, column]*demand[column]
+        mask = available_array[:, 0] >= demand[0]
+        for column in range(1, NUM_CAPACITY_COLUMNS):
+            mask &= available_array[:, column] >= demand[column]
+        score_array[~mask] = -np.inf
+        return score_array
+
+    def _rank_rows(self, capacity_matrix: CapacityMatrix, demand: np.ndarray, num_rows: int, changed_row_list: List[int]) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """
+        The ```num_rows``` best suitable rows not in ```changed_row_list```, best first, with
+        their scores, plus rows tied with the last one so the smaller id still wins ties.
+        Also whether suitable rows were left out
+        """
+        score_array = self._compute_score_array(capacity_matrix, demand)
+        score_array[changed_row_list] = -np.inf
+        num_feasible = int(np.count_nonzero(score_array > -np.inf))
+        if num_rows < num_feasible:
+            threshold = np.partition(score_array, len(score_array)-num_rows)[len(score_array)-num_rows]
+            row_array = np.flatnonzero(score_array >= threshold)
+        else:
+            row_array = np.flatnonzero(score_array > -np.inf)
+        row_score_array = score_array[row_array]
+        order = np.lexsort((capacity_matrix.get_id_array()[row_array], -row_score_array))
+        return row_array[order], row_score_array[order], len(row_array) < num_feasible
+
+    def is_batch_feasible(self, capacity_matrix: CapacityMatrix, demand_array: np.ndarray) -> bool:
+        """
+        Necessary conditions for placing the whole batch, checked for all Vms at once
+        """
+        if len(demand_array) == 0:
+            return True
+        if (demand_array.sum(axis=0) > capacity_matrix.get_available_array().sum(axis=0)).any():
+            return False
+        return bool(capacity_matrix.get_batch_feasibility(demand_array).all())
+
+    def try_to_place(self, source: Union[CapacityIndex, List[Host]], vm_to_run_list: List[VmRunning]) -> Tuple[bool,List[VmRunning]]:
+        capacity_matrix = source.get_capacity_matrix() if isinstance(source, CapacityIndex) else CapacityMatrix(source)
+        # Hosts attached to the CapacityIndex update its matrix themselves
+        capacity_index = source if isinstance(source, CapacityIndex) else None
+        demand_array = np.array([
+            (vm_to_run.get_num_pes(), vm_to_run.get_size_ram(), vm_to_run.get_size_storage(), vm_to_run.get_size_bandwidth())
+            for vm_to_run in vm_to_run_list
+        ], dtype=float).reshape(-1, 4)
+        if not self.is_batch_feasible(capacity_matrix, demand_array):
+            return False, []
+
+        # one scoring pass over all Hosts per distinct Vm shape ranks the candidate rows. Binding
+        # a Vm only changes the row of its Host, so the best row for a Vm is the best of the rows
+        # changed so far, rescored once per change in a heap per shape, and the first unchanged
+        # candidate, whose score still holds
+        shape_array, shape_index_array = np.unique(demand_array, axis=0, return_inverse=True)
+        shape_index_array = shape_index_array.reshape(-1)
+        num_shapes = len(shape_array)
+        num_vms_left_array = np.bincount(shape_index_array, minlength=num_shapes)
+        ranking_list = [None]*num_shapes
+        position_list = [0]*num_shapes
+        # (-score, host id, row, version) of changed rows, stale once the row changes again
+        changed_heap_list = [[] for _ in range(num_shapes)]
+        bound_row_list = []
+        bound_row_position_list = [0]*num_shapes
+        row_version_dict: Dict[int, int] = {}
+        id_array = capacity_matrix.get_id_array()
+        vm_running_placed_list = []
+        is_place_successful = True
+        for vm_to_run, shape_index in zip(vm_to_run_list, shape_index_array):
+            demand = shape_array[shape_index]
+            ranking = ranking_list[shape_index]
+            position = position_list[shape_index]
+            if ranking is not None:
+                while position < len(ranking[0]) and ranking[0][position] in row_version_dict:
+                    position += 1
+            if ranking is None or (position == len(ranking[0]) and ranking[2]):
+                ranking = self._rank_rows(capacity_matrix, demand, int(num_vms_left_array[shape_index]), list(row_version_dict))
+                ranking_list[shape_index] = ranking
+                position = 0
+            position_list[shape_index] = position
+            row, best_key = -1, (np.inf, 0)
+            if position < len(ranking[0]):
+                row = int(ranking[0][position])
+                best_key = (-ranking[1][position], id_array[row])
+
+            changed_heap = changed_heap_list[shape_index]
+            new_row_list = list(dict.fromkeys(bound_row_list[bound_row_position_list[shape_index]:]))
+            bound_row_position_list[shape_index] = len(bound_row_list)
+            if len(new_row_list) > 0:
+                for new_row, score in zip(new_row_list, self._compute_score_array(capacity_matrix, demand, np.array(new_row_list)).tolist()):
+                    if score > -np.inf:
+                        heapq.heappush(changed_heap, (-score, int(id_array[new_row]), new_row, row_version_dict[new_row]))
+            while len(changed_heap) > 0 and changed_heap[0][3] != row_version_dict[changed_heap[0][2]]:
+                heapq.heappop(changed_heap)
+            if len(changed_heap) > 0 and changed_heap[0][:2] < best_key:
+                row = changed_heap[0][2]
+
+            if row < 0:
+                is_place_successful = False
+                break
+            host = capacity_matrix.get_entity(row)
+            host.bind_vm(vm_to_run)
+            if capacity_index is None or host.get_capacity_index() is not capacity_index:
+                capacity_matrix.update(host)
+            row_version_dict[row] = row_version_dict.get(row, 0)+1
+            bound_row_list.append(row)
+            num_vms_left_array[shape_index] -= 1
+            vm_running_placed_list.append(vm_to_run)
+
+        if not is_place_successful:
+            for vm_running in vm_running_placed_list:
+                host = vm_running.get_host()
+                host.release_vm(vm_running)
+                if capacity_index is None or host.get_capacity_index() is not capacity_index:
+                    capacity_matrix.update(host)
+
+        return is_place_successful, vm_running_placed_list
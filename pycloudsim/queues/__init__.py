@@ -0,0 +1,3 @@
+from .event_queue import EventQueue
+from .event_queue_heap import EventQueueHeap
+from .event_queue_calendar import EventQueueCalendar
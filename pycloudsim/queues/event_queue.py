@@ -0,0 +1,36 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+if TYPE_CHECKING:
+    from ..events import Event
+
+
+class EventQueue:
+    """
+    A EventQueue is the pending event set of a Simulator.
+    Events are ordered by ```(start_time, priority)```, where priority is
+    the value of Event.TYPE, and events with the same start time and priority
+    leave the queue in the order they were pushed (FIFO).
+    ```push()``` returns a handle which can be passed to ```cancel()```
+    to retract the event before it is popped
+    """
+
+    def push(self, event: Event) -> Any:
+        pass
+
+    def cancel(self, handle: Any) -> bool:
+        pass
+
+    def pop(self) -> Event:
+        pass
+
+    def peek(self) -> Event:
+        pass
+
+    def is_empty(self) -> bool:
+        pass
+
+    def get_size(self) -> int:
+        pass
+
+    def clear(self) -> None:
+        pass
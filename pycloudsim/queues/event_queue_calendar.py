@@ -0,0 +1,227 @@
+from __future__ import annotations
+from .event_queue import EventQueue
+from bisect import insort
+from heapq import heappush, heappop, heapify, nsmallest
+import math
+from typing import TYPE_CHECKING, List
+if TYPE_CHECKING:
+    from ..events import Event
+
+
+class EventQueueCalendar(EventQueue):
+    """
+    The largest bucket number a start time can be mapped to,
+    events beyond it (e.g. the default termination event scheduled
+    at the maximum float value) are kept in an overflow heap
+    """
+    MAX_VIRTUAL_BUCKET = 2**53
+
+    def __init__(self, num_buckets: int = 2, bucket_width: float = 1.0, num_width_samples: int = 25, min_tombstones_to_compact: int = 1024) -> None:
+        """
+        A calendar queue (R. Brown, 1988) event queue with O(1) amortized push and pop
+        when events land close to the current clock.
+        Time is divided into buckets of ```bucket_width```, a bucket holds the events
+        of all "years" mapped to it, sorted by ```(start_time, priority, insertion_seq)```.
+        Popping advances the head of a bucket instead of shifting it, the popped entries
+        are cut off together once they make up half of the bucket.
+        The number of buckets doubles/halves when the queue size leaves
+        ```[num_buckets/2, num_buckets*2]```, and the bucket width is re-estimated from the
+        average separation of the earliest pending events on every resize.
+        Entries are lists ```[start_time, priority, insertion_seq, event]``` and double as
+        the cancellation handles returned by ```push()```, see EventQueueHeap
+
+        Parameters
+        ----------
+        num_buckets: int
+            Initial number of buckets
+        bucket_width: float
+            Initial bucket width in simulation time
+        num_width_samples: int
+            Number of earliest pending events sampled to estimate the bucket width
+        min_tombstones_to_compact: int
+            Never compact the queue while there are fewer tombstones than this
+        """
+        if num_buckets <= 0:
+            raise ValueError("Number of buckets must greater than 0")
+        if bucket_width <= 0:
+            raise ValueError("Bucket width must greater than 0")
+        self.min_num_buckets = num_buckets
+        self.num_buckets = num_buckets
+        self.bucket_width = 1.0*bucket_width
+        self.num_width_samples = num_width_samples
+        self.bucket_list = [[] for _ in range(num_buckets)]
+        # index of the first entry of every bucket not popped yet, exhausted buckets are emptied
+        self.bucket_head_list = [0]*num_buckets
+        self.calendar_size = 0
+        self.overflow_heap = []
+        self.current_virtual_bucket = 0
+        self.insertion_seq = 0
+        self.num_tombstones = 0
+        self.min_tombstones_to_compact = min_tombstones_to_compact
+
+    def _get_virtual_bucket(self, start_time: float) -> int:
+        return int(start_time/self.bucket_width)
+
+    def _insert(self, entry: List) -> None:
+        # compared before dividing, the maximum float start time over a width below 1 overflows
+        if entry[0] >= EventQueueCalendar.MAX_VIRTUAL_BUCKET*self.bucket_width:
+            heappush(self.overflow_heap, entry)
+            return
+        virtual_bucket = int(entry[0]/self.bucket_width)
+        if virtual_bucket < self.current_virtual_bucket:
+            self.current_virtual_bucket = virtual_bucket
+        index = virtual_bucket % self.num_buckets
+        insort(self.bucket_list[index], entry, self.bucket_head_list[index])
+        self.calendar_size += 1
+
+    def _locate(self) -> int:
+        """
+        Find the index of the bucket holding the smallest entry and move the current
+        virtual bucket to it, only called when the calendar is not empty
+        """
+        virtual_bucket = self.current_virtual_bucket
+        bucket_list = self.bucket_list
+        bucket_head_list = self.bucket_head_list
+        num_buckets = self.num_buckets
+        for _ in range(num_buckets):
+            index = virtual_bucket % num_buckets
+            bucket = bucket_list[index]
+            if bucket and int(bucket[bucket_head_list[index]][0]/self.bucket_width) <= virtual_bucket:
+                self.current_virtual_bucket = virtual_bucket
+                return index
+            virtual_bucket += 1
+        # A whole year is empty, jump directly to the smallest entry
+        index = min((index for index, bucket in enumerate(bucket_list) if bucket), key=lambda index: bucket_list[index][bucket_head_list[index]])
+        self.current_virtual_bucket = self._get_virtual_bucket(bucket_list[index][bucket_head_list[index]][0])
+        return index
+
+    def _pop_head(self, index: int) -> List:
+        bucket = self.bucket_list[index]
+        head = self.bucket_head_list[index]
+        entry = bucket[head]
+        head += 1
+        if head == len(bucket):
+            bucket.clear()
+            head = 0
+        elif 2*head >= len(bucket):
+            # cutting off the popped entries costs no more than the pops since the last cut
+            del bucket[:head]
+            head = 0
+        self.bucket_head_list[index] = head
+        self.calendar_size -= 1
+        return entry
+
+    def _estimate_bucket_width(self, entry_list: List[List]) -> float:
+        sample_list = nsmallest(self.num_width_samples, entry_list)
+        separation_list = [b[0]-a[0] for a, b in zip(sample_list, sample_list[1:]) if b[0] > a[0]]
+        if len(separation_list) == 0:
+            return self.bucket_width
+        average = sum(separation_list)/len(separation_list)
+        # Outliers such as a far-away termination event should not widen the buckets
+        separation_list = [separation for separation in separation_list if separation <= 2*average]
+        if len(separation_list) > 0:
+            average = sum(separation_list)/len(separation_list)
+        bucket_width = 3*average
+        if not math.isfinite(bucket_width) or bucket_width <= 0:
+            return self.bucket_width
+        return bucket_width
+
+    def _resize(self, num_buckets: int) -> None:
+        # popped entries ahead of the bucket heads are tombstones too, all of them are left out
+        entry_list = [entry for bucket in self.bucket_list for entry in bucket if entry[3] is not None]
+        self.bucket_width = self._estimate_bucket_width(entry_list)
+        entry_list.extend(entry for entry in self.overflow_heap if entry[3] is not None)
+        self.num_tombstones = 0
+        entry_list.sort()
+        self.num_buckets = num_buckets
+        self.bucket_list = [[] for _ in range(num_buckets)]
+        self.bucket_head_list = [0]*num_buckets
+        self.calendar_size = 0
+        self.overflow_heap = []
+        self.current_virtual_bucket = self._get_virtual_bucket(entry_list[0][0]) if entry_list and entry_list[0][0]/self.bucket_width < EventQueueCalendar.MAX_VIRTUAL_BUCKET else 0
+        for entry in entry_list:
+            self._insert(entry)
+        heapify(self.overflow_heap)
+
+    def push(self, event: Event) -> List:
+        self.insertion_seq += 1
+        entry = [event.start_time, event.priority, self.insertion_seq, event]
+        self._insert(entry)
+        if self.calendar_size > 2*self.num_buckets:
+            self._resize(2*self.num_buckets)
+        return entry
+
+    def cancel(self, handle: List) -> bool:
+        """
+        Cancel a pushed event, return False if it has already been popped or cancelled
+        """
+        if handle[3] is None:
+            return False
+        handle[3] = None
+        self.num_tombstones += 1
+        if self.num_tombstones >= self.min_tombstones_to_compact and self.num_tombstones*2 > self.calendar_size+len(self.overflow_heap):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        for index, bucket in enumerate(self.bucket_list):
+            self.bucket_list[index] = [entry for entry in bucket if entry[3] is not None]
+        self.bucket_head_list = [0]*self.num_buckets
+        self.calendar_size = sum(len(bucket) for bucket in self.bucket_list)
+        self.overflow_heap = [entry for entry in self.overflow_heap if entry[3] is not None]
+        heapify(self.overflow_heap)
+        self.num_tombstones = 0
+
+    def _pop_entry(self) -> List:
+        while self.calendar_size > 0:
+            entry = self._pop_head(self._locate())
+            if entry[3] is not None:
+                return entry
+            self.num_tombstones -= 1
+        while self.overflow_heap:
+            entry = heappop(self.overflow_heap)
+            if entry[3] is not None:
+                return entry
+            self.num_tombstones -= 1
+        raise IndexError("Event queue is already empty")
+
+    def pop(self) -> Event:
+        entry = self._pop_entry()
+        event = entry[3]
+        # A popped handle can not be cancelled any more
+        entry[3] = None
+        if self.calendar_size < self.num_buckets//2 and self.num_buckets > self.min_num_buckets:
+            self._resize(max(self.num_buckets//2, self.min_num_buckets))
+        return event
+
+    def peek(self) -> Event:
+        while self.calendar_size > 0:
+            index = self._locate()
+            event = self.bucket_list[index][self.bucket_head_list[index]][3]
+            if event is not None:
+                return event
+            self._pop_head(index)
+            self.num_tombstones -= 1
+        while self.overflow_heap:
+            if self.overflow_heap[0][3] is not None:
+                return self.overflow_heap[0][3]
+            heappop(self.overflow_heap)
+            self.num_tombstones -= 1
+        raise IndexError("Event queue is already empty")
+
+    def is_empty(self) -> bool:
+        return self.get_size() == 0
+
+    def get_size(self) -> int:
+        return self.calendar_size+len(self.overflow_heap)-self.num_tombstones
+
+    def clear(self) -> None:
+        for entry in [entry for bucket in self.bucket_list for entry in bucket]+self.overflow_heap:
+            entry[3] = None
+        self.num_tombstones = 0
+        self.num_buckets = self.min_num_buckets
+        self.bucket_list = [[] for _ in range(self.num_buckets)]
+        self.bucket_head_list = [0]*self.num_buckets
+        self.calendar_size = 0
+        self.overflow_heap = []
+        self.current_virtual_bucket = 0
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from .event_queue import EventQueue
+from heapq import heappush, heappop, heapify
+from typing import TYPE_CHECKING, List
+if TYPE_CHECKING:
+    from ..events import Event
+
+
+class EventQueueHeap(EventQueue):
+    def __init__(self, min_tombstones_to_compact: int = 1024) -> None:
+        """
+        A binary heap event queue built on ```heapq```.
+        Each entry is a list ```[start_time, priority, insertion_seq, event]```,
+        so the ordering is done by C-level sequence comparison instead of
+        a Python comparator. The insertion sequence number is unique,
+        which makes events with the same start time and priority leave
+        the queue in FIFO order and guarantees the event itself is never compared.
+        The entry is also the handle returned by ```push()```, cancelling it
+        clears the event slot (tombstone) in O(1), tombstones are skipped when popped
+        and the heap is rebuilt once they outnumber the live events
+
+        Parameters
+        ----------
+        min_tombstones_to_compact: int
+            Never compact the heap while there are fewer tombstones than this
+        """
+        self.heap = []
+        self.insertion_seq = 0
+        self.num_tombstones = 0
+        self.min_tombstones_to_compact = min_tombstones_to_compact
+
+    def push(self, event: Event) -> List:
+        self.insertion_seq += 1
+        entry = [event.start_time, event.priority, self.insertion_seq, event]
+        heappush(self.heap, entry)
+        return entry
+
+    def cancel(self, handle: List) -> bool:
+        """
+        Cancel a pushed event, return False if it has already been popped or cancelled
+        """
+        if handle[3] is None:
+            return False
+        handle[3] = None
+        self.num_tombstones += 1
+        if self.num_tombstones >= self.min_tombstones_to_compact and self.num_tombstones*2 > len(self.heap):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        self.heap = [entry for entry in self.heap if entry[3] is not None]
+        heapify(self.heap)
+        self.num_tombstones = 0
+
+    def _purge(self) -> None:
+        heap = self.heap
+        while heap and heap[0][3] is None:
+            heappop(heap)
+            self.num_tombstones -= 1
+
+    def pop(self) -> Event:
+        self._purge()
+        if not self.heap:
+            raise IndexError("Event queue is already empty")
+        entry = heappop(self.heap)
+        event = entry[3]
+        # A popped handle can not be cancelled any more
+        entry[3] = None
+        return event
+
+    def peek(self) -> Event:
+        self._purge()
+        if not self.heap:
+            raise IndexError("Event queue is already empty")
+        return self.heap[0][3]
+
+    def is_empty(self) -> bool:
+        return len(self.heap) == self.num_tombstones
+
+    def get_size(self) -> int:
+        return len(self.heap)-self.num_tombstones
+
+    def clear(self) -> None:
+        for entry in self.heap:
+            entry[3] = None
+        self.heap.clear()
+        self.num_tombstones = 0
@@ -1,4 +1,6 @@
 from .pe import Pe
+from .pe_allocator import PeAllocator
 from .ram import RAM
 from .bandwidth import Bandwidth
-from .storage import Storage
\ No newline at end of file
+from .storage import Storage
+from .resource_pool import ResourcePool, ResourceView, RAMView, StorageView, BandwidthView
\ No newline at end of file
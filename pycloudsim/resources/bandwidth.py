@@ -2,10 +2,11 @@
 Bandwidth for Host (physical machine) or Vm
 """
 
-from uuid import uuid1, UUID
+from ..entity.entity_registry import EntityKind, RegisteredEntity
 
 
-class Bandwidth:
+class Bandwidth(RegisteredEntity):
+    kind = EntityKind.BANDWIDTH
 
     def __init__(self, size_capacity: int) -> None:
         """
@@ -16,13 +17,11 @@ class Bandwidth:
         """
         if size_capacity <= 0:
             raise ValueError("Capacity of storage must greater than 0 MB")
-        self.uuid = uuid1()
+        self.key = None
+        self.entity_registry = None
         self.size_capacity = 1.0*size_capacity
         self.size_available = self.size_capacity
 
-    def get_uuid(self) -> UUID:
-        return self.uuid
-
     def allocate(self, amount: float) -> bool:
         if amount < 0:
             raise ValueError("Bandwidth to allocate must no less than 0 Mbps")
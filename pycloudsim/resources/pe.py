@@ -2,11 +2,17 @@
 A Pe (Processing Element) represents a CPU core of a physical machine,
 defined in terms of Millions Instructions Per Second (MIPS) rating.
 """
-from uuid import uuid1, UUID
+from __future__ import annotations
+from ..entity.entity_registry import EntityKind, RegisteredEntity
 from enum import Enum
+from typing import Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .pe_allocator import PeAllocator
 
 
-class Pe:
+class Pe(RegisteredEntity):
+    kind = EntityKind.PE
+
     class State(Enum):
         FREE = 0
         BUSY = 1
@@ -20,35 +26,63 @@ class Pe:
         """
         if mips_capacity <= 0:
             raise ValueError("MIPS capacity of Pe must greater than 0")
-        self.uuid = uuid1()
+        self.key = None
+        self.entity_registry = None
         self.mips_capacity = 1.0*mips_capacity
         self.utilization_rate = 0.0
         self.state = Pe.State.FREE
+        # once the Pe belongs to a Host, its state and utilization are read from the
+        # PeAllocator of the Host, where they are kept up to date
+        self.pe_allocator = None
+        self.pe_index = None
+
+    def attach(self, pe_allocator: PeAllocator, pe_index: int) -> None:
+        """
+        Hand the state of the Pe over to the PeAllocator managing it as Pe ```pe_index```
+        """
+        pe_allocator.add_utilization([pe_index], self.utilization_rate)
+        self.pe_allocator = pe_allocator
+        self.pe_index = pe_index
+
+    def get_pe_allocator(self) -> Optional[PeAllocator]:
+        return self.pe_allocator
 
-    def get_uuid(self) -> UUID:
-        return self.uuid
+    def get_pe_index(self) -> Optional[int]:
+        return self.pe_index
 
     def allocate(self, utilization_rate: float) -> None:
         if utilization_rate <= 0 or utilization_rate > 1:
             raise ValueError("Cloudlet Pe utilization rate must beween 0 and 1")
-        self.utilization_rate += utilization_rate
+        if self.pe_allocator is not None:
+            self.pe_allocator.add_utilization([self.pe_index], utilization_rate)
+        else:
+            self.utilization_rate += utilization_rate
 
     def deallocate(self, utilization_rate: float) -> None:
         if utilization_rate <= 0 or utilization_rate > 1:
             raise ValueError("Cloudlet Pe utilization rate must beween 0 and 1")
-        self.utilization_rate -= utilization_rate
+        if self.pe_allocator is not None:
+            self.pe_allocator.add_utilization([self.pe_index], -utilization_rate)
+        else:
+            self.utilization_rate -= utilization_rate
 
     def get_mips_capacity(self) -> float:
         return self.mips_capacity
 
     def get_utilization_rate_allocated(self) -> float:
+        if self.pe_allocator is not None:
+            return float(self.pe_allocator.get_utilization_array()[self.pe_index])
         return self.utilization_rate
 
     def get_utilization_rate_available(self) -> float:
-        return 1-self.utilization_rate
+        return 1-self.get_utilization_rate_allocated()
 
     def get_state(self) -> State:
+        if self.pe_allocator is not None:
+            return Pe.State.FREE if self.pe_allocator.is_free(self.pe_index) else Pe.State.BUSY
         return self.state
 
     def set_state(self, state: State) -> None:
+        if self.pe_allocator is not None:
+            raise RuntimeError("State of a Pe of a Host is managed by the PeAllocator of the Host")
         self.state = state
@@ -0,0 +1,100 @@
+"""
+Integer-indexed allocation of the Pes of a Host or Vm
+"""
+from __future__ import annotations
+import numpy as np
+from typing import List
+
+
+class PeAllocator:
+    def __init__(self, num_pes: int) -> None:
+        """
+        Pes are numbered 0..num_pes-1, free Pes are the set bits of an integer bitmap,
+        so allocating or releasing k Pes costs O(k) and the lowest free Pes are handed out first.
+        The busy flag and the allocated utilization rate of every Pe are mirrored into NumPy
+        arrays, either owned by the allocator or a slice of Datacenter-wide arrays
+        (see ```attach```), so utilization can be queried for all Pes at once
+
+        Parameters
+        ----------
+        num_pes: int
+            Number of Pes managed
+        """
+        if num_pes < 0:
+            raise ValueError("Number of Pes must no less than 0")
+        self.num_pes = num_pes
+        self.free_bitmap = (1 << num_pes)-1
+        self.num_pes_free = num_pes
+        # the mirror arrays and the position of Pe 0 in them, an array and an offset instead of
+        # a view, so that the arrays stay shared with the Datacenter through pickle and deepcopy
+        self.busy_array = np.zeros(num_pes, dtype=bool)
+        self.utilization_array = np.zeros(num_pes, dtype=np.float64)
+        self.offset = 0
+
+    def attach(self, busy_array: np.ndarray, utilization_array: np.ndarray, offset: int) -> None:
+        """
+        Move the mirror of the Pe state to ```[offset, offset+num_pes)``` of shared arrays
+        """
+        busy_array[offset:offset+self.num_pes] = self.busy_array[self.offset:self.offset+self.num_pes]
+        utilization_array[offset:offset+self.num_pes] = self.utilization_array[self.offset:self.offset+self.num_pes]
+        self.busy_array = busy_array
+        self.utilization_array = utilization_array
+        self.offset = offset
+
+    def allocate(self, num_pes: int) -> List[int]:
+        """
+        Mark the ```num_pes``` lowest free Pes busy and return their indices
+        """
+        if num_pes > self.num_pes_free:
+            raise RuntimeError("Allocate %d Pes exceeds %d available Pes" % (num_pes, self.num_pes_free))
+        free_bitmap = self.free_bitmap
+        index_list = []
+        for _ in range(num_pes):
+            lowest_bit = free_bitmap & -free_bitmap
+            index_list.append(lowest_bit.bit_length()-1)
+            free_bitmap ^= lowest_bit
+        self.free_bitmap = free_bitmap
+        self.num_pes_free -= num_pes
+        offset = self.offset
+        for index in index_list:
+            self.busy_array[offset+index] = True
+        return index_list
+
+    def release(self, index_list: List[int]) -> None:
+        offset = self.offset
+        for index in index_list:
+            bit = 1 << index
+            if self.free_bitmap & bit:
+                raise RuntimeError("Pe %d is not allocated" % index)
+            self.free_bitmap |= bit
+            self.busy_array[offset+index] = False
+        self.num_pes_free += len(index_list)
+
+    def add_utilization(self, index_list: List[int], utilization_rate: float) -> None:
+        """
+        Add (or with a negative rate, remove) an utilization rate on the given Pes
+        """
+        offset = self.offset
+        for index in index_list:
+            self.utilization_array[offset+index] += utilization_rate
+
+    def is_free(self, index: int) -> bool:
+        return bool(self.free_bitmap >> index & 1)
+
+    def get_num_pes(self) -> int:
+        return self.num_pes
+
+    def get_num_pes_free(self) -> int:
+        return self.num_pes_free
+
+    def get_busy_array(self) -> np.ndarray:
+        """
+        Busy flags of the managed Pes, a view into the mirror array
+        """
+        return self.busy_array[self.offset:self.offset+self.num_pes]
+
+    def get_utilization_array(self) -> np.ndarray:
+        """
+        Allocated utilization rates of the managed Pes, a view into the mirror array
+        """
+        return self.utilization_array[self.offset:self.offset+self.num_pes]
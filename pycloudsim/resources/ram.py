@@ -1,10 +1,12 @@
 """
 RAM for Host (physical machine) or Vm
 """
-from uuid import uuid1, UUID
+from ..entity.entity_registry import EntityKind, RegisteredEntity
 
 
-class RAM:
+class RAM(RegisteredEntity):
+    kind = EntityKind.RAM
+
     def __init__(self, size_capacity: int) -> None:
         """
         Parameters
@@ -14,13 +16,11 @@ class RAM:
         """
         if size_capacity <= 0:
             raise ValueError("Capacity of RAM must greater than 0 MB")
-        self.uuid = uuid1()
+        self.key = None
+        self.entity_registry = None
         self.size_capacity = 1.0*size_capacity
         self.size_available = self.size_capacity
 
-    def get_uuid(self) -> UUID:
-        return self.uuid
-
     def allocate(self, amount: float) -> None:
         if amount < 0:
             raise ValueError("RAM to allocate must no less than 0 MB")
@@ -0,0 +1,191 @@
+"""
+Struct-of-arrays storage of the RAM, storage and bandwidth of Hosts and Vms
+"""
+from __future__ import annotations
+from uuid import UUID
+from ..entity.entity_registry import EntityKind, EntityRegistry, RegisteredEntity
+import numpy as np
+from typing import List, Optional, Tuple
+
+# columns of a ResourcePool
+RAM_COLUMN, STORAGE_COLUMN, BANDWIDTH_COLUMN = range(3)
+NUM_RESOURCE_COLUMNS = 3
+
+
+class ResourcePool:
+    def __init__(self, initial_capacity: int = 64) -> None:
+        """
+        Capacity and available size of RAM, storage and bandwidth in NumPy columns,
+        one row per owner (a Host or a running Vm). Rows of released owners are reused.
+        Owners hold thin views (RAMView, StorageView, BandwidthView) on their row instead
+        of one RAM, Storage and Bandwidth object each
+
+        Parameters
+        ----------
+        initial_capacity: int
+            Number of rows allocated up front, the columns double when full
+        """
+        initial_capacity = max(initial_capacity, 1)
+        self.capacity_column_list = [np.zeros(initial_capacity) for _ in range(NUM_RESOURCE_COLUMNS)]
+        self.available_column_list = [np.zeros(initial_capacity) for _ in range(NUM_RESOURCE_COLUMNS)]
+        self.num_rows = 0
+        self.free_row_list: List[int] = []
+
+    def _grow(self) -> None:
+        for column_list in [self.capacity_column_list, self.available_column_list]:
+            for column in range(NUM_RESOURCE_COLUMNS):
+                array = np.zeros(2*len(column_list[column]))
+                array[:self.num_rows] = column_list[column][:self.num_rows]
+                column_list[column] = array
+
+    def allocate_row(self, size_ram: float, size_storage: float, size_bandwidth: float) -> int:
+        """
+        A row with the given capacities, all available
+        """
+        if size_ram <= 0:
+            raise ValueError("Capacity of RAM must greater than 0 MB")
+        if size_storage <= 0:
+            raise ValueError("Capacity of storage must greater than 0 MB")
+        if size_bandwidth <= 0:
+            raise ValueError("Capacity of bandwidth must greater than 0 Mbps")
+        if len(self.free_row_list) > 0:
+            row = self.free_row_list.pop()
+        else:
+            if self.num_rows == len(self.capacity_column_list[0]):
+                self._grow()
+            row = self.num_rows
+            self.num_rows += 1
+        for column, size in enumerate((size_ram, size_storage, size_bandwidth)):
+            self.capacity_column_list[column][row] = size
+            self.available_column_list[column][row] = size
+        return row
+
+    def free_row(self, row: int) -> None:
+        for column in range(NUM_RESOURCE_COLUMNS):
+            self.capacity_column_list[column][row] = 0.0
+            self.available_column_list[column][row] = 0.0
+        self.free_row_list.append(row)
+
+    def get_size_capacity(self, row: int, column: int) -> float:
+        return self.capacity_column_list[column].item(row)
+
+    def get_size_available(self, row: int, column: int) -> float:
+        return self.available_column_list[column].item(row)
+
+    def set_size_available(self, row: int, column: int, size_available: float) -> None:
+        self.available_column_list[column][row] = size_available
+
+    def get_size_used_row(self, row: int) -> Tuple[float, float, float]:
+        """
+        RAM, storage and bandwidth in use of a row
+        """
+        capacity_column_list, available_column_list = self.capacity_column_list, self.available_column_list
+        return (
+            capacity_column_list[RAM_COLUMN].item(row)-available_column_list[RAM_COLUMN].item(row),
+            capacity_column_list[STORAGE_COLUMN].item(row)-available_column_list[STORAGE_COLUMN].item(row),
+            capacity_column_list[BANDWIDTH_COLUMN].item(row)-available_column_list[BANDWIDTH_COLUMN].item(row)
+        )
+
+    def get_capacity_array(self, column: int) -> np.ndarray:
+        """
+        Capacity of every row in use or free (0 for free rows), a view valid until the pool grows
+        """
+        return self.capacity_column_list[column][:self.num_rows]
+
+    def get_available_array(self, column: int) -> np.ndarray:
+        return self.available_column_list[column][:self.num_rows]
+
+    def get_utilization_array(self, column: int) -> np.ndarray:
+        capacity_array = self.get_capacity_array(column)
+        return np.divide(capacity_array-self.get_available_array(column), capacity_array, out=np.zeros(self.num_rows), where=capacity_array > 0)
+
+    def get_num_rows_in_use(self) -> int:
+        return self.num_rows-len(self.free_row_list)
+
+
+class ResourceView(RegisteredEntity):
+    """
+    One resource of one row of a ResourcePool, with the API of RAM, Storage and Bandwidth
+    """
+    __slots__ = ("pool", "row", "key", "entity_registry")
+    column = None
+    kind = None
+    name = None
+    unit = None
+
+    def __init__(self, pool: ResourcePool, row: int) -> None:
+        self.pool = pool
+        self.row = row
+        self.key = None
+        self.entity_registry = None
+
+    def bind_key(self, entity_registry: EntityRegistry) -> None:
+        # most views are never asked for a key, only take one when it is
+        self.entity_registry = entity_registry
+        self.key = None
+
+    def get_key(self) -> Optional[int]:
+        if self.key is None and self.entity_registry is not None:
+            self.key = self.entity_registry.next_key(self.kind)
+        return self.key
+
+    def get_uuid(self) -> UUID:
+        self.get_key()
+        return super().get_uuid()
+
+    def get_pool(self) -> ResourcePool:
+        return self.pool
+
+    def get_row(self) -> int:
+        return self.row
+
+    def move(self, pool: ResourcePool, row: int) -> None:
+        self.pool = pool
+        self.row = row
+
+    def allocate(self, amount: float) -> None:
+        if amount < 0:
+            raise ValueError("%s to allocate must no less than 0 %s" % (self.name, self.unit))
+        size_available = self.pool.get_size_available(self.row, self.column)
+        if size_available < amount:
+            raise RuntimeError("Allocate amount exceeds available %s size" % self.name)
+        self.pool.set_size_available(self.row, self.column, size_available-amount)
+
+    def dealloate(self, amount: float) -> None:
+        if amount < 0:
+            raise ValueError("%s to deallocate must no less than 0 %s" % (self.name, self.unit))
+        self.pool.set_size_available(self.row, self.column, self.pool.get_size_available(self.row, self.column)+amount)
+
+    def get_size_capacity(self) -> float:
+        return self.pool.get_size_capacity(self.row, self.column)
+
+    def get_size_available(self) -> float:
+        return self.pool.get_size_available(self.row, self.column)
+
+    def get_utilization_rate(self) -> float:
+        size_capacity = self.get_size_capacity()
+        return (size_capacity-self.get_size_available())/size_capacity
+
+
+class RAMView(ResourceView):
+    __slots__ = ()
+    column = RAM_COLUMN
+    kind = EntityKind.RAM
+    name = "RAM"
+    unit = "MB"
+
+
+class StorageView(ResourceView):
+    __slots__ = ()
+    column = STORAGE_COLUMN
+    kind = EntityKind.STORAGE
+    name = "Storage"
+    unit = "MB"
+
+
+class BandwidthView(ResourceView):
+    __slots__ = ()
+    column = BANDWIDTH_COLUMN
+    kind = EntityKind.BANDWIDTH
+    name = "Bandwidth"
+    unit = "Mbps"
@@ -1,10 +1,12 @@
 """
 Storage for Host (physical machine) or Vm
 """
-from uuid import uuid1, UUID
+from ..entity.entity_registry import EntityKind, RegisteredEntity
 
 
-class Storage:
+class Storage(RegisteredEntity):
+    kind = EntityKind.STORAGE
+
 
     def __init__(self, size_capacity: int) -> None:
         """
@@ -15,13 +17,11 @@ class Storage:
         """
         if size_capacity <= 0:
             raise ValueError("Capacity of storage must greater than 0 MB")
-        self.uuid = uuid1()
+        self.key = None
+        self.entity_registry = None
         self.size_capacity = 1.0*size_capacity
         self.size_available = self.size_capacity
 
-    def get_uuid(self) -> UUID:
-        return self.uuid
-
     def allocate(self, amount: float) -> None:
         if amount < 0:
             raise ValueError("Storage to allocate must no less than 0 MB")
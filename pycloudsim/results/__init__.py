@@ -0,0 +1,6 @@
+from .result_sink import ResultSink
+from .result_sink_memory import ResultSinkMemory
+from .chunked_result_sink import ChunkedResultSink
+from .result_sink_csv import ResultSinkCsv
+from .result_sink_json_lines import ResultSinkJsonLines
+from .result_sink_parquet import ResultSinkParquet
\ No newline at end of file
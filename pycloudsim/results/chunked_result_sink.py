@@ -0,0 +1,78 @@
+from __future__ import annotations
+from .result_sink import ResultSink
+from .records import CLOUDLET_RECORD_DTYPE, VM_RECORD_DTYPE, cloudlet_to_record, vm_to_record
+from typing import List, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import Cloudlet
+    from ..datacenters import Datacenter
+    from ..vms import Vm
+
+CLOUDLET_FIELD_NAME_LIST = list(CLOUDLET_RECORD_DTYPE.names)
+VM_FIELD_NAME_LIST = list(VM_RECORD_DTYPE.names)
+CLOUDLET_STATE_FIELD = CLOUDLET_FIELD_NAME_LIST.index("state")
+VM_STATE_FIELD = VM_FIELD_NAME_LIST.index("state")
+
+
+class ChunkedResultSink(ResultSink):
+    def __init__(self, chunk_size: int = 65536) -> None:
+        """
+        Base of the streaming sinks: finished entities are turned into records of the
+        schema in ```records``` (states by name), and only the records
+        are buffered. Every ```chunk_size``` records of a kind are written out in one go,
+        so memory stays flat however long the simulation runs. The last partial chunk is
+        written when ```Simulator.run``` returns, whether the simulation terminated, paused
+        or stopped at ```until_time``` or ```max_events```, so the files are complete between runs.
+        Files are opened for each chunk, so a sink is pickled with a checkpoint like the
+        rest of the simulation together with the size of its output at that point,
+        restoring the checkpoint truncates the output back to it before the run resumes.
+        ```Simulator.fork``` requires a sink of its own for the child
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must greater than 0")
+        self.chunk_size = chunk_size
+        self.cloudlet_record_list: List[list] = []
+        self.vm_record_list: List[list] = []
+        self.num_cloudlets_written = 0
+        self.num_vms_written = 0
+
+    def write_cloudlet(self, datacenter: Datacenter, cloudlet: Cloudlet) -> None:
+        record = list(cloudlet_to_record(cloudlet))
+        record[CLOUDLET_STATE_FIELD] = cloudlet.get_state().name
+        self.cloudlet_record_list.append(record)
+        if len(self.cloudlet_record_list) >= self.chunk_size:
+            self._flush_cloudlets()
+
+    def write_vm(self, datacenter: Datacenter, vm: Vm) -> None:
+        record = list(vm_to_record(vm))
+        record[VM_STATE_FIELD] = vm.get_state().name
+        self.vm_record_list.append(record)
+        if len(self.vm_record_list) >= self.chunk_size:
+            self._flush_vms()
+
+    def _flush_cloudlets(self) -> None:
+        if len(self.cloudlet_record_list) > 0:
+            self.write_chunk("cloudlet", CLOUDLET_FIELD_NAME_LIST, self.cloudlet_record_list)
+            self.num_cloudlets_written += len(self.cloudlet_record_list)
+            self.cloudlet_record_list = []
+
+    def _flush_vms(self) -> None:
+        if len(self.vm_record_list) > 0:
+            self.write_chunk("vm", VM_FIELD_NAME_LIST, self.vm_record_list)
+            self.num_vms_written += len(self.vm_record_list)
+            self.vm_record_list = []
+
+    def flush(self) -> None:
+        self._flush_cloudlets()
+        self._flush_vms()
+
+    def write_chunk(self, kind_name: str, field_name_list: List[str], record_list: List[list]) -> None:
+        """
+        Append records of one kind, ```cloudlet``` or ```vm```, to the output
+        """
+        pass
+
+    def get_num_cloudlets_written(self) -> int:
+        return self.num_cloudlets_written
+
+    def get_num_vms_written(self) -> int:
+        return self.num_vms_written
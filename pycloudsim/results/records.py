@@ -0,0 +1,88 @@
+"""
+Record schema of finished Cloudlets and Vms.
+
+A record is a flat tuple of the fields of an entity, matching the NumPy structured dtype of
+its kind, references to other entities are stored as keys. Checkpoints store their
+finished-entity tables as arrays of records and the streaming result sinks write records
+"""
+from __future__ import annotations
+from ..cloudlets import Cloudlet
+from ..vms import Vm
+import numpy as np
+from typing import Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..entity import EntityRegistry
+
+# stands for a missing reference (```None```) in key fields
+NULL_KEY = -1
+
+CLOUDLET_RECORD_DTYPE = np.dtype([
+    ("key", "i8"), ("id", "i8"), ("length", "f8"), ("num_pes", "i8"), ("utilization_pe", "f8"),
+    ("required_ram", "f8"), ("required_storage", "f8"), ("required_bandwidth", "f8"),
+    ("state", "i1"), ("start_time", "f8"), ("end_time", "f8"), ("vm_key", "i8"),
+    ("priority", "i8"), ("broker_id", "i8")
+])
+
+VM_RECORD_DTYPE = np.dtype([
+    ("key", "i8"), ("id", "i8"), ("host_mips_factor", "f8"), ("num_pes", "i8"),
+    ("size_ram", "f8"), ("size_storage", "f8"), ("size_bandwidth", "f8"),
+    ("startup_delay", "f8"), ("shudown_delay", "f8"), ("state", "i1"), ("host_key", "i8")
+])
+
+
+def _key_to_record(key: Optional[int]) -> int:
+    return NULL_KEY if key is None else key
+
+
+def _record_to_key(key: int) -> Optional[int]:
+    return None if key == NULL_KEY else key
+
+
+def cloudlet_to_record(cloudlet: Cloudlet) -> tuple:
+    return (cloudlet.key, cloudlet.id, cloudlet.length, cloudlet.num_pes, cloudlet.utilization_pe,
+            cloudlet.required_ram, cloudlet.required_storage, cloudlet.required_bandwidth,
+            cloudlet.state.value, cloudlet.start_time, cloudlet.end_time, _key_to_record(cloudlet.vm_key),
+            cloudlet.priority, cloudlet.broker_id)
+
+
+def record_to_cloudlet(record: np.void, entity_registry: Optional[EntityRegistry] = None) -> Cloudlet:
+    # bypass __init__, the Cloudlet has already been validated and keyed by ```entity_registry```
+    cloudlet = Cloudlet.__new__(Cloudlet)
+    cloudlet.key = int(record["key"])
+    cloudlet.entity_registry = entity_registry
+    cloudlet.id = int(record["id"])
+    cloudlet.length = float(record["length"])
+    cloudlet.num_pes = int(record["num_pes"])
+    cloudlet.utilization_pe = float(record["utilization_pe"])
+    cloudlet.required_ram = float(record["required_ram"])
+    cloudlet.required_storage = float(record["required_storage"])
+    cloudlet.required_bandwidth = float(record["required_bandwidth"])
+    cloudlet.state = Cloudlet.State(int(record["state"]))
+    cloudlet.start_time = float(record["start_time"])
+    cloudlet.end_time = float(record["end_time"])
+    cloudlet.vm_key = _record_to_key(int(record["vm_key"]))
+    cloudlet.priority = int(record["priority"])
+    cloudlet.broker_id = int(record["broker_id"])
+    return cloudlet
+
+
+def vm_to_record(vm: Vm) -> tuple:
+    return (vm.key, vm.id, vm.host_mips_factor, vm.num_pes, vm.size_ram, vm.size_storage, vm.size_bandwidth,
+            vm.startup_delay, vm.shudown_delay, vm.state.value, _key_to_record(vm.host_key))
+
+
+def record_to_vm(record: np.void, entity_registry: Optional[EntityRegistry] = None) -> Vm:
+    vm = Vm.__new__(Vm)
+    vm.key = int(record["key"])
+    vm.entity_registry = entity_registry
+    vm.id = int(record["id"])
+    vm.host_mips_factor = float(record["host_mips_factor"])
+    vm.num_pes = int(record["num_pes"])
+    vm.size_ram = float(record["size_ram"])
+    vm.size_storage = float(record["size_storage"])
+    vm.size_bandwidth = float(record["size_bandwidth"])
+    vm.startup_delay = float(record["startup_delay"])
+    vm.shudown_delay = float(record["shudown_delay"])
+    vm.state = Vm.State(int(record["state"]))
+    vm.host_key = _record_to_key(int(record["host_key"]))
+    return vm
@@ -0,0 +1,31 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import Cloudlet
+    from ..datacenters import Datacenter
+    from ..vms import Vm
+
+
+class ResultSink:
+    """
+    A ResultSink receives every Cloudlet and Vm of a Datacenter once it is finished
+    (succeeded, failed, canceled or destroyed), see ```Datacenter.set_result_sink```
+    """
+    def write_cloudlet(self, datacenter: Datacenter, cloudlet: Cloudlet) -> None:
+        pass
+
+    def write_vm(self, datacenter: Datacenter, vm: Vm) -> None:
+        pass
+
+    def flush(self) -> None:
+        """
+        Write out everything buffered, called every time ```Simulator.run``` returns
+        """
+        pass
+
+    def rewind(self) -> None:
+        """
+        Drop the output written after the sink was pickled with a checkpoint,
+        called when the checkpoint is restored
+        """
+        pass
@@ -0,0 +1,50 @@
+from __future__ import annotations
+from .chunked_result_sink import ChunkedResultSink
+import csv
+import os
+from typing import List
+
+
+class ResultSinkCsv(ChunkedResultSink):
+    def __init__(self, directory: str, chunk_size: int = 65536) -> None:
+        """
+        Append finished Cloudlets to ```cloudlets.csv``` and finished Vms to ```vms.csv```
+        in ```directory```, each with a header row
+
+        Parameters
+        ----------
+        directory: str
+            Output directory, existing files are overwritten
+        chunk_size: int
+            Records of a kind buffered before they are written
+        """
+        super().__init__(chunk_size)
+        os.makedirs(directory, exist_ok=True)
+        self.path_dict = {"cloudlet": os.path.join(directory, "cloudlets.csv"), "vm": os.path.join(directory, "vms.csv")}
+        for path in self.path_dict.values():
+            if os.path.exists(path):
+                os.remove(path)
+        # bytes written to every file, what a restored checkpoint truncates the file to
+        self.file_size_dict = {"cloudlet": 0, "vm": 0}
+
+    def write_chunk(self, kind_name: str, field_name_list: List[str], record_list: List[list]) -> None:
+        path = self.path_dict[kind_name]
+        is_new = not os.path.exists(path)
+        with open(path, "a", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            if is_new:
+                writer.writerow(field_name_list)
+            writer.writerows(record_list)
+            self.file_size_dict[kind_name] = csv_file.tell()
+
+    def rewind(self) -> None:
+        for kind_name, path in self.path_dict.items():
+            file_size = self.file_size_dict[kind_name]
+            if file_size == 0:
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                os.truncate(path, file_size)
+
+    def get_path(self, kind_name: str) -> str:
+        return self.path_dict[kind_name]
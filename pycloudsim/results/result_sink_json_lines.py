@@ -0,0 +1,45 @@
+from __future__ import annotations
+from .chunked_result_sink import ChunkedResultSink
+import json
+import os
+from typing import List
+
+
+class ResultSinkJsonLines(ChunkedResultSink):
+    def __init__(self, directory: str, chunk_size: int = 65536) -> None:
+        """
+        Append finished Cloudlets to ```cloudlets.jsonl``` and finished Vms to ```vms.jsonl```
+        in ```directory```, one JSON object per line
+
+        Parameters
+        ----------
+        directory: str
+            Output directory, existing files are overwritten
+        chunk_size: int
+            Records of a kind buffered before they are written
+        """
+        super().__init__(chunk_size)
+        os.makedirs(directory, exist_ok=True)
+        self.path_dict = {"cloudlet": os.path.join(directory, "cloudlets.jsonl"), "vm": os.path.join(directory, "vms.jsonl")}
+        for path in self.path_dict.values():
+            if os.path.exists(path):
+                os.remove(path)
+        # bytes written to every file, what a restored checkpoint truncates the file to
+        self.file_size_dict = {"cloudlet": 0, "vm": 0}
+
+    def write_chunk(self, kind_name: str, field_name_list: List[str], record_list: List[list]) -> None:
+        with open(self.path_dict[kind_name], "a") as json_lines_file:
+            json_lines_file.writelines(json.dumps(dict(zip(field_name_list, record)))+"\n" for record in record_list)
+            self.file_size_dict[kind_name] = json_lines_file.tell()
+
+    def rewind(self) -> None:
+        for kind_name, path in self.path_dict.items():
+            file_size = self.file_size_dict[kind_name]
+            if file_size == 0:
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                os.truncate(path, file_size)
+
+    def get_path(self, kind_name: str) -> str:
+        return self.path_dict[kind_name]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+from .result_sink import ResultSink
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import Cloudlet
+    from ..datacenters import Datacenter
+    from ..vms import Vm
+
+
+class ResultSinkMemory(ResultSink):
+    def __init__(self) -> None:
+        """
+        Keep the finished Cloudlets and Vms in ```Datacenter.cloudlet_end_of_life_dict```
+        and ```Datacenter.vm_end_of_life_dict```, keyed by entity key. The default sink
+        """
+        super().__init__()
+
+    def write_cloudlet(self, datacenter: Datacenter, cloudlet: Cloudlet) -> None:
+        datacenter.cloudlet_end_of_life_dict[cloudlet.get_key()] = cloudlet
+
+    def write_vm(self, datacenter: Datacenter, vm: Vm) -> None:
+        datacenter.vm_end_of_life_dict[vm.get_key()] = vm
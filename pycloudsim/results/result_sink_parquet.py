@@ -0,0 +1,52 @@
+from __future__ import annotations
+from .chunked_result_sink import ChunkedResultSink
+import os
+from typing import List
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class ResultSinkParquet(ChunkedResultSink):
+    def __init__(self, directory: str, chunk_size: int = 65536) -> None:
+        """
+        Write every chunk as one Parquet file, ```cloudlets/part-00000.parquet```, ...
+        and ```vms/part-00000.parquet```, ... in ```directory```, each kind a dataset
+        readable with ```pyarrow.parquet.read_table```. Requires pyarrow
+
+        Parameters
+        ----------
+        directory: str
+            Output directory, existing parts are overwritten
+        chunk_size: int
+            Records of a kind per Parquet file
+        """
+        if pyarrow is None:
+            raise ImportError("ResultSinkParquet requires pyarrow, install it with pip install pyarrow")
+        super().__init__(chunk_size)
+        self.directory_dict = {"cloudlet": os.path.join(directory, "cloudlets"), "vm": os.path.join(directory, "vms")}
+        for kind_directory in self.directory_dict.values():
+            os.makedirs(kind_directory, exist_ok=True)
+            for file_name in os.listdir(kind_directory):
+                if file_name.startswith("part-") and file_name.endswith(".parquet"):
+                    os.remove(os.path.join(kind_directory, file_name))
+        self.num_parts_dict = {"cloudlet": 0, "vm": 0}
+
+    def write_chunk(self, kind_name: str, field_name_list: List[str], record_list: List[list]) -> None:
+        column_list = [list(column) for column in zip(*record_list)]
+        table = pyarrow.table(dict(zip(field_name_list, column_list)))
+        path = os.path.join(self.directory_dict[kind_name], "part-%05d.parquet" % self.num_parts_dict[kind_name])
+        pyarrow.parquet.write_table(table, path)
+        self.num_parts_dict[kind_name] += 1
+
+    def rewind(self) -> None:
+        # parts numbered from ```num_parts_dict``` on were written after the checkpoint
+        for kind_name, kind_directory in self.directory_dict.items():
+            for file_name in os.listdir(kind_directory):
+                if file_name.startswith("part-") and file_name.endswith(".parquet") and int(file_name[len("part-"):-len(".parquet")]) >= self.num_parts_dict[kind_name]:
+                    os.remove(os.path.join(kind_directory, file_name))
+
+    def get_directory(self, kind_name: str) -> str:
+        return self.directory_dict[kind_name]
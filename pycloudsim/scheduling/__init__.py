@@ -0,0 +1,8 @@
+from .cloudlet_scheduler import CloudletScheduler
+from .cloudlet_scheduler_fifo import CloudletSchedulerFifo
+from .cloudlet_scheduler_first_fit_skip import CloudletSchedulerFirstFitSkip
+from .cloudlet_scheduler_easy_backfilling import CloudletSchedulerEasyBackfilling
+from .cloudlet_scheduler_conservative_backfilling import CloudletSchedulerConservativeBackfilling
+from .cloudlet_scheduler_fair_share import CloudletSchedulerFairShare
+from .cloudlet_waiting_queue import CloudletWaitingQueue
+from .availability_profile import AvailabilityProfile
\ No newline at end of file
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from bisect import bisect_right
+import math
+from typing import List, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..datacenters import Datacenter
+    from ..vms import VmRunning
+
+
+class AvailabilityProfile:
+    def __init__(self, start_time: float, num_pes_free: int, release_list: List[Tuple[float, int]]) -> None:
+        """
+        Free Pes of a Vm over time as a step function, built from the predicted finish
+        times of its running Cloudlets, reservations of waiting Cloudlets are carved out of it.
+        Only Pes are tracked, RAM, storage and bandwidth are not reserved
+
+        Parameters
+        ----------
+        start_time: float
+            Current simulation time
+        num_pes_free: int
+            Free Pes of the Vm at ```start_time```
+        release_list: List[Tuple[float, int]]
+            (predicted finish time, num Pes) of the running Cloudlets
+        """
+        self.time_list = [start_time]
+        self.num_pes_free_list = [num_pes_free]
+        for finish_time, num_pes in sorted(release_list):
+            finish_time = max(finish_time, start_time)
+            if finish_time == self.time_list[-1]:
+                self.num_pes_free_list[-1] += num_pes
+            else:
+                self.time_list.append(finish_time)
+                self.num_pes_free_list.append(self.num_pes_free_list[-1]+num_pes)
+
+    def get_num_pes_free_at(self, time: float) -> int:
+        return self.num_pes_free_list[max(0, bisect_right(self.time_list, time)-1)]
+
+    def find_earliest_start(self, num_pes: int, duration: float, after: float = -math.inf) -> float:
+        """
+        The earliest breakpoint later than ```after``` from which ```num_pes``` Pes stay free
+        for ```duration```, ```inf``` if there is none
+        """
+        time_list = self.time_list
+        num_pes_free_list = self.num_pes_free_list
+        num_breakpoints = len(time_list)
+        for start in range(bisect_right(time_list, after), num_breakpoints):
+            if num_pes_free_list[start] < num_pes:
+                continue
+            end_time = time_list[start]+duration
+            end = start+1
+            while end < num_breakpoints and time_list[end] < end_time and num_pes_free_list[end] >= num_pes:
+                end += 1
+            if end == num_breakpoints or time_list[end] >= end_time:
+                return time_list[start]
+        return math.inf
+
+    def _split(self, time: float) -> int:
+        position = bisect_right(self.time_list, time)-1
+        if self.time_list[position] == time:
+            return position
+        self.time_list.insert(position+1, time)
+        self.num_pes_free_list.insert(position+1, self.num_pes_free_list[position])
+        return position+1
+
+    def reserve(self, start_time: float, end_time: float, num_pes: int) -> None:
+        start = self._split(start_time)
+        end = self._split(end_time)
+        for position in range(start, end):
+            self.num_pes_free_list[position] -= num_pes
+
+
+def build_availability_profile(datacenter: Datacenter, vm_running: VmRunning, clock: float) -> AvailabilityProfile:
+    release_list = [
+        (cloudlet_running.get_start_time()+datacenter.predict_exec_time(cloudlet_running, vm_running), cloudlet_running.get_num_pes())
+        for cloudlet_running in vm_running.get_cloudlet_running_dict().values()
+    ]
+    return AvailabilityProfile(clock, vm_running.get_num_pes_available(), release_list)
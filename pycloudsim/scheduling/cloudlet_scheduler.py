@@ -0,0 +1,36 @@
+from __future__ import annotations
+from ..logger import LogMessage, is_log_enabled, log_message
+import logging
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from typing import List
+    from ..cloudlets import Cloudlet
+    from ..datacenters import Datacenter
+
+
+class CloudletScheduler:
+    """
+    A Cloudlet scheduler owns the waiting queue of a Datacenter and decides, on every
+    CLOUDLET_BIND event, which waiting Cloudlets to start through ```Datacenter.try_to_bind```
+    """
+    def submit(self, cloudlet: Cloudlet) -> None:
+        pass
+
+    def schedule(self, datacenter: Datacenter) -> None:
+        pass
+
+    def drain(self) -> List[Cloudlet]:
+        """
+        Remove and return all the waiting Cloudlets in submission order
+        """
+        pass
+
+    def get_waiting_list(self) -> List[Cloudlet]:
+        pass
+
+    def get_size(self) -> int:
+        pass
+
+    def warn_cloudlet_delayed(self, datacenter: Datacenter, cloudlet: Cloudlet) -> None:
+        if is_log_enabled(logging.WARNING):
+            log_message(LogMessage.CLOUDLET_NO_SUITABLE_VM, datacenter.get_simulator().get_global_clock(), cloudlet.get_id())
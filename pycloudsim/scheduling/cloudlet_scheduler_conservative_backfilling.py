@@ -0,0 +1,117 @@
+from __future__ import annotations
+from .cloudlet_scheduler import CloudletScheduler
+from .cloudlet_waiting_queue import CloudletWaitingQueue
+from .availability_profile import build_availability_profile
+import heapq
+import math
+from typing import List, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import Cloudlet
+    from ..datacenters import Datacenter
+    from ..vms import VmRunning
+
+
+class CloudletSchedulerConservativeBackfilling(CloudletScheduler):
+    def __init__(self, backfill_depth: int = 100) -> None:
+        """
+        Conservative backfilling: every waiting Cloudlet, in submission order, gets a reservation
+        at the earliest time a Vm can run it without delaying the reservations of older Cloudlets,
+        the ones whose reservation is now are started on the reserved Vm.
+        Reservations only account for Pes, a Cloudlet whose RAM, storage or bandwidth does not fit
+        now reserves its Vm as a whole from the next time the Vm is predicted to be idle.
+        Reservations are rebuilt on every pass from the predicted exec times,
+        so Cloudlets finishing early are taken into account. The pass walks the waiting queue
+        bucket by bucket of resource demand, a bucket no Vm is large enough for is skipped at once
+
+        Parameters
+        ----------
+        backfill_depth: int
+            Number of oldest waiting Cloudlets that get a reservation in one pass,
+            younger Cloudlets wait for the next pass
+        """
+        super().__init__()
+        self.backfill_depth = backfill_depth
+        self.cloudlet_waiting_queue = CloudletWaitingQueue()
+
+    def submit(self, cloudlet: Cloudlet) -> None:
+        self.cloudlet_waiting_queue.push(cloudlet)
+
+    @staticmethod
+    def is_vm_large_enough(vm_running: VmRunning, cloudlet: Cloudlet) -> bool:
+        """
+        Whether the Cloudlet fits on the Vm once no other Cloudlet runs on it
+        """
+        return (
+            cloudlet.get_num_pes() <= vm_running.get_num_pes() and
+            cloudlet.get_required_ram() <= vm_running.get_size_ram() and
+            cloudlet.get_required_storage() <= vm_running.get_size_storage() and
+            cloudlet.get_required_bandwidth() <= vm_running.get_size_bandwidth()
+        )
+
+    def schedule(self, datacenter: Datacenter) -> None:
+        cloudlet_waiting_queue = self.cloudlet_waiting_queue
+        if cloudlet_waiting_queue.get_size() == 0:
+            return
+        clock = datacenter.get_simulator().get_global_clock()
+        # most free Pes first, the Vm VmPlacementMaxFit would pick among the ones able to start now
+        vm_running_list = list(datacenter.get_vm_capacity_index().iter_candidates(0))
+        availability_profile_dict = {}
+        # the Vms large enough for a demand, the same for a whole bucket
+        eligible_vm_running_list_dict = {}
+        first_delayed_cloudlet = None
+        # walking the bucket heads in submission order visits the Cloudlets in submission order
+        head_heap = cloudlet_waiting_queue.build_head_heap()
+        num_examined = 0
+        while len(head_heap) > 0 and num_examined < self.backfill_depth:
+            _, key, position = heapq.heappop(head_heap)
+            _, cloudlet = cloudlet_waiting_queue.get_entry(key, position)
+            num_examined += 1
+            best_start_time, best_vm_running, best_exec_time, best_num_pes = math.inf, None, 0.0, key[0]
+            is_started = False
+            eligible_vm_running_list = eligible_vm_running_list_dict.get(key)
+            if eligible_vm_running_list is None:
+                eligible_vm_running_list = [vm_running for vm_running in vm_running_list if CloudletSchedulerConservativeBackfilling.is_vm_large_enough(vm_running, cloudlet)]
+                eligible_vm_running_list_dict[key] = eligible_vm_running_list
+            for vm_running in eligible_vm_running_list:
+                availability_profile = availability_profile_dict.get(vm_running.get_key())
+                if availability_profile is None:
+                    availability_profile = build_availability_profile(datacenter, vm_running, clock)
+                    availability_profile_dict[vm_running.get_key()] = availability_profile
+                exec_time = datacenter.predict_exec_time(cloudlet, vm_running)
+                num_pes = key[0]
+                start_time = availability_profile.find_earliest_start(num_pes, exec_time)
+                if start_time <= clock:
+                    if datacenter.try_to_bind(cloudlet, vm_running) is not None:
+                        availability_profile.reserve(clock, clock+exec_time, num_pes)
+                        is_started = True
+                        break
+                    # RAM, storage or bandwidth do not fit now and profiles only track Pes. They do
+                    # fit once the Vm is idle, hold the whole Vm from then on, so younger Cloudlets
+                    # can not keep taking them and starve this one
+                    num_pes = vm_running.get_num_pes()
+                    start_time = availability_profile.find_earliest_start(num_pes, exec_time, clock)
+                if start_time < best_start_time:
+                    best_start_time, best_vm_running, best_exec_time, best_num_pes = start_time, vm_running, exec_time, num_pes
+            if is_started:
+                cloudlet_waiting_queue.remove(key, position)
+            else:
+                first_delayed_cloudlet = first_delayed_cloudlet or cloudlet
+                if best_vm_running is None:
+                    # no eligible Vm is large enough for the demand of the whole bucket, wait for more Vms
+                    continue
+                availability_profile_dict[best_vm_running.get_key()].reserve(best_start_time, best_start_time+best_exec_time, best_num_pes)
+                position += 1
+            entry = cloudlet_waiting_queue.get_entry(key, position)
+            if entry is not None:
+                heapq.heappush(head_heap, (entry[0], key, position))
+        if first_delayed_cloudlet is not None:
+            self.warn_cloudlet_delayed(datacenter, first_delayed_cloudlet)
+
+    def drain(self) -> List[Cloudlet]:
+        return self.cloudlet_waiting_queue.clear()
+
+    def get_waiting_list(self) -> List[Cloudlet]:
+        return [cloudlet for _, cloudlet in self.cloudlet_waiting_queue]
+
+    def get_size(self) -> int:
+        return self.cloudlet_waiting_queue.get_size()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+from .cloudlet_scheduler import CloudletScheduler
+from .cloudlet_waiting_queue import CloudletWaitingQueue
+from .availability_profile import build_availability_profile
+import heapq
+import math
+from typing import List, Optional, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import Cloudlet, CloudletRunning
+    from ..datacenters import Datacenter
+    from ..vms import VmRunning
+
+
+class CloudletSchedulerEasyBackfilling(CloudletScheduler):
+    def __init__(self, backfill_depth: int = 100) -> None:
+        """
+        EASY backfilling: Cloudlets start in submission order until the oldest one does not fit,
+        that Cloudlet gets a reservation on the Vm that will have enough free Pes earliest
+        (the reserved Vm and the shadow time, from the predicted exec time of the running Cloudlets).
+        Younger Cloudlets may start before it as long as they do not delay the reservation:
+        on a Vm they are predicted to vacate by the shadow time, or on the reserved Vm
+        within the Pes left over there once the reserved Cloudlet starts
+
+        Parameters
+        ----------
+        backfill_depth: int
+            Maximum number of waiting Cloudlets examined for backfilling in one pass,
+            buckets of Cloudlets with the same demand are given up after one failed bind
+            and do not count against it
+        """
+        super().__init__()
+        self.backfill_depth = backfill_depth
+        self.cloudlet_waiting_queue = CloudletWaitingQueue()
+
+    def submit(self, cloudlet: Cloudlet) -> None:
+        self.cloudlet_waiting_queue.push(cloudlet)
+
+    def compute_reservation(self, datacenter: Datacenter, cloudlet: Cloudlet) -> Tuple[float, Optional[VmRunning], float]:
+        """
+        The shadow time of a Cloudlet, the reserved Vm and the num of Pes left over on it at
+        that time, ```(inf, None, inf)``` if no eligible Vm is large enough for it
+        """
+        clock = datacenter.get_simulator().get_global_clock()
+        shadow_time, reserved_vm_running, num_pes_extra = math.inf, None, math.inf
+        for vm_running in datacenter.get_vm_capacity_index().iter_candidates(0):
+            if vm_running.get_num_pes() < cloudlet.get_num_pes():
+                continue
+            availability_profile = build_availability_profile(datacenter, vm_running, clock)
+            start_time = availability_profile.find_earliest_start(cloudlet.get_num_pes(), datacenter.predict_exec_time(cloudlet, vm_running))
+            if start_time < shadow_time:
+                shadow_time, reserved_vm_running = start_time, vm_running
+                num_pes_extra = availability_profile.get_num_pes_free_at(start_time)-cloudlet.get_num_pes()
+        return shadow_time, reserved_vm_running, num_pes_extra
+
+    @staticmethod
+    def try_to_bind_by_shadow_time(datacenter: Datacenter, cloudlet: Cloudlet, clock: float, shadow_time: float) -> Optional[CloudletRunning]:
+        """
+        Start a Cloudlet on a Vm it is predicted to vacate by the shadow time
+        """
+        for vm_running in datacenter.get_vm_capacity_index().iter_candidates(cloudlet.get_num_pes()):
+            if clock+datacenter.predict_exec_time(cloudlet, vm_running) <= shadow_time:
+                cloudlet_running = datacenter.try_to_bind(cloudlet, vm_running)
+                if cloudlet_running is not None:
+                    # the index has changed, stop iterating it
+                    return cloudlet_running
+        return None
+
+    def schedule(self, datacenter: Datacenter) -> None:
+        cloudlet_waiting_queue = self.cloudlet_waiting_queue
+        vm_capacity_index = datacenter.get_vm_capacity_index()
+        head_heap = cloudlet_waiting_queue.build_head_heap()
+        # start the oldest Cloudlets as long as they fit
+        while len(head_heap) > 0:
+            _, key, _ = head_heap[0]
+            _, cloudlet = cloudlet_waiting_queue.get_entry(key, 0)
+            if datacenter.try_to_bind(cloudlet) is None:
+                break
+            heapq.heappop(head_heap)
+            cloudlet_waiting_queue.remove(key, 0)
+            entry = cloudlet_waiting_queue.get_entry(key, 0)
+            if entry is not None:
+                heapq.heappush(head_heap, (entry[0], key, 0))
+        if len(head_heap) == 0:
+            return
+
+        _, head_key, _ = heapq.heappop(head_heap)
+        _, head_cloudlet = cloudlet_waiting_queue.get_entry(head_key, 0)
+        self.warn_cloudlet_delayed(datacenter, head_cloudlet)
+        if vm_capacity_index.get_max_num_pes_available() == 0:
+            return
+        shadow_time, reserved_vm_running, num_pes_extra = self.compute_reservation(datacenter, head_cloudlet)
+        # a Cloudlet finished by the shadow time even on the slowest Vm may land on any Vm,
+        # one not finished by then even on the fastest Vm may only take the Pes left over on the reserved Vm
+        slowest_vm_running = min(vm_capacity_index.iter_candidates(0), key=lambda vm_running: vm_running.get_mips())
+        fastest_vm_running = max(vm_capacity_index.iter_candidates(0), key=lambda vm_running: vm_running.get_mips())
+        clock = datacenter.get_simulator().get_global_clock()
+        entry = cloudlet_waiting_queue.get_entry(head_key, 1)
+        if entry is not None:
+            heapq.heappush(head_heap, (entry[0], head_key, 1))
+
+        num_examined = 0
+        while len(head_heap) > 0 and num_examined < self.backfill_depth:
+            _, key, position = heapq.heappop(head_heap)
+            if key[0] > vm_capacity_index.get_max_num_pes_available():
+                continue
+            _, cloudlet = cloudlet_waiting_queue.get_entry(key, position)
+            num_examined += 1
+            if clock+datacenter.predict_exec_time(cloudlet, slowest_vm_running) <= shadow_time:
+                if datacenter.try_to_bind(cloudlet) is None:
+                    # the same demand will not fit either, the bucket is done
+                    continue
+                cloudlet_waiting_queue.remove(key, position)
+            elif clock+datacenter.predict_exec_time(cloudlet, fastest_vm_running) <= shadow_time and CloudletSchedulerEasyBackfilling.try_to_bind_by_shadow_time(datacenter, cloudlet, clock, shadow_time) is not None:
+                cloudlet_waiting_queue.remove(key, position)
+            elif key[0] <= num_pes_extra and datacenter.try_to_bind(cloudlet, reserved_vm_running) is not None:
+                # still running at the shadow time, it takes Pes left over by the reserved Cloudlet
+                cloudlet_waiting_queue.remove(key, position)
+                num_pes_extra -= key[0]
+            else:
+                position += 1
+            entry = cloudlet_waiting_queue.get_entry(key, position)
+            if entry is not None:
+                heapq.heappush(head_heap, (entry[0], key, position))
+
+    def drain(self) -> List[Cloudlet]:
+        return self.cloudlet_waiting_queue.clear()
+
+    def get_waiting_list(self) -> List[Cloudlet]:
+        return [cloudlet for _, cloudlet in self.cloudlet_waiting_queue]
+
+    def get_size(self) -> int:
+        return self.cloudlet_waiting_queue.get_size()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from .cloudlet_scheduler import CloudletScheduler
+from .cloudlet_waiting_queue import CloudletWaitingQueue
+from collections import deque
+import heapq
+from typing import Deque, Dict, List, Set, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import Cloudlet
+    from ..datacenters import Datacenter
+
+# (priority, broker id)
+TenantKey = Tuple[int, int]
+
+
+class CloudletSchedulerFairShare(CloudletScheduler):
+    def __init__(self) -> None:
+        """
+        Weighted fair sharing between Brokers (tenants) with strict priority classes,
+        using start-time fair queueing: every (priority, Broker) pair has its own FIFO queue,
+        the queue whose head has the smallest virtual start tag is served next, and a started
+        Cloudlet advances the virtual finish tag of its queue by ```length*num_pes/weight```,
+        so over time each tenant gets Pe time in proportion to its Broker weight.
+        Queues of a higher priority are always tried first, a queue whose head does not fit
+        is set aside for the rest of the pass and lower ranked queues go ahead, i.e. the
+        scheduler never idles Pes a waiting Cloudlet could use.
+        Picking the next queue is O(log B) in the number of backlogged queues,
+        independent of how many Cloudlets are waiting. A pass stops as soon as no queue
+        left in the heap has a head with few enough Pes to fit, so a pass in which nothing
+        fits does not cycle every queue through the heap
+        """
+        super().__init__()
+        self.queue_dict: Dict[TenantKey, Deque[Tuple[int, Cloudlet]]] = {}
+        # virtual finish tag of the last started Cloudlet of every queue seen so far
+        self.finish_tag_dict: Dict[TenantKey, float] = {}
+        # virtual time of every priority class, the start tag of the last started Cloudlet
+        self.virtual_time_dict: Dict[int, float] = {}
+        # one (-priority, start tag, seq of head, tenant key) entry per backlogged queue
+        self.queue_heap: List[Tuple[int, float, int, TenantKey]] = []
+        # Pes required by the heads of the queues in ```queue_heap```: number of heads per
+        # Pe count, and a min-heap of the Pe counts, stale once their number of heads drops to 0.
+        # A Pe count is in the heap at most once, ```head_num_pes_heap_set``` holds the Pe counts in it
+        self.head_num_pes_count_dict: Dict[int, int] = {}
+        self.head_num_pes_heap: List[int] = []
+        self.head_num_pes_heap_set: Set[int] = set()
+        self.insertion_seq = 0
+        self.size = 0
+
+    @staticmethod
+    def get_tenant_key(cloudlet: Cloudlet) -> TenantKey:
+        return (cloudlet.get_priority(), cloudlet.get_broker_id())
+
+    def _push_queue(self, key: TenantKey, start_tag: float) -> None:
+        seq, cloudlet = self.queue_dict[key][0]
+        self._push_entry((-key[0], start_tag, seq, key), cloudlet.get_num_pes())
+
+    def _push_entry(self, entry: Tuple[int, float, int, TenantKey], num_pes: int) -> None:
+        heapq.heappush(self.queue_heap, entry)
+        self.head_num_pes_count_dict[num_pes] = self.head_num_pes_count_dict.get(num_pes, 0)+1
+        if num_pes not in self.head_num_pes_heap_set:
+            self.head_num_pes_heap_set.add(num_pes)
+            heapq.heappush(self.head_num_pes_heap, num_pes)
+
+    def _pop_entry(self) -> Tuple[Tuple[int, float, int, TenantKey], int]:
+        entry = heapq.heappop(self.queue_heap)
+        num_pes = self.queue_dict[entry[3]][0][1].get_num_pes()
+        self.head_num_pes_count_dict[num_pes] -= 1
+        return entry, num_pes
+
+    def get_min_head_num_pes(self) -> int:
+        """
+        The fewest Pes required by the head of a queue in the heap, 0 if the heap is empty
+        """
+        head_num_pes_heap = self.head_num_pes_heap
+        while len(head_num_pes_heap) > 0 and self.head_num_pes_count_dict.get(head_num_pes_heap[0], 0) == 0:
+            num_pes = heapq.heappop(head_num_pes_heap)
+            self.head_num_pes_heap_set.discard(num_pes)
+            self.head_num_pes_count_dict.pop(num_pes, None)
+        return head_num_pes_heap[0] if len(head_num_pes_heap) > 0 else 0
+
+    def submit(self, cloudlet: Cloudlet) -> None:
+        key = CloudletSchedulerFairShare.get_tenant_key(cloudlet)
+        queue = self.queue_dict.get(key)
+        is_backlogged = queue is not None
+        if not is_backlogged:
+            queue = deque([])
+            self.queue_dict[key] = queue
+        queue.append((self.insertion_seq, cloudlet))
+        self.insertion_seq += 1
+        self.size += 1
+        if not is_backlogged:
+            # an idle tenant restarts from the current virtual time, it can not bank the share it did not use
+            start_tag = max(self.finish_tag_dict.get(key, 0.0), self.virtual_time_dict.get(key[0], 0.0))
+            self._push_queue(key, start_tag)
+
+    def schedule(self, datacenter: Datacenter) -> None:
+        vm_capacity_index = datacenter.get_vm_capacity_index()
+        queue_heap = self.queue_heap
+        # free capacity only shrinks during a pass, a demand failed once fails again
+        failed_demand_key_set = set()
+        blocked_entry_list = []
+        while len(queue_heap) > 0 and self.get_min_head_num_pes() <= vm_capacity_index.get_max_num_pes_available():
+            entry, num_pes = self._pop_entry()
+            _, start_tag, _, key = entry
+            queue = self.queue_dict[key]
+            cloudlet = queue[0][1]
+            demand_key = CloudletWaitingQueue.get_demand_key(cloudlet)
+            if demand_key[0] > vm_capacity_index.get_max_num_pes_available() or demand_key in failed_demand_key_set or datacenter.try_to_bind(cloudlet) is None:
+                failed_demand_key_set.add(demand_key)
+                blocked_entry_list.append((entry, num_pes))
+                continue
+            queue.popleft()
+            self.size -= 1
+            self.virtual_time_dict[key[0]] = start_tag
+            finish_tag = start_tag+cloudlet.get_length()*cloudlet.get_num_pes()/datacenter.get_broker_weight(key[1])
+            self.finish_tag_dict[key] = finish_tag
+            if len(queue) == 0:
+                self.queue_dict.pop(key)
+            else:
+                self._push_queue(key, finish_tag)
+        for entry, num_pes in blocked_entry_list:
+            self._push_entry(entry, num_pes)
+        if len(queue_heap) > 0:
+            self.warn_cloudlet_delayed(datacenter, self.queue_dict[queue_heap[0][3]][0][1])
+
+    def drain(self) -> List[Cloudlet]:
+        cloudlet_list = self.get_waiting_list()
+        self.queue_dict.clear()
+        self.queue_heap.clear()
+        self.head_num_pes_count_dict.clear()
+        self.head_num_pes_heap.clear()
+        self.head_num_pes_heap_set.clear()
+        self.size = 0
+        return cloudlet_list
+
+    def get_waiting_list(self) -> List[Cloudlet]:
+        return [cloudlet for _, cloudlet in heapq.merge(*self.queue_dict.values(), key=lambda entry: entry[0])]
+
+    def get_size(self) -> int:
+        return self.size
+
+    def get_num_queues(self) -> int:
+        return len(self.queue_dict)
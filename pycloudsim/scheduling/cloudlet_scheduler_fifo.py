@@ -0,0 +1,39 @@
+from __future__ import annotations
+from .cloudlet_scheduler import CloudletScheduler
+from collections import deque
+from typing import List, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import Cloudlet
+    from ..datacenters import Datacenter
+
+
+class CloudletSchedulerFifo(CloudletScheduler):
+    def __init__(self) -> None:
+        """
+        Start Cloudlets strictly in submission order, a Cloudlet that does not fit
+        blocks all the Cloudlets behind it until resources are released
+        """
+        super().__init__()
+        self.cloudlet_waiting_deque = deque([])
+
+    def submit(self, cloudlet: Cloudlet) -> None:
+        self.cloudlet_waiting_deque.append(cloudlet)
+
+    def schedule(self, datacenter: Datacenter) -> None:
+        while not len(self.cloudlet_waiting_deque) == 0:
+            cloudlet = self.cloudlet_waiting_deque[0]
+            if datacenter.try_to_bind(cloudlet) is None:
+                self.warn_cloudlet_delayed(datacenter, cloudlet)
+                break
+            self.cloudlet_waiting_deque.popleft()
+
+    def drain(self) -> List[Cloudlet]:
+        cloudlet_list = list(self.cloudlet_waiting_deque)
+        self.cloudlet_waiting_deque.clear()
+        return cloudlet_list
+
+    def get_waiting_list(self) -> List[Cloudlet]:
+        return list(self.cloudlet_waiting_deque)
+
+    def get_size(self) -> int:
+        return len(self.cloudlet_waiting_deque)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+from .cloudlet_scheduler import CloudletScheduler
+from .cloudlet_waiting_queue import CloudletWaitingQueue
+import heapq
+from typing import List, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import Cloudlet
+    from ..datacenters import Datacenter
+
+
+class CloudletSchedulerFirstFitSkip(CloudletScheduler):
+    def __init__(self) -> None:
+        """
+        Start every waiting Cloudlet that fits, in submission order, skipping the ones
+        that do not fit instead of blocking on them. Cloudlets may overtake a large
+        Cloudlet forever, see the backfilling schedulers for bounded waiting
+        """
+        super().__init__()
+        self.cloudlet_waiting_queue = CloudletWaitingQueue()
+
+    def submit(self, cloudlet: Cloudlet) -> None:
+        self.cloudlet_waiting_queue.push(cloudlet)
+
+    def schedule(self, datacenter: Datacenter) -> None:
+        vm_capacity_index = datacenter.get_vm_capacity_index()
+        cloudlet_waiting_queue = self.cloudlet_waiting_queue
+        first_delayed_seq, first_delayed_cloudlet = None, None
+        head_heap = cloudlet_waiting_queue.build_head_heap()
+        while len(head_heap) > 0:
+            seq, key, position = heapq.heappop(head_heap)
+            # free Pes only shrink during a pass, a bucket that does not fit now is done
+            if key[0] <= vm_capacity_index.get_max_num_pes_available():
+                _, cloudlet = cloudlet_waiting_queue.get_entry(key, position)
+                if datacenter.try_to_bind(cloudlet) is not None:
+                    cloudlet_waiting_queue.remove(key, position)
+                    entry = cloudlet_waiting_queue.get_entry(key, position)
+                    if entry is not None:
+                        heapq.heappush(head_heap, (entry[0], key, position))
+                    continue
+            if first_delayed_seq is None or seq < first_delayed_seq:
+                first_delayed_seq, first_delayed_cloudlet = seq, cloudlet_waiting_queue.get_entry(key, position)[1]
+        if first_delayed_cloudlet is not None:
+            self.warn_cloudlet_delayed(datacenter, first_delayed_cloudlet)
+
+    def drain(self) -> List[Cloudlet]:
+        return self.cloudlet_waiting_queue.clear()
+
+    def get_waiting_list(self) -> List[Cloudlet]:
+        return [cloudlet for _, cloudlet in self.cloudlet_waiting_queue]
+
+    def get_size(self) -> int:
+        return self.cloudlet_waiting_queue.get_size()
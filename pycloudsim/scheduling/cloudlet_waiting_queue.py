@@ -0,0 +1,89 @@
+from __future__ import annotations
+from collections import deque
+import heapq
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import Cloudlet
+
+DemandKey = Tuple[int, float, float, float]
+
+
+class CloudletWaitingQueue:
+    def __init__(self) -> None:
+        """
+        Waiting Cloudlets bucketed by resource demand (Pes, RAM, storage, bandwidth),
+        each bucket in submission order. Cloudlets of the same demand either all fit on
+        a Vm or none does, so a scheduler can give up a whole bucket after one failed
+        bind instead of scanning every waiting Cloudlet
+        """
+        self.bucket_dict: Dict[DemandKey, Deque[Tuple[int, Cloudlet]]] = {}
+        self.size = 0
+        self.insertion_seq = 0
+
+    @staticmethod
+    def get_demand_key(cloudlet: Cloudlet) -> DemandKey:
+        return (cloudlet.get_num_pes(), cloudlet.get_required_ram(), cloudlet.get_required_storage(), cloudlet.get_required_bandwidth())
+
+    def push(self, cloudlet: Cloudlet) -> None:
+        key = CloudletWaitingQueue.get_demand_key(cloudlet)
+        bucket = self.bucket_dict.get(key)
+        if bucket is None:
+            bucket = deque([])
+            self.bucket_dict[key] = bucket
+        bucket.append((self.insertion_seq, cloudlet))
+        self.insertion_seq += 1
+        self.size += 1
+
+    def get_bucket(self, key: DemandKey) -> Deque[Tuple[int, Cloudlet]]:
+        return self.bucket_dict[key]
+
+    def get_entry(self, key: DemandKey, position: int) -> Optional[Tuple[int, Cloudlet]]:
+        bucket = self.bucket_dict.get(key)
+        if bucket is None or position >= len(bucket):
+            return None
+        return bucket[position]
+
+    def remove(self, key: DemandKey, position: int) -> Cloudlet:
+        bucket = self.bucket_dict[key]
+        if position == 0:
+            _, cloudlet = bucket.popleft()
+        else:
+            _, cloudlet = bucket[position]
+            del bucket[position]
+        if len(bucket) == 0:
+            self.bucket_dict.pop(key)
+        self.size -= 1
+        return cloudlet
+
+    def build_head_heap(self) -> List[Tuple[int, DemandKey, int]]:
+        """
+        A heap of (seq, demand key, position) of every bucket head,
+        popping it walks the buckets in submission order
+        """
+        head_heap = [(bucket[0][0], key, 0) for key, bucket in self.bucket_dict.items()]
+        heapq.heapify(head_heap)
+        return head_heap
+
+    def _iter_bucket(self, key: DemandKey) -> Iterator[Tuple[int, DemandKey, Cloudlet]]:
+        for seq, cloudlet in self.bucket_dict[key]:
+            yield seq, key, cloudlet
+
+    def __iter__(self) -> Iterator[Tuple[DemandKey, Cloudlet]]:
+        """
+        (demand key, Cloudlet) in submission order, lazily merged from the buckets,
+        so the queue must not be modified while iterating
+        """
+        for _, key, cloudlet in heapq.merge(*[self._iter_bucket(key) for key in self.bucket_dict], key=lambda entry: entry[0]):
+            yield key, cloudlet
+
+    def clear(self) -> List[Cloudlet]:
+        cloudlet_list = [cloudlet for _, cloudlet in self]
+        self.bucket_dict.clear()
+        self.size = 0
+        return cloudlet_list
+
+    def get_size(self) -> int:
+        return self.size
+
+    def get_num_buckets(self) -> int:
+        return len(self.bucket_dict)
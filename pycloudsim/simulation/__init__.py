@@ -1 +1,3 @@
-from .simulator import Simulator
\ No newline at end of file
+from .simulator import Simulator
+from .run_stats import RunStats
+from .profiler import Profiler
\ No newline at end of file
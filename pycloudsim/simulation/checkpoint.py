@@ -0,0 +1,155 @@
+"""
+Checkpoint and restore of a running simulation.
+
+A checkpoint is a directory holding
+    state.pkl                   the live object graph (event queue, Datacenter, Hosts,
+                                running Vms and Cloudlets, listeners) pickled together,
+                                so cross references such as ```VmRunning.host``` and
+                                ```CloudletRunning.vm_running``` survive the round trip
+    cloudlet_end_of_life.npy    finished Cloudlets as a NumPy structured array
+    vm_end_of_life.npy          finished Vms as a NumPy structured array
+The finished-entity tables are the bulk of a long run, on restore they are memory-mapped
+and Cloudlet/Vm objects are only materialized when looked up
+"""
+from __future__ import annotations
+from ..results.records import CLOUDLET_RECORD_DTYPE, VM_RECORD_DTYPE, cloudlet_to_record, record_to_cloudlet, vm_to_record, record_to_vm
+from collections.abc import MutableMapping
+from functools import partial
+import os
+import pickle
+import numpy as np
+from typing import Any, Callable, Dict, Iterator, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .simulator import Simulator
+
+STATE_FILE_NAME = "state.pkl"
+CLOUDLET_END_OF_LIFE_FILE_NAME = "cloudlet_end_of_life.npy"
+VM_END_OF_LIFE_FILE_NAME = "vm_end_of_life.npy"
+
+
+class EndOfLifeTable(MutableMapping):
+    def __init__(self, record_array: np.ndarray, to_record: Callable[[Any], tuple], from_record: Callable[[np.void], Any]) -> None:
+        """
+        A ```Dict[int, entity]``` view over a (memory-mapped) record array of finished entities.
+        Entities are materialized on lookup and cached, entries added after restore
+        are kept in an in-memory overlay. Finished entities are not modified any more,
+        so cached entities are never written back to the records
+
+        Parameters
+        ----------
+        record_array: np.ndarray
+            Structured array with a ```key``` field
+        to_record: Callable
+            Convert an entity into a record tuple
+        from_record: Callable
+            Materialize an entity from a record
+        """
+        self.record_array = record_array
+        self.to_record = to_record
+        self.from_record = from_record
+        self.row_index = None
+        self.overlay_dict = {}
+        self.removed_row_set = set()
+        self.materialized_dict = {}
+
+    def _get_row_index(self) -> Dict[int, int]:
+        if self.row_index is None:
+            self.row_index = {key: row for row, key in enumerate(self.record_array["key"].tolist())}
+        return self.row_index
+
+    def _get_row(self, key: int) -> int:
+        row = self._get_row_index().get(key)
+        if row is None or row in self.removed_row_set:
+            return -1
+        return row
+
+    def __getitem__(self, key: int) -> Any:
+        if key in self.overlay_dict:
+            return self.overlay_dict[key]
+        row = self._get_row(key)
+        if row < 0:
+            raise KeyError(key)
+        # the materialized entity is cached so repeated lookups return the same object
+        entity = self.materialized_dict.get(row)
+        if entity is None:
+            entity = self.from_record(self.record_array[row])
+            self.materialized_dict[row] = entity
+        return entity
+
+    def __setitem__(self, key: int, entity: Any) -> None:
+        if key not in self.overlay_dict:
+            row = self._get_row(key)
+            if row >= 0:
+                self.removed_row_set.add(row)
+        self.overlay_dict[key] = entity
+
+    def __delitem__(self, key: int) -> None:
+        if key in self.overlay_dict:
+            self.overlay_dict.pop(key)
+            return
+        row = self._get_row(key)
+        if row < 0:
+            raise KeyError(key)
+        self.removed_row_set.add(row)
+
+    def __iter__(self) -> Iterator[int]:
+        removed_row_set = set(self.removed_row_set)
+        overlay_key_list = list(self.overlay_dict)
+        for row, key in enumerate(self.record_array["key"].tolist()):
+            if row not in removed_row_set:
+                yield key
+        yield from overlay_key_list
+
+    def __len__(self) -> int:
+        return len(self.record_array)-len(self.removed_row_set)+len(self.overlay_dict)
+
+    def to_record_array(self) -> np.ndarray:
+        """
+        Records of all entries without materializing the untouched rows
+        """
+        if len(self.removed_row_set) > 0:
+            mask = np.ones(len(self.record_array), dtype=bool)
+            mask[list(self.removed_row_set)] = False
+            record_array = self.record_array[mask]
+        else:
+            record_array = np.asarray(self.record_array)
+        overlay_array = np.array([self.to_record(entity) for entity in self.overlay_dict.values()], dtype=self.record_array.dtype)
+        return np.concatenate([record_array, overlay_array])
+
+
+def _build_record_array(entity_dict: Dict[int, Any], dtype: np.dtype, to_record: Callable[[Any], tuple]) -> np.ndarray:
+    if isinstance(entity_dict, EndOfLifeTable):
+        return entity_dict.to_record_array()
+    return np.array([to_record(entity) for entity in entity_dict.values()], dtype=dtype)
+
+
+def save_checkpoint(simulator: Simulator, path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+    datacenter = simulator.get_datacenter()
+    cloudlet_end_of_life_dict = datacenter.cloudlet_end_of_life_dict
+    vm_end_of_life_dict = datacenter.vm_end_of_life_dict
+    np.save(os.path.join(path, CLOUDLET_END_OF_LIFE_FILE_NAME), _build_record_array(cloudlet_end_of_life_dict, CLOUDLET_RECORD_DTYPE, cloudlet_to_record))
+    np.save(os.path.join(path, VM_END_OF_LIFE_FILE_NAME), _build_record_array(vm_end_of_life_dict, VM_RECORD_DTYPE, vm_to_record))
+    # the finished-entity tables are stored as arrays, keep them out of the pickle
+    datacenter.cloudlet_end_of_life_dict = {}
+    datacenter.vm_end_of_life_dict = {}
+    try:
+        with open(os.path.join(path, STATE_FILE_NAME), "wb") as state_file:
+            pickle.dump(simulator, state_file, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        datacenter.cloudlet_end_of_life_dict = cloudlet_end_of_life_dict
+        datacenter.vm_end_of_life_dict = vm_end_of_life_dict
+
+
+def load_checkpoint(path: str, mmap: bool = True) -> Simulator:
+    with open(os.path.join(path, STATE_FILE_NAME), "rb") as state_file:
+        simulator = pickle.load(state_file)
+    mmap_mode = "r" if mmap else None
+    datacenter = simulator.get_datacenter()
+    # materialized entities are keyed by the registry of the restored simulation
+    entity_registry = simulator.get_entity_registry()
+    datacenter.cloudlet_end_of_life_dict = EndOfLifeTable(np.load(os.path.join(path, CLOUDLET_END_OF_LIFE_FILE_NAME), mmap_mode=mmap_mode), cloudlet_to_record, partial(record_to_cloudlet, entity_registry=entity_registry))
+    datacenter.vm_end_of_life_dict = EndOfLifeTable(np.load(os.path.join(path, VM_END_OF_LIFE_FILE_NAME), mmap_mode=mmap_mode), vm_to_record, partial(record_to_vm, entity_registry=entity_registry))
+    # a streaming sink has kept writing since the checkpoint, the resumed run writes those records again
+    datacenter.get_result_sink().rewind()
+    return simulator
@@ -0,0 +1,121 @@
+"""
+Fork a running simulation into an independent child simulation.
+
+Finished Cloudlets and Vms never change again, and on long runs they are
+most of the state, so the finished-entity tables are shared between the parent
+and the child behind CopyOnWriteDict: both write to their own overlay while the
+shared base is frozen. Everything still alive (event queue, Datacenter, Hosts,
+running Vms and Cloudlets, listeners) is deep copied, so the cost of a fork
+scales with the live state instead of the whole history of the run.
+A result sink writing to files is not copied, the parent and the child would append
+to the same files, the child must be given a sink of its own
+"""
+from __future__ import annotations
+from ..events import EventPool
+from ..results.result_sink_memory import ResultSinkMemory
+from collections.abc import Mapping, MutableMapping
+import copy
+from typing import Any, Dict, Iterator, Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .simulator import Simulator
+    from ..results import ResultSink
+
+END_OF_LIFE_DICT_NAME_LIST = ["cloudlet_end_of_life_dict", "vm_end_of_life_dict"]
+
+
+class CopyOnWriteDict(MutableMapping):
+    def __init__(self, base: Mapping) -> None:
+        """
+        A dict layered over a shared base mapping which must not be modified any more.
+        Writes and deletions only touch the overlay of this dict
+
+        Parameters
+        ----------
+        base: Mapping
+            The frozen mapping shared with other CopyOnWriteDicts
+        """
+        self.base = base
+        self.overlay_dict = {}
+        self.deleted_key_set = set()
+        self.num_shadowed = 0
+
+    def __getitem__(self, key: Any) -> Any:
+        if key in self.overlay_dict:
+            return self.overlay_dict[key]
+        if key in self.deleted_key_set:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key not in self.overlay_dict:
+            if key in self.deleted_key_set:
+                self.deleted_key_set.remove(key)
+                self.num_shadowed += 1
+            elif key in self.base:
+                self.num_shadowed += 1
+        self.overlay_dict[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        if key in self.overlay_dict:
+            self.overlay_dict.pop(key)
+            if key in self.base:
+                self.num_shadowed -= 1
+                self.deleted_key_set.add(key)
+        elif key in self.base and key not in self.deleted_key_set:
+            self.deleted_key_set.add(key)
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        overlay_key_list = list(self.overlay_dict)
+        for key in self.base:
+            if key not in self.deleted_key_set and key not in self.overlay_dict:
+                yield key
+        yield from overlay_key_list
+
+    def __len__(self) -> int:
+        return len(self.base)-len(self.deleted_key_set)-self.num_shadowed+len(self.overlay_dict)
+
+    def is_unmodified(self) -> bool:
+        return len(self.overlay_dict) == 0 and len(self.deleted_key_set) == 0
+
+
+def _freeze(table: Mapping) -> Mapping:
+    """
+    The mapping to share with a child, an unmodified CopyOnWriteDict
+    is skipped so that fanning out N forks does not build a chain of layers
+    """
+    if isinstance(table, CopyOnWriteDict) and table.is_unmodified():
+        return table.base
+    return table
+
+
+def fork_simulator(simulator: Simulator, result_sink: Optional[ResultSink] = None) -> Simulator:
+    """
+    Parameters
+    ----------
+    simulator: Simulator
+        The parent simulation
+    result_sink: ResultSink
+        The sink of the Datacenter of the child, it receives the Cloudlets and Vms finished
+        after the fork. Default a copy of the sink of the parent, which must then be a ResultSinkMemory
+    """
+    datacenter = simulator.get_datacenter()
+    memo: Dict[int, Any] = {}
+    if result_sink is not None:
+        memo[id(datacenter.get_result_sink())] = result_sink
+    elif not isinstance(datacenter.get_result_sink(), ResultSinkMemory):
+        raise ValueError("Datacenter writes results to a %s, the child of a fork must be given a result sink of its own" % type(datacenter.get_result_sink()).__name__)
+    for name in END_OF_LIFE_DICT_NAME_LIST:
+        table = getattr(datacenter, name)
+        base = _freeze(table)
+        if base is table:
+            # the parent must stop writing to the shared base as well
+            setattr(datacenter, name, CopyOnWriteDict(base))
+        # the copied CopyOnWriteDict of the parent keeps pointing at the shared base
+        memo[id(base)] = base
+    # recycled events are not worth copying, the child starts with an empty pool
+    memo[id(simulator.event_pool)] = EventPool(simulator.event_pool.max_size)
+    # keys and UUIDs stay unique across the parent and the child, entities attached to either take the next key
+    memo[id(simulator.entity_registry)] = simulator.entity_registry
+    return copy.deepcopy(simulator, memo)
@@ -0,0 +1,243 @@
+"""
+Opt-in profiling of the simulation hot path.
+
+While a Profiler is attached to a Simulator, the callables on the hot path are replaced
+by timing wrappers: ```Simulator.process```, the event handlers of the Simulator and the
+Datacenter, ```Datacenter.try_to_bind```, the Vm and Cloudlet placement policies, the Cloudlet
+scheduler, the event listeners, the Logger and the EventLog. Detaching puts the originals
+back, so a simulation which is not profiled runs exactly the code it runs without this module.
+
+Every wrapper is a frame of a call stack rooted at the event being processed, e.g.
+    Event.CLOUDLET_BIND;Datacenter.processs_cloudlet_bind;CloudletSchedulerFifo.schedule;Datacenter.try_to_bind
+so the time of a run is reported per event type, per wrapped callable and as collapsed
+stacks of self time, the input format of flamegraph.pl and speedscope
+"""
+from __future__ import annotations
+from ..logger import Logger, get_event_log
+from array import array
+from collections import defaultdict
+import json
+import time
+import numpy as np
+from typing import Any, Callable, Dict, List, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .simulator import Simulator
+
+LOGGER_METHOD_NAME_LIST = ["debug", "info", "warning", "error", "log"]
+PERCENTILE_LIST = [50, 90, 99]
+
+
+def get_frame_name(func: Callable) -> str:
+    owner = getattr(func, "__self__", None)
+    if owner is not None:
+        return "%s.%s" % (type(owner).__name__, func.__name__)
+    return getattr(func, "__qualname__", func.__name__)
+
+
+class Profiler:
+    def __init__(self) -> None:
+        """
+        Counters and timings of the hot path of a Simulator, see ```Simulator.enable_profiler```.
+        Callables are wrapped when the profiler is attached, policies, schedulers
+        and listeners set or added later are not profiled until it is attached again
+        """
+        self.simulator = None
+        # (object, attribute name, the instance attribute it shadows or None)
+        self.attribute_patch_list: List[Tuple[Any, str, Any]] = []
+        # (handler dict, event type, original handler)
+        self.handler_patch_list: List[Tuple[Dict, Any, Callable]] = []
+        self.frame_stack: List[str] = []
+        self.child_time_stack: List[float] = []
+        self.self_time_dict: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self.call_count_dict: Dict[str, int] = defaultdict(int)
+        self.call_time_dict: Dict[str, float] = defaultdict(float)
+        # handler time of every event, per event type name
+        self.event_time_array_dict: Dict[str, array] = {}
+        self.num_events = 0
+        self.max_event_queue_size = 0
+        self.wall_time = 0.0
+        self.attach_time = None
+
+    def attach(self, simulator: Simulator) -> None:
+        if self.simulator is not None:
+            raise RuntimeError("Profiler is already attached")
+        self.simulator = simulator
+        self._patch_attribute(simulator, "process", self._wrap_process(simulator.process))
+        self._patch_handler_dict(simulator.event_handler_dict)
+        for listener in simulator.event_listener_list:
+            self._patch_callable(listener, "update")
+        datacenter = simulator.get_datacenter()
+        if datacenter is not None:
+            self._patch_handler_dict(datacenter.event_handler_dict)
+            self._patch_callable(datacenter, "try_to_bind")
+            self._patch_callable(datacenter.get_vm_placement_policy(), "try_to_place")
+            self._patch_callable(datacenter.get_cloudlet_placement_policy(), "try_to_place")
+            self._patch_callable(datacenter.get_cloudlet_scheduler(), "schedule")
+        logger = Logger()
+        for method_name in LOGGER_METHOD_NAME_LIST:
+            self._patch_callable(logger, method_name)
+        event_log = get_event_log()
+        if event_log is not None:
+            self._patch_callable(event_log, "record")
+        self.attach_time = time.perf_counter()
+
+    def detach(self) -> None:
+        if self.simulator is None:
+            return
+        self.wall_time += time.perf_counter()-self.attach_time
+        self.attach_time = None
+        for handler_dict, event_type, handler in reversed(self.handler_patch_list):
+            handler_dict[event_type] = handler
+        for obj, name, shadowed in reversed(self.attribute_patch_list):
+            if shadowed is None:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, shadowed)
+        self.handler_patch_list.clear()
+        self.attribute_patch_list.clear()
+        self.simulator = None
+
+    def is_attached(self) -> bool:
+        return self.simulator is not None
+
+    def _patch_attribute(self, obj: Any, name: str, wrapper: Callable) -> None:
+        self.attribute_patch_list.append((obj, name, obj.__dict__.get(name)))
+        setattr(obj, name, wrapper)
+
+    def _patch_callable(self, obj: Any, name: str) -> None:
+        func = getattr(obj, name)
+        self._patch_attribute(obj, name, self._wrap(get_frame_name(func), func))
+
+    def _patch_handler_dict(self, handler_dict: Dict[Any, Callable]) -> None:
+        for event_type, handler in list(handler_dict.items()):
+            self.handler_patch_list.append((handler_dict, event_type, handler))
+            handler_dict[event_type] = self._wrap(get_frame_name(handler), handler)
+
+    def _enter(self, frame: str) -> None:
+        self.frame_stack.append(frame)
+        self.child_time_stack.append(0.0)
+
+    def _exit(self, frame: str, elapsed: float) -> None:
+        child_time = self.child_time_stack.pop()
+        self.self_time_dict[tuple(self.frame_stack)] += elapsed-child_time
+        self.frame_stack.pop()
+        if len(self.child_time_stack) > 0:
+            self.child_time_stack[-1] += elapsed
+        self.call_count_dict[frame] += 1
+        self.call_time_dict[frame] += elapsed
+
+    def _wrap(self, frame: str, func: Callable) -> Callable:
+        def wrapper(*args, **kwargs):
+            self._enter(frame)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit(frame, time.perf_counter()-start)
+        return wrapper
+
+    def _wrap_process(self, process: Callable) -> Callable:
+        event_queue = self.simulator.event_queue
+
+        def wrapper(event):
+            event_type_name = event.event_type.name
+            frame = "Event.%s" % event_type_name
+            # the popped event counts, it was in the queue until now
+            event_queue_size = event_queue.get_size()+1
+            if event_queue_size > self.max_event_queue_size:
+                self.max_event_queue_size = event_queue_size
+            self._enter(frame)
+            start = time.perf_counter()
+            try:
+                process(event)
+            finally:
+                elapsed = time.perf_counter()-start
+                self._exit(frame, elapsed)
+                event_time_array = self.event_time_array_dict.get(event_type_name)
+                if event_time_array is None:
+                    event_time_array = array("d")
+                    self.event_time_array_dict[event_type_name] = event_time_array
+                event_time_array.append(elapsed)
+                self.num_events += 1
+        return wrapper
+
+    def get_wall_time(self) -> float:
+        """
+        Real time spent attached, in seconds
+        """
+        if self.attach_time is None:
+            return self.wall_time
+        return self.wall_time+time.perf_counter()-self.attach_time
+
+    def get_num_events(self) -> int:
+        return self.num_events
+
+    def get_events_per_second(self) -> float:
+        wall_time = self.get_wall_time()
+        return self.num_events/wall_time if wall_time > 0 else 0.0
+
+    def get_max_event_queue_size(self) -> int:
+        return self.max_event_queue_size
+
+    def get_report(self) -> Dict[str, Any]:
+        """
+        The profile as a JSON-compatible dict, times in seconds
+        """
+        event_type_report_dict = {}
+        for event_type_name, event_time_array in self.event_time_array_dict.items():
+            event_time_ndarray = np.frombuffer(event_time_array, dtype=np.float64)
+            event_type_report = {
+                "count": len(event_time_ndarray),
+                "total_time": float(event_time_ndarray.sum()),
+                "mean_time": float(event_time_ndarray.mean()),
+                "max_time": float(event_time_ndarray.max()),
+            }
+            for percentile, value in zip(PERCENTILE_LIST, np.percentile(event_time_ndarray, PERCENTILE_LIST)):
+                event_type_report["p%d_time" % percentile] = float(value)
+            event_type_report_dict[event_type_name] = event_type_report
+        call_report_dict = {}
+        for frame, count in self.call_count_dict.items():
+            if frame.startswith("Event."):
+                continue
+            call_report_dict[frame] = {
+                "count": count,
+                "total_time": self.call_time_dict[frame],
+                "mean_time": self.call_time_dict[frame]/count,
+            }
+        return {
+            "wall_time": self.get_wall_time(),
+            "num_events": self.num_events,
+            "events_per_second": self.get_events_per_second(),
+            "max_event_queue_size": self.max_event_queue_size,
+            "event_types": event_type_report_dict,
+            "calls": call_report_dict,
+        }
+
+    def save_json(self, path: str) -> None:
+        with open(path, "w") as json_file:
+            json.dump(self.get_report(), json_file, indent=2)
+
+    def get_collapsed_stack_list(self) -> List[str]:
+        """
+        One ```frame;frame;frame self_time``` line per call stack, self time in microseconds
+        """
+        return ["%s %d" % (";".join(frame_stack), round(self_time*1e6)) for frame_stack, self_time in sorted(self.self_time_dict.items())]
+
+    def save_collapsed_stacks(self, path: str) -> None:
+        with open(path, "w") as collapsed_stack_file:
+            for line in self.get_collapsed_stack_list():
+                collapsed_stack_file.write(line+"\n")
+
+    def reset(self) -> None:
+        """
+        Forget everything recorded so far, the wrappers stay in place
+        """
+        self.self_time_dict.clear()
+        self.call_count_dict.clear()
+        self.call_time_dict.clear()
+        self.event_time_array_dict.clear()
+        self.num_events = 0
+        self.max_event_queue_size = 0
+        self.wall_time = 0.0
+        if self.attach_time is not None:
+            self.attach_time = time.perf_counter()
@@ -0,0 +1,29 @@
+class RunStats:
+    def __init__(self, num_events_processed: int, wall_time: float, global_clock: float) -> None:
+        """
+        Summary of a single call driving the simulation forward
+
+        Parameters
+        ----------
+        num_events_processed: int
+            The number of events dispatched during the call, coalesced events excluded
+        wall_time: float
+            The elapsed real time of the call in seconds
+        global_clock: float
+            The global clock when the call returned
+        """
+        self.num_events_processed = num_events_processed
+        self.wall_time = wall_time
+        self.global_clock = global_clock
+
+    def get_num_events_processed(self) -> int:
+        return self.num_events_processed
+
+    def get_wall_time(self) -> float:
+        return self.wall_time
+
+    def get_global_clock(self) -> float:
+        return self.global_clock
+
+    def get_events_per_second(self) -> float:
+        return self.num_events_processed/self.wall_time if self.wall_time > 0 else 0.0
@@ -1,14 +1,21 @@
 from __future__ import annotations
-from ..events import Event
-from ..utils import MinHeap
-from ..entity import SimulationEntity
+from ..events import Event, EventPool
+from ..queues import EventQueue, EventQueueHeap
+from ..entity import SimulationEntity, EntityRegistry
+from .run_stats import RunStats
+from .checkpoint import save_checkpoint, load_checkpoint
+from .fork import fork_simulator
+from .profiler import Profiler
 from enum import Enum
+from collections import defaultdict
 import threading
+import time
 import numpy as np
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Optional
 if TYPE_CHECKING:
     from ..datacenters import Datacenter
     from ..listeners import EventListener, CircularClockListener
+    from ..results import ResultSink
 
 
 class Simulator(SimulationEntity):
@@ -20,6 +27,14 @@ class Simulator(SimulationEntity):
         """The simulation is paused"""
         PAUSED = 2
         """The simulation end normaly or the terminate time arrives"""
+        TERMINATED = 3
+
+    """
+    Event types whose handling is idempotent at a given time,
+    e.g. a CLOUDLET_BIND pass already binds every waiting Cloudlet it can,
+    so any other CLOUDLET_BIND for the same target at the same time is redundant
+    """
+    COALESCIBLE_EVENT_TYPE_SET = frozenset([Event.TYPE.CLOUDLET_BIND])
 
     def event_comparator(event_a: Event, event_b: Event) -> bool:
         # The event with small start delay goes first
@@ -40,7 +55,7 @@ class Simulator(SimulationEntity):
                 # their order doesn't matter
                 return False
 
-    def __init__(self) -> None:
+    def __init__(self, event_queue: EventQueue = None, entity_registry: EntityRegistry = None) -> None:
         """
         A simulator is the core of cloud simulation, 
         which maintains an event priority queue and
@@ -50,37 +65,78 @@ class Simulator(SimulationEntity):
         A simulator is also an event dispatcher, 
         which accepts scheduled event from simulation entities 
         and act properly when event occurs
+
+        Parameters
+        ----------
+        event_queue: EventQueue
+            The pending event set backend, default ```EventQueueHeap```.
+            It must be an EventQueue: stopping a running Cloudlet cancels its
+            pending CLOUDLET_FINISH through the handle returned by ```push()```,
+            which the legacy comparator-driven MinHeap does not provide
+        entity_registry: EntityRegistry
+            The registry the entities of this simulation take their keys from when they
+            are attached, default a new one with a random UUID namespace
         """
-        self.event_queue = MinHeap(Simulator.event_comparator)
+        self.entity_registry = entity_registry if entity_registry is not None else EntityRegistry()
+        if event_queue is not None and not isinstance(event_queue, EventQueue):
+            raise ValueError("Event queue must be an EventQueue supporting cancel(), got %s" % type(event_queue).__name__)
+        self.event_queue = event_queue if event_queue is not None else EventQueueHeap()
         self.global_clock_prev = 0.0
         self.global_clock = 0.0
         self.event_listener_list = []
+        self.event_listener_dict = {}
         self.circular_clock_listener_list = []
+        self.event_handler_dict = {
+            Event.TYPE.SIMULATION_TERMINATE: self.process_simulation_terminate,
+            Event.TYPE.SIMULATION_PAUSE: self.process_simulation_pause,
+            Event.TYPE.CIRCULAR_CLOCK_EVENT: self.process_circular_clock_event,
+        }
         self.state = Simulator.State.INITIALIZED
         self.datacenter = None
         self.is_terminate_time_set = False
-        self.event_queue.push(Event(source=None, target=self, event_type=Event.TYPE.SIMULATION_TERMINATE, extra_data={"simulator": self}, start_time=np.finfo(np.float64).max))
+        self.coalescible_event_type_set = set(Simulator.COALESCIBLE_EVENT_TYPE_SET)
+        self.num_events_coalesced_dict = defaultdict(int)
+        self.event_pool = EventPool()
+        self.profiler = None
+        self.event_queue.push(Event(source=None, target=self, event_type=Event.TYPE.SIMULATION_TERMINATE, start_time=np.finfo(np.float64).max))
 
     def get_global_clock(self) -> float:
         return self.global_clock
 
     def set_termination_time(self, terimination_time: float):
         self.is_terminate_time_set = True
-        self.event_queue.push(Event(source=None, target=self, event_type=Event.TYPE.SIMULATION_TERMINATE, extra_data={"simulator": self}, start_time=terimination_time))
+        self.event_queue.push(Event(source=None, target=self, event_type=Event.TYPE.SIMULATION_TERMINATE, start_time=terimination_time))
+
+    def submit(self, event: Event) -> Any:
+        """
+        Schedule an event, the returned handle can be passed to ```cancel()```
+        to retract the event before it occurs
+        """
+        return self.event_queue.push(event)
+
+    def schedule(self, target: SimulationEntity, event_type: Event.TYPE, start_time: float, payload: Any = None) -> Any:
+        """
+        Submit a pooled event, it is recycled once it has been dispatched
+        """
+        return self.event_queue.push(self.event_pool.acquire(target, event_type, start_time, payload))
 
-    def submit(self, event: Event) -> None:
-        self.event_queue.push(event)
+    def cancel(self, handle: Any) -> bool:
+        """
+        Cancel a scheduled event in O(1), return False if the event
+        has already been processed or cancelled
+        """
+        return self.event_queue.cancel(handle)
 
     def process(self, event: Event):
-        for event_listener in self.event_listener_list:
-            event_listener.update(event, self)
-        if event.get_event_type() == Event.TYPE.SIMULATION_TERMINATE:
-            self.process_simulation_terminate(event)
-        elif event.get_event_type() == Event.TYPE.SIMULATION_PAUSE:
-            self.process_simulation_pause(event)
-        elif event.get_event_type() == Event.TYPE.CIRCULAR_CLOCK_EVENT:
-            for circular_clock_listener in self.circular_clock_listener_list:
-                circular_clock_listener.update(self)
+        # event_listener_dict only holds the event types with at least one subscriber
+        if self.event_listener_dict:
+            event_listener_list = self.event_listener_dict.get(event.event_type)
+            if event_listener_list is not None:
+                for event_listener in event_listener_list:
+                    event_listener.update(event, self)
+        handler = self.event_handler_dict.get(event.event_type)
+        if handler is not None:
+            handler(event)
         else:
             self.send(event)
         self.global_clock_prev = self.global_clock
@@ -93,24 +149,207 @@ class Simulator(SimulationEntity):
     def process_simulation_pause(self, event: Event):
         self.state = Simulator.State.PAUSED
 
+    def process_circular_clock_event(self, event: Event):
+        for circular_clock_listener in self.circular_clock_listener_list:
+            circular_clock_listener.update(self)
+
     def send(self, event: Event) -> None:
         event.get_target().process(event)
 
-    def run_util_pause_or_terminate(self) -> None:
+    def coalesce(self, event: Event) -> int:
+        """
+        Drain the pending events identical to ```event``` (same start time, type and target)
+        from the head of the event queue, so that the batch is dispatched only once.
+        Since the queue is ordered by ```(start_time, priority)```, all such events
+        queued before ```event``` is dispatched are right behind it
+        """
+        event_queue = self.event_queue
+        start_time = event.get_start_time()
+        event_type = event.get_event_type()
+        target = event.get_target()
+        num_events_coalesced = 0
+        while not event_queue.is_empty():
+            next_event = event_queue.peek()
+            if next_event.get_start_time() != start_time or next_event.get_event_type() != event_type or next_event.get_target() is not target:
+                break
+            self.event_pool.release(event_queue.pop())
+            num_events_coalesced += 1
+        if num_events_coalesced > 0:
+            self.num_events_coalesced_dict[event_type] += num_events_coalesced
+        return num_events_coalesced
+
+    def run(self, until_time: Optional[float] = None, max_events: Optional[int] = None) -> RunStats:
+        """
+        Dispatch events until the event queue is empty, a SIMULATION_PAUSE event occurs,
+        the next event starts after ```until_time``` or ```max_events``` events are dispatched.
+        No sentinel event is inserted to stop, so the simulation can be resumed
+        by simply calling any run method again. The result sink of the Datacenter
+        is flushed whenever the run stops.
+        When stopped by ```until_time```, the global clock is advanced to ```until_time```
+        """
+        wall_time_start = time.perf_counter()
+        event_queue = self.event_queue
+        coalescible_event_type_set = self.coalescible_event_type_set
+        event_pool = self.event_pool
+        num_events_processed = 0
         self.state = Simulator.State.RUNNING
-        while self.state == Simulator.State.RUNNING and not self.event_queue.is_empty():
-            event = self.event_queue.pop()
+        while self.state == Simulator.State.RUNNING:
+            if event_queue.is_empty():
+                self.state = Simulator.State.TERMINATED
+                break
+            if max_events is not None and num_events_processed >= max_events:
+                self.state = Simulator.State.PAUSED
+                break
+            if until_time is not None and event_queue.peek().get_start_time() > until_time:
+                self.state = Simulator.State.PAUSED
+                if self.global_clock < until_time:
+                    self.global_clock = until_time
+                break
+            event = event_queue.pop()
             self.global_clock = event.get_start_time()
+            if event.get_event_type() in coalescible_event_type_set:
+                self.coalesce(event)
             self.process(event)
+            event_pool.release(event)
+            num_events_processed += 1
+        # whatever stopped the run, results streamed so far are complete on disk
+        if self.datacenter is not None:
+            self.datacenter.get_result_sink().flush()
+        return RunStats(num_events_processed, time.perf_counter()-wall_time_start, self.global_clock)
+
+    def run_util_pause_or_terminate(self) -> RunStats:
+        return self.run()
+
+    def run_until(self, until_time: float) -> RunStats:
+        """
+        Dispatch every event starting no later than ```until_time```
+        """
+        return self.run(until_time=until_time)
+
+    def run_for(self, duration: float) -> RunStats:
+        """
+        Advance the simulation by ```duration``` from the current global clock
+        """
+        return self.run(until_time=self.global_clock+duration)
+
+    def step(self, num_events: int = 1) -> RunStats:
+        """
+        Dispatch at most ```num_events``` events
+        """
+        return self.run(max_events=num_events)
+
+    def set_event_type_coalescible(self, event_type: Event.TYPE, is_coalescible: bool) -> None:
+        if is_coalescible:
+            self.coalescible_event_type_set.add(event_type)
+        else:
+            self.coalescible_event_type_set.discard(event_type)
+
+    def get_num_events_coalesced(self, event_type: Event.TYPE = None) -> int:
+        """
+        The number of events dropped by coalescing, of the given type or in total
+        """
+        if event_type is None:
+            return sum(self.num_events_coalesced_dict.values())
+        return self.num_events_coalesced_dict[event_type]
 
     def add_event_listener(self, listener: EventListener):
+        """
+        Subscribe the listener to its ```get_event_type()```, or to every event type if it is ```None```.
+        Listeners of an event type are notified in the order they were added
+        """
         self.event_listener_list.append(listener)
+        self._build_event_listener_dict()
+
+    def remove_event_listener(self, listener: EventListener):
+        self.event_listener_list.remove(listener)
+        self._build_event_listener_dict()
+
+    def _build_event_listener_dict(self) -> None:
+        event_listener_dict = {}
+        for event_type in Event.TYPE:
+            event_listener_list = [listener for listener in self.event_listener_list if listener.get_event_type() is None or listener.get_event_type() == event_type]
+            if len(event_listener_list) > 0:
+                event_listener_dict[event_type] = event_listener_list
+        self.event_listener_dict = event_listener_dict
 
     def add_circular_clock_listener(self, listener: CircularClockListener):
         self.circular_clock_listener_list.append(listener)
         self.event_queue.push(Event(
             source=None, target=self, event_type=Event.TYPE.CIRCULAR_CLOCK_EVENT, extra_data=None, start_time=0.0))
 
+    def checkpoint(self, path: str) -> None:
+        """
+        Save the simulation into the directory ```path```, see ```simulation.checkpoint```.
+        Listeners and other user objects reachable from the simulator are pickled with it,
+        so their classes must be importable when restoring
+        """
+        profiler = self.disable_profiler()
+        try:
+            save_checkpoint(self, path)
+        finally:
+            if profiler is not None:
+                self.enable_profiler(profiler)
+
+    @staticmethod
+    def restore(path: str, mmap: bool = True) -> Simulator:
+        """
+        Load a simulation saved by ```checkpoint()```, it resumes with any run method.
+        With ```mmap```, the finished Cloudlet/Vm tables are memory-mapped and loaded lazily
+        """
+        return load_checkpoint(path, mmap)
+
+    def fork(self, result_sink: Optional[ResultSink] = None) -> Simulator:
+        """
+        Create an independent child simulation from the current state, see ```simulation.fork```.
+        The child can be given different placement policies through its Datacenter
+        and run without affecting the parent
+
+        Parameters
+        ----------
+        result_sink: ResultSink
+            The result sink of the child Datacenter, required when the parent streams
+            its results to files, e.g. with ```ResultSinkCsv```
+        """
+        profiler = self.disable_profiler()
+        try:
+            return fork_simulator(self, result_sink)
+        finally:
+            if profiler is not None:
+                self.enable_profiler(profiler)
+
+    def enable_profiler(self, profiler: Profiler = None) -> Profiler:
+        """
+        Start recording per event type timings, call counts of placement policies,
+        queue size and events/sec, see ```simulation.profiler```.
+        The profiler is removed while checkpointing or forking, so it is neither saved nor copied
+
+        Parameters
+        ----------
+        profiler: Profiler
+            Keep recording into this profiler, default a new one
+        """
+        if self.profiler is not None:
+            self.profiler.detach()
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.profiler.attach(self)
+        return self.profiler
+
+    def disable_profiler(self) -> Optional[Profiler]:
+        """
+        Stop recording and restore the unprofiled hot path, return the profiler with its records
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.detach()
+            self.profiler = None
+        return profiler
+
+    def get_profiler(self) -> Optional[Profiler]:
+        return self.profiler
+
+    def get_entity_registry(self) -> EntityRegistry:
+        return self.entity_registry
+
     def get_state(self) -> State:
         return self.state
 
@@ -119,6 +358,7 @@ class Simulator(SimulationEntity):
 
     def set_datacenter(self, datacenter: Datacenter):
         self.datacenter = datacenter
+        datacenter.set_simulator(self)
         
     def get_datacenter(self)->Datacenter:
         return self.datacenter
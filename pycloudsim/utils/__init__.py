@@ -1,2 +1,3 @@
 from .heap import MinHeap
-from .dict_heap import DictHeap
\ No newline at end of file
+from .dict_heap import DictHeap
+from .sorted_list import SortedList
\ No newline at end of file
@@ -121,9 +121,10 @@ class DictHeap:
             self.inverted_index[tail_key] = index
         self.swap_heap_item(index, self.size-1)
         self.size -= 1
-        # reheapify the heap
-        self.swim(index)
-        self.sink(index)
+        # reheapify the heap, unless the removed item was the tail
+        if index < self.size:
+            self.swim(index)
+            self.sink(index)
         return item
 
     def push(self, item: DictHeapItem) -> None:
@@ -0,0 +1,86 @@
+from bisect import bisect_left, insort
+from typing import Any, Iterator, List
+
+
+class SortedList:
+    def __init__(self, load: int = 256) -> None:
+        """
+        A list kept in ascending order, stored as consecutive sorted sublists of at most
+        ```2*load``` elements with the largest element of each sublist in ```max_list```.
+        Finding an element is a bisect over the sublists then inside one, O(log n), and an
+        insert or delete shifts at most one sublist and ```max_list```, i.e. O(load+n/load)
+        element moves instead of the O(n) of a single list
+
+        Parameters
+        ----------
+        load: int
+            Target sublist size, a sublist is split in half once it doubles
+        """
+        if load <= 0:
+            raise ValueError("Load must greater than 0")
+        self.load = load
+        self.sublist_list: List[List[Any]] = []
+        self.max_list: List[Any] = []
+        self.size = 0
+
+    def add(self, value: Any) -> None:
+        if self.size == 0:
+            self.sublist_list.append([value])
+            self.max_list.append(value)
+            self.size = 1
+            return
+        position = bisect_left(self.max_list, value)
+        if position == len(self.max_list):
+            # larger than everything, goes to the end of the last sublist
+            position -= 1
+            self.sublist_list[position].append(value)
+            self.max_list[position] = value
+        else:
+            insort(self.sublist_list[position], value)
+        self.size += 1
+        sublist = self.sublist_list[position]
+        if len(sublist) > 2*self.load:
+            self.sublist_list.insert(position+1, sublist[self.load:])
+            del sublist[self.load:]
+            self.max_list.insert(position, sublist[-1])
+
+    def remove(self, value: Any) -> None:
+        position = bisect_left(self.max_list, value)
+        if position < len(self.max_list):
+            sublist = self.sublist_list[position]
+            index = bisect_left(sublist, value)
+            if index < len(sublist) and sublist[index] == value:
+                del sublist[index]
+                self.size -= 1
+                if len(sublist) == 0:
+                    del self.sublist_list[position]
+                    del self.max_list[position]
+                elif index == len(sublist):
+                    self.max_list[position] = sublist[-1]
+                return
+        raise ValueError("%r is not in the sorted list" % (value,))
+
+    def __contains__(self, value: Any) -> bool:
+        position = bisect_left(self.max_list, value)
+        if position == len(self.max_list):
+            return False
+        sublist = self.sublist_list[position]
+        index = bisect_left(sublist, value)
+        return index < len(sublist) and sublist[index] == value
+
+    def __iter__(self) -> Iterator[Any]:
+        for sublist in self.sublist_list:
+            yield from sublist
+
+    def __len__(self) -> int:
+        return self.size
+
+    def get_first(self) -> Any:
+        if self.size == 0:
+            raise IndexError("Sorted list is empty")
+        return self.sublist_list[0][0]
+
+    def get_last(self) -> Any:
+        if self.size == 0:
+            raise IndexError("Sorted list is empty")
+        return self.max_list[-1]
@@ -1,2 +1,5 @@
 from .vm import Vm
-from .vm_running import VmRunning
\ No newline at end of file
+from .vm_running import VmRunning
+from .cloudlet_execution import CloudletExecution
+from .cloudlet_execution_space_shared import CloudletExecutionSpaceShared
+from .cloudlet_execution_time_shared import CloudletExecutionTimeShared
\ No newline at end of file
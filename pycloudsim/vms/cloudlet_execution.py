@@ -0,0 +1,49 @@
+from __future__ import annotations
+from typing import Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import CloudletRunning
+    from ..datacenters import Datacenter
+    from .vm_running import VmRunning
+
+
+class CloudletExecution:
+    """
+    The execution model of a running Vm: how the Cloudlets bound to the Vm share its Pes,
+    and when their CLOUDLET_FINISH events occur.
+    The Datacenter calls ```start``` once a Cloudlet is bound and ```stop``` before it is released,
+    when it finishes or fails
+    """
+    def __init__(self) -> None:
+        self.vm_running = None
+
+    def attach(self, vm_running: VmRunning) -> None:
+        self.vm_running = vm_running
+
+    def get_vm_running(self) -> Optional[VmRunning]:
+        return self.vm_running
+
+    def is_pe_exclusive(self) -> bool:
+        """
+        Whether a Cloudlet holds its Pes alone, so the Vm accepts Cloudlets
+        only while it has enough free Pes
+        """
+        pass
+
+    def get_num_pe_slots(self) -> int:
+        """
+        Number of Cloudlet Pes the Vm runs at once, what ```VmRunning.get_num_pes_available```
+        counts down from, so Cloudlet placement sees how loaded the Vm is
+        """
+        pass
+
+    def start(self, datacenter: Datacenter, cloudlet_running: CloudletRunning) -> None:
+        pass
+
+    def stop(self, datacenter: Datacenter, cloudlet_running: CloudletRunning) -> None:
+        pass
+
+    def get_remaining_length(self, cloudlet_running: CloudletRunning, clock: float) -> float:
+        """
+        Length of the Cloudlet not executed yet at ```clock```
+        """
+        pass
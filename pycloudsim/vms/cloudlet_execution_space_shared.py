@@ -0,0 +1,39 @@
+from __future__ import annotations
+from .cloudlet_execution import CloudletExecution
+from ..events import Event
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import CloudletRunning
+    from ..datacenters import Datacenter
+
+
+class CloudletExecutionSpaceShared(CloudletExecution):
+    def __init__(self) -> None:
+        """
+        Every Cloudlet runs on Pes of its own at full speed, its execution time
+        is fixed when it starts and its CLOUDLET_FINISH event never moves
+        """
+        super().__init__()
+
+    def is_pe_exclusive(self) -> bool:
+        return True
+
+    def get_num_pe_slots(self) -> int:
+        return self.vm_running.get_num_pes()
+
+    def start(self, datacenter: Datacenter, cloudlet_running: CloudletRunning) -> None:
+        simulator = datacenter.get_simulator()
+        exec_time = datacenter.predict_exec_time(cloudlet_running, self.vm_running)
+        handle = simulator.schedule(datacenter, Event.TYPE.CLOUDLET_FINISH, simulator.get_global_clock()+exec_time, cloudlet_running)
+        cloudlet_running.set_finish_event_handle(handle)
+
+    def stop(self, datacenter: Datacenter, cloudlet_running: CloudletRunning) -> None:
+        handle = cloudlet_running.get_finish_event_handle()
+        if handle is not None:
+            # no-op when the CLOUDLET_FINISH event is the one being processed
+            datacenter.get_simulator().cancel(handle)
+            cloudlet_running.set_finish_event_handle(None)
+
+    def get_remaining_length(self, cloudlet_running: CloudletRunning, clock: float) -> float:
+        elapsed = clock-cloudlet_running.get_start_time()
+        return max(cloudlet_running.get_length()-elapsed*self.vm_running.get_mips()*cloudlet_running.get_utilization_pe(), 0.0)
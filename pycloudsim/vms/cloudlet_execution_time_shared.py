@@ -0,0 +1,154 @@
+from __future__ import annotations
+from .cloudlet_execution import CloudletExecution
+from ..events import Event
+from ..utils import DictHeap
+from ..utils.dict_heap import DictHeapItem
+from typing import Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..cloudlets import CloudletRunning
+    from ..datacenters import Datacenter
+
+
+def compare_finish_tag(item_a: DictHeapItem, item_b: DictHeapItem) -> bool:
+    # (finish tag, start sequence), Cloudlets with the same tag finish in start order
+    return item_a.get_obj() < item_b.get_obj()
+
+
+class CloudletExecutionTimeShared(CloudletExecution):
+    def __init__(self, oversubscription_ratio: int = 16) -> None:
+        """
+        Processor sharing: Cloudlets do not hold Pes, they all run at once and share the Pes
+        of the Vm. The demand of a Cloudlet is ```num_pes*utilization_pe``` Pes, while the total
+        demand exceeds the Pes of the Vm every Cloudlet is slowed down by the same share
+        ```num_pes/demand```, otherwise every Cloudlet runs at its full speed.
+
+        Since all Cloudlets are slowed down alike, progress is tracked with a single virtual
+        time, the length executed so far by a Cloudlet running at full speed with utilization 1.
+        A Cloudlet started at virtual time V finishes at virtual time ```V+length/utilization_pe```,
+        its finish tag, which does not change when the share does. Finish tags are kept in a
+        DictHeap keyed by Cloudlet key, and only the Cloudlet with the smallest tag has a pending
+        CLOUDLET_FINISH event. When a Cloudlet starts or stops, the virtual time is advanced,
+        one tag is pushed or removed and the single event is moved if the first Cloudlet or the
+        share changed, O(log n) for n Cloudlets on the Vm instead of recomputing every finish time
+
+        Parameters
+        ----------
+        oversubscription_ratio: int
+            The Vm accepts Cloudlets with up to ```oversubscription_ratio``` times its Pes in total,
+            use ```functools.partial``` to pass it through ```Datacenter.set_cloudlet_execution_factory```
+        """
+        super().__init__()
+        if oversubscription_ratio < 1:
+            raise ValueError("Oversubscription ratio must no less than 1")
+        self.oversubscription_ratio = oversubscription_ratio
+        self.virtual_time = 0.0
+        self.last_update_time = 0.0
+        self.demand = 0.0
+        self.share = 1.0
+        self.num_cloudlets_started = 0
+        self.finish_tag_heap = DictHeap(compare_finish_tag)
+        # the Cloudlet with the pending CLOUDLET_FINISH event and the handle of the event
+        self.next_finish_key = None
+        self.next_finish_event_handle = None
+        # the utilization rate currently added on each Pe of the Vm
+        self.pe_utilization_rate = 0.0
+
+    def is_pe_exclusive(self) -> bool:
+        return False
+
+    def get_num_pe_slots(self) -> int:
+        return self.vm_running.get_num_pes()*self.oversubscription_ratio
+
+    def get_oversubscription_ratio(self) -> int:
+        return self.oversubscription_ratio
+
+    def _advance(self, clock: float) -> None:
+        self.virtual_time += (clock-self.last_update_time)*self.vm_running.get_mips()*self.share
+        self.last_update_time = clock
+
+    def _update_pe_utilization(self) -> None:
+        """
+        Spread the demand over the Pes of the Vm, so that the utilization arrays
+        of the Vm and its Host reflect the Cloudlets running on it
+        """
+        num_pes = self.vm_running.get_num_pes()
+        pe_utilization_rate = min(self.demand, num_pes)/num_pes if num_pes > 0 else 0.0
+        delta = pe_utilization_rate-self.pe_utilization_rate
+        if delta == 0.0:
+            return
+        vm_pe_index_list = list(range(num_pes))
+        host_pe_index_list = self.vm_running.get_host_pe_index_list()
+        self.vm_running.get_pe_allocator().add_utilization(vm_pe_index_list, delta)
+        self.vm_running.get_host().get_pe_allocator().add_utilization(host_pe_index_list, delta)
+        self.pe_utilization_rate = pe_utilization_rate
+
+    def _reschedule(self, datacenter: Datacenter) -> None:
+        simulator = datacenter.get_simulator()
+        num_pes = self.vm_running.get_num_pes()
+        share = min(1.0, num_pes/self.demand) if self.demand > 0 else 1.0
+        is_share_changed = share != self.share
+        self.share = share
+        if self.finish_tag_heap.is_empty():
+            self._cancel_next_finish(datacenter)
+            return
+        head = self.finish_tag_heap.peek()
+        if head.get_key() == self.next_finish_key and not is_share_changed:
+            return
+        self._cancel_next_finish(datacenter)
+        finish_tag, _ = head.get_obj()
+        exec_time = round(max(finish_tag-self.virtual_time, 0.0)/(self.vm_running.get_mips()*share), 2)
+        cloudlet_running = self.vm_running.get_cloudlet_running_dict()[head.get_key()]
+        self.next_finish_key = head.get_key()
+        self.next_finish_event_handle = simulator.schedule(datacenter, Event.TYPE.CLOUDLET_FINISH, simulator.get_global_clock()+exec_time, cloudlet_running)
+        cloudlet_running.set_finish_event_handle(self.next_finish_event_handle)
+
+    def _cancel_next_finish(self, datacenter: Datacenter) -> None:
+        if self.next_finish_event_handle is None:
+            return
+        # no-op when the CLOUDLET_FINISH event is the one being processed
+        datacenter.get_simulator().cancel(self.next_finish_event_handle)
+        cloudlet_running = self.vm_running.get_cloudlet_running_dict().get(self.next_finish_key)
+        if cloudlet_running is not None:
+            cloudlet_running.set_finish_event_handle(None)
+        self.next_finish_key = None
+        self.next_finish_event_handle = None
+
+    def start(self, datacenter: Datacenter, cloudlet_running: CloudletRunning) -> None:
+        self._advance(datacenter.get_simulator().get_global_clock())
+        finish_tag = self.virtual_time+cloudlet_running.get_length()/cloudlet_running.get_utilization_pe()
+        self.finish_tag_heap.push(DictHeapItem((finish_tag, self.num_cloudlets_started), cloudlet_running.get_key()))
+        self.num_cloudlets_started += 1
+        self.demand += cloudlet_running.get_num_pes()*cloudlet_running.get_utilization_pe()
+        self._update_pe_utilization()
+        self._reschedule(datacenter)
+
+    def stop(self, datacenter: Datacenter, cloudlet_running: CloudletRunning) -> None:
+        self._advance(datacenter.get_simulator().get_global_clock())
+        key = cloudlet_running.get_key()
+        if key == self.next_finish_key:
+            self._cancel_next_finish(datacenter)
+        self.finish_tag_heap.pop_by_key(key)
+        if self.finish_tag_heap.is_empty():
+            # do not let rounding errors of the running sum accumulate
+            self.demand = 0.0
+        else:
+            self.demand -= cloudlet_running.get_num_pes()*cloudlet_running.get_utilization_pe()
+        self._update_pe_utilization()
+        self._reschedule(datacenter)
+
+    def get_remaining_length(self, cloudlet_running: CloudletRunning, clock: float) -> float:
+        finish_tag, _ = self.finish_tag_heap.get_item_by_key(cloudlet_running.get_key()).get_obj()
+        virtual_time = self.virtual_time+(clock-self.last_update_time)*self.vm_running.get_mips()*self.share
+        return max(finish_tag-virtual_time, 0.0)*cloudlet_running.get_utilization_pe()
+
+    def get_share(self) -> float:
+        """
+        The fraction of its full speed every Cloudlet on the Vm currently runs at
+        """
+        return self.share
+
+    def get_demand(self) -> float:
+        return self.demand
+
+    def get_next_finish_key(self) -> Optional[int]:
+        return self.next_finish_key
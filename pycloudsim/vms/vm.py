@@ -1,18 +1,20 @@
 from __future__ import annotations
 from enum import Enum
-from uuid import uuid1
-from typing import TYPE_CHECKING
+from ..entity.entity_registry import EntityKind, RegisteredEntity
+from typing import Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from uuid import UUID
 
 
-class Vm:
+class Vm(RegisteredEntity):
     """
     A virtual machine (Vm) is a composed of virtual computing resources
     such as Pe, RAM, bandwidth, storage, etc. provided by Host.
     In cloud computing scenarios, Vms run on a Host assigned by the datacenter Broker
     and execute Cloudlets
     """
+    kind = EntityKind.VM
+
     class State(Enum):
         """
         A Vm instance has been created but not submitted to the datacenter Broker yet
@@ -75,7 +77,9 @@ class Vm:
             Bandwidth of Vm in Mbps, default 100 Mbps
         """
 
-        self.uuid = uuid1()
+        # keyed in the simulation once a Datacenter accepts it
+        self.key = None
+        self.entity_registry = None
         self.id = id
         self.host_mips_factor = 1.0*host_mips_factor
         self.num_pes = num_pes
@@ -85,10 +89,7 @@ class Vm:
         self.startup_delay = 0.0
         self.shudown_delay = 0.0
         self.state = Vm.State.CREATED
-        self.host_uuid = None
-
-    def get_uuid(self) -> UUID:
-        return self.uuid
+        self.host_key = None
 
     def get_id(self) -> int:
         return self.id
@@ -126,8 +127,11 @@ class Vm:
     def set_state(self, state: State):
         self.state = state
 
-    def get_host_uuid(self) -> UUID:
-        return self.host_uuid
+    def get_host_key(self) -> Optional[int]:
+        return self.host_key
+
+    def set_host_key(self, host_key: Optional[int]) -> None:
+        self.host_key = host_key
 
-    def set_host_uuid(self, uuid: UUID) -> None:
-        self.host_uuid = uuid
+    def get_host_uuid(self) -> Optional[UUID]:
+        return None if self.host_key is None else self.entity_registry.derive_uuid(EntityKind.HOST, self.host_key)
@@ -1,37 +1,62 @@
 from __future__ import annotations
 from uuid import UUID
 from .vm import Vm
+from ..entity.entity_registry import EntityKind, EntityRegistry
 from ..cloudlets import CloudletRunning
-from ..resources import Pe
-from collections import defaultdict
+from ..resources import Pe, PeAllocator
+from .cloudlet_execution_space_shared import CloudletExecutionSpaceShared
 from typing import Dict, List, Optional, TYPE_CHECKING
+import warnings
 if TYPE_CHECKING:
     from resources import RAM, Bandwidth, Storage
     from ..hosts import Host
     from ..cloudlets import Cloudlet
+    from ..placement import CapacityIndex
+    from .cloudlet_execution import CloudletExecution
+    from ..monitoring import UtilizationRecorder
     from uuid import UUID
 
 
 class VmRunning(Vm):
-    def __init__(self, vm: Vm):
+    def __init__(self, vm: Vm, cloudlet_execution: CloudletExecution = None):
+        """
+        Parameters
+        ----------
+        vm: Vm
+            The Vm to run
+        cloudlet_execution: CloudletExecution
+            How the Cloudlets bound to the Vm share its Pes, default ```CloudletExecutionSpaceShared```
+        """
         self.vm = vm
         self.mips = 0.0
         self.num_pes_available = vm.get_num_pes()
-        self.vm_pe_dict = {}
+        # virtual Pes by index, and the index of the host Pe backing each of them
+        self.pe_allocator = PeAllocator(vm.get_num_pes())
+        self.host_pe_index_list = None
         self.ram = None
         self.storage = None
         self.bandwidth = None
         self.is_scheduled_to_shutdown = False
-        self.cloudlet_running_pe_dict = defaultdict(list)
+        self.cloudlet_running_pe_dict = {}
         self.cloudlet_running_dict = {}
         self.host = None
+        self.capacity_index = None
+        self.utilization_recorder = None
+        self.cloudlet_execution = None
+        self.set_cloudlet_execution(cloudlet_execution if cloudlet_execution is not None else CloudletExecutionSpaceShared())
 
     def get_vm(self) -> Vm:
         return self.vm
 
+    def get_key(self) -> int:
+        return self.vm.get_key()
+
     def get_uuid(self) -> UUID:
         return self.vm.get_uuid()
 
+    def get_entity_registry(self) -> Optional[EntityRegistry]:
+        return self.vm.get_entity_registry()
+
     def get_id(self) -> int:
         return self.vm.get_id()
 
@@ -62,7 +87,10 @@ class VmRunning(Vm):
     def set_state(self, state: Vm.State):
         self.vm.set_state(state)
 
-    def get_host_uuid(self) -> UUID:
+    def get_host_key(self) -> Optional[int]:
+        return self.vm.get_host_key()
+
+    def get_host_uuid(self) -> Optional[UUID]:
         return self.vm.get_host_uuid()
 
     def get_mips(self) -> float:
@@ -74,11 +102,49 @@ class VmRunning(Vm):
     def get_num_pes_available(self) -> int:
         return self.num_pes_available
 
+    def get_pe_allocator(self) -> PeAllocator:
+        return self.pe_allocator
+
     def get_vm_pe_dict(self) -> Dict[UUID, Pe]:
-        return self.vm_pe_dict
+        """
+        Deprecated, virtual Pes are indices of ```get_pe_allocator()```, backed by the host Pes
+        ```get_host_pe_index_list()```. Returns a Pe per virtual Pe, reading its state from the allocator
+        """
+        warnings.warn("VmRunning.get_vm_pe_dict is deprecated, use get_pe_allocator", DeprecationWarning, stacklevel=2)
+        if self.host is None:
+            raise RuntimeError("Vm %d is not bound to a Host" % self.get_id())
+        vm_pe_dict = {}
+        entity_registry = self._get_vm_pe_registry()
+        for pe_index in range(self.get_num_pes()):
+            vm_pe = Pe(self.mips)
+            vm_pe.bind_key(entity_registry)
+            vm_pe.attach(self.pe_allocator, pe_index)
+            vm_pe_dict[vm_pe.get_uuid()] = vm_pe
+        return vm_pe_dict
+
+    def _get_vm_pe_registry(self) -> EntityRegistry:
+        # the virtual Pes are not entities of the simulation, they are keyed by index in a
+        # registry of their own, so their UUIDs are the same on every call
+        return EntityRegistry(self.get_uuid())
+
+    def get_vm_pe_uuid_list(self) -> List[UUID]:
+        """
+        UUIDs of the virtual Pes for the deprecated Pe dicts, by index
+        """
+        entity_registry = self._get_vm_pe_registry()
+        return [entity_registry.derive_uuid(EntityKind.PE, pe_index) for pe_index in range(self.get_num_pes())]
 
     def add_vm_pe(self, pe: Pe) -> None:
-        self.vm_pe_dict[pe.get_uuid()] = pe
+        """
+        Deprecated, the virtual Pes of a Vm are allocated by its PeAllocator when it is bound to a Host
+        """
+        raise RuntimeError("VmRunning.add_vm_pe is no longer supported, virtual Pes are managed by get_pe_allocator")
+
+    def get_host_pe_index_list(self) -> Optional[List[int]]:
+        return self.host_pe_index_list
+
+    def set_host_pe_index_list(self, host_pe_index_list: Optional[List[int]]) -> None:
+        self.host_pe_index_list = host_pe_index_list
 
     def get_ram(self) -> RAM:
         return self.ram
@@ -100,20 +166,34 @@ class VmRunning(Vm):
 
     def set_is_scheduled_to_shutdown(self, is_scheduled_to_shutdown: bool) -> None:
         self.is_scheduled_to_shutdown = is_scheduled_to_shutdown
+        # a Vm scheduled to shutdown accepts no more Cloudlets
+        if self.capacity_index is not None:
+            if is_scheduled_to_shutdown and self.capacity_index.contains(self):
+                self.capacity_index.remove(self)
+            elif not is_scheduled_to_shutdown and not self.capacity_index.contains(self):
+                self.capacity_index.add(self)
 
     def get_is_scheduled_to_shutdown(self) -> bool:
         return self.is_scheduled_to_shutdown
 
+    def get_cloudlet_execution(self) -> CloudletExecution:
+        return self.cloudlet_execution
+
+    def set_cloudlet_execution(self, cloudlet_execution: CloudletExecution) -> None:
+        if len(self.cloudlet_running_dict) > 0:
+            raise RuntimeError("Can not change the Cloudlet execution model of Vm %d with running Cloudlets" % self.get_id())
+        cloudlet_execution.attach(self)
+        self.cloudlet_execution = cloudlet_execution
+        self.num_pes_available = cloudlet_execution.get_num_pe_slots()
+
     def bind_cloudlet(self, cloudlet_running: CloudletRunning) -> None:
-        for _ in range(cloudlet_running.get_num_pes()):
-            for vm_pe in self.vm_pe_dict.values():
-                if vm_pe.get_state() == Pe.State.FREE:
-                    vm_pe.set_state(Pe.State.BUSY)
-                    vm_pe.allocate(cloudlet_running.get_utilization_pe())
-                    self.cloudlet_running_pe_dict[cloudlet_running.get_uuid()].append(vm_pe.get_uuid())
-                    host_pe = self.host.get_host_pe_dict()[self.host.get_vm_pe_mapping()[vm_pe.get_uuid()]]
-                    host_pe.allocate(cloudlet_running.get_utilization_pe())
-                    break
+        # Pes shared by the Cloudlets are accounted by the execution model
+        if self.cloudlet_execution.is_pe_exclusive():
+            utilization_pe = cloudlet_running.get_utilization_pe()
+            vm_pe_index_list = self.pe_allocator.allocate(cloudlet_running.get_num_pes())
+            self.pe_allocator.add_utilization(vm_pe_index_list, utilization_pe)
+            self.host.get_pe_allocator().add_utilization([self.host_pe_index_list[index] for index in vm_pe_index_list], utilization_pe)
+            self.cloudlet_running_pe_dict[cloudlet_running.get_key()] = vm_pe_index_list
         self.num_pes_available -= cloudlet_running.get_num_pes()
 
         self.ram.allocate(cloudlet_running.get_required_ram())
@@ -122,14 +202,19 @@ class VmRunning(Vm):
 
         self.bandwidth.allocate(cloudlet_running.get_required_bandwidth())
 
-        self.cloudlet_running_dict[cloudlet_running.get_uuid()] = cloudlet_running
+        self.cloudlet_running_dict[cloudlet_running.get_key()] = cloudlet_running
 
         cloudlet_running.set_vm_running(self)
 
+        if self.capacity_index is not None:
+            self.capacity_index.update(self)
+        if self.utilization_recorder is not None:
+            self.utilization_recorder.record_vm(self)
+
     def release_cloudlet(self, cloudlet_running: CloudletRunning) -> None:
         cloudlet_running.set_vm_running(None)
 
-        self.cloudlet_running_dict.pop(cloudlet_running.get_uuid())
+        self.cloudlet_running_dict.pop(cloudlet_running.get_key())
 
         self.bandwidth.dealloate(cloudlet_running.get_required_bandwidth())
 
@@ -139,17 +224,22 @@ class VmRunning(Vm):
 
         self.num_pes_available += cloudlet_running.get_num_pes()
 
-        pe_uuid_list = self.cloudlet_running_pe_dict.pop(cloudlet_running.get_uuid())
-        for pe_uuid in pe_uuid_list:
-            self.vm_pe_dict[pe_uuid].set_state(Pe.State.FREE)
-            self.vm_pe_dict[pe_uuid].deallocate(cloudlet_running.get_utilization_pe())
-            host_pe = self.host.get_host_pe_dict()[self.host.get_vm_pe_mapping()[pe_uuid]]
-            host_pe.deallocate(cloudlet_running.get_utilization_pe())
+        vm_pe_index_list = self.cloudlet_running_pe_dict.pop(cloudlet_running.get_key(), None)
+        if vm_pe_index_list is not None:
+            utilization_pe = cloudlet_running.get_utilization_pe()
+            self.pe_allocator.release(vm_pe_index_list)
+            self.pe_allocator.add_utilization(vm_pe_index_list, -utilization_pe)
+            self.host.get_pe_allocator().add_utilization([self.host_pe_index_list[index] for index in vm_pe_index_list], -utilization_pe)
 
-    def get_cloudlet_running_pe_dict(self) -> Dict[UUID, List[Pe]]:
+        if self.capacity_index is not None:
+            self.capacity_index.update(self)
+        if self.utilization_recorder is not None:
+            self.utilization_recorder.record_vm(self)
+
+    def get_cloudlet_running_pe_dict(self) -> Dict[int, List[int]]:
         return self.cloudlet_running_pe_dict
 
-    def get_cloudlet_running_dict(self) -> Dict[UUID, CloudletRunning]:
+    def get_cloudlet_running_dict(self) -> Dict[int, CloudletRunning]:
         return self.cloudlet_running_dict
 
     def get_host(self) -> Optional[Host]:
@@ -158,4 +248,22 @@ class VmRunning(Vm):
     def set_host(self, host: Optional[Host]):
         self.host = host
         if host is not None:
-            self.vm.set_host_uuid(host.get_uuid())
+            self.vm.set_host_key(host.get_key())
+
+    def get_capacity_index(self) -> Optional[CapacityIndex]:
+        return self.capacity_index
+
+    def set_capacity_index(self, capacity_index: Optional[CapacityIndex]) -> None:
+        """
+        The index of eligible Vms of the Datacenter, set while the Vm is running
+        """
+        self.capacity_index = capacity_index
+
+    def get_utilization_recorder(self) -> Optional[UtilizationRecorder]:
+        return self.utilization_recorder
+
+    def set_utilization_recorder(self, utilization_recorder: Optional[UtilizationRecorder]) -> None:
+        """
+        The recorder notified whenever a Cloudlet is bound or released, set by the Host
+        """
+        self.utilization_recorder = utilization_recorder